@@ -0,0 +1,291 @@
+"""
+Compliance Status Cache for Veria Platform
+Bounded LRU of (token, investor) verification and frozen status shared by the
+handlers in a process. Entries are dropped on the freeze and identity events
+the monitors observe, so while a monitor is running they can be kept far longer
+than a polling interval.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Mapping, Optional, Set, Tuple
+
+from .single_flight import SingleFlight
+
+# Events after which cached status for the addresses they name is stale
+FREEZE_EVENTS = frozenset({'Freeze', 'Unfreeze', 'TokensFrozen', 'TokensUnfrozen', 'Frozen'})
+# Identity registries can back several tokens, so these clear the address everywhere
+IDENTITY_EVENTS = frozenset({'IdentityVerified', 'Verified'})
+
+
+@dataclass(frozen=True)
+class ComplianceRecord:
+    """Cached compliance reads for one investor on one token"""
+    verified: bool
+    frozen: bool
+    cached_at: float
+    
+    @property
+    def can_transact(self) -> bool:
+        return self.verified and not self.frozen
+
+
+class ComplianceCache:
+    """
+    LRU keyed by (token, address) with a TTL as a backstop for missed events.
+    The long watched_ttl only applies while a monitor invalidating the cache
+    is attached via watch(); otherwise entries expire after the short ttl.
+    Invalidations bump a version; writes carrying an older version (a lookup
+    that started before the invalidation) are discarded. lookup() coalesces
+    concurrent chain reads per (token, address, block tag).
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 100000,
+        ttl: float = 300.0,
+        stale_ttl: float = 0.0,
+        watched_ttl: float = 3600.0
+    ):
+        """
+        Args:
+            max_entries: Upper bound on cached entries (least recently used dropped first)
+            ttl: Seconds an entry is served when no monitor invalidates the cache
+            stale_ttl: Seconds past the TTL lookup() still serves an entry while refreshing it
+            watched_ttl: Seconds an entry is served while a monitor invalidates the cache
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.watched_ttl = max(ttl, watched_ttl)
+        self.watchers = 0
+        self.flights = SingleFlight()
+        self.logger = logging.getLogger(f"{__name__}.ComplianceCache")
+        self.lock = Lock()
+        self.entries: 'OrderedDict[Tuple[str, str], ComplianceRecord]' = OrderedDict()
+        self.tokens_by_address: Dict[str, Set[str]] = {}
+        self.version = 0
+        self.stats = {
+            'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0,
+            'invalidations': 0, 'discarded_writes': 0
+        }
+    
+    @staticmethod
+    def _key(token: str, address: str) -> Tuple[str, str]:
+        return token.lower(), address.lower()
+    
+    def _remove(self, key: Tuple[str, str]) -> bool:
+        if self.entries.pop(key, None) is None:
+            return False
+        tokens = self.tokens_by_address.get(key[1])
+        if tokens is not None:
+            tokens.discard(key[0])
+            if not tokens:
+                del self.tokens_by_address[key[1]]
+        return True
+    
+    def watch(self):
+        """Register a running monitor that invalidates entries on chain events"""
+        with self.lock:
+            self.watchers += 1
+    
+    def unwatch(self):
+        """Unregister a monitor; entries fall back to the short TTL when none remain"""
+        with self.lock:
+            self.watchers = max(0, self.watchers - 1)
+    
+    @property
+    def effective_ttl(self) -> float:
+        return self.watched_ttl if self.watchers else self.ttl
+    
+    def _cached(self, key: Tuple[str, str], now: float, allow_stale: bool) -> Tuple[Optional[ComplianceRecord], bool]:
+        """(entry, is stale) for a key; expired entries are dropped"""
+        with self.lock:
+            ttl = self.effective_ttl
+            status = self.entries.get(key)
+            age = None if status is None else now - status.cached_at
+            if age is not None and age < ttl:
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return status, False
+            if age is not None and allow_stale and age < ttl + self.stale_ttl:
+                self.entries.move_to_end(key)
+                self.stats['stale_hits'] += 1
+                return status, True
+            if age is not None and age >= ttl + self.stale_ttl:
+                self._remove(key)
+            self.stats['misses'] += 1
+            return None, False
+    
+    def get(self, token: str, address: str, now: Optional[float] = None) -> Optional[ComplianceRecord]:
+        """Cached status, or None when missing or older than the TTL"""
+        status, _ = self._cached(self._key(token, address), time.time() if now is None else now, False)
+        return status
+    
+    def lookup(
+        self,
+        token: str,
+        address: str,
+        loader: Callable[[], Tuple[bool, bool]],
+        block_identifier: Any = 'latest',
+        use_cache: bool = True
+    ) -> Tuple[ComplianceRecord, bool]:
+        """
+        Cached status, or one chain read shared by concurrent callers
+        
+        Args:
+            token: Token contract address
+            address: Investor address
+            loader: Reads (verified, frozen) from the chain
+            block_identifier: Block tag of the read; only 'latest' reads are cached
+            use_cache: Serve cached entries (concurrent reads are coalesced either way)
+        
+        Returns:
+            (status, whether it was served from the cache)
+        """
+        if use_cache and block_identifier == 'latest':
+            status, stale = self._cached(self._key(token, address), time.time(), True)
+            if status is not None:
+                if stale:
+                    self._refresh(token, address, loader)
+                return status, True
+        return self._load(token, address, loader, block_identifier), False
+    
+    def _load(
+        self,
+        token: str,
+        address: str,
+        loader: Callable[[], Tuple[bool, bool]],
+        block_identifier: Any
+    ) -> ComplianceRecord:
+        key = (*self._key(token, address), block_identifier)
+        future, leader = self.flights.join(key)
+        if not leader:
+            return future.result()
+        
+        version = self.version
+        
+        def _read() -> ComplianceRecord:
+            verified, frozen = loader()
+            if block_identifier == 'latest':
+                return self.set(token, address, verified, frozen, version=version)
+            return ComplianceRecord(bool(verified), bool(frozen), time.time())
+        
+        return self.flights.run(key, future, _read)
+    
+    def _refresh(self, token: str, address: str, loader: Callable[[], Tuple[bool, bool]]):
+        """Reload a stale entry on a background thread unless a read is already running"""
+        if self.flights.in_flight((*self._key(token, address), 'latest')):
+            return
+        
+        def _reload():
+            try:
+                self._load(token, address, loader, 'latest')
+            except Exception as e:
+                self.logger.warning(f"Background compliance refresh for {address} failed: {e}")
+        
+        Thread(target=_reload, name='compliance-refresh', daemon=True).start()
+    
+    def set(
+        self,
+        token: str,
+        address: str,
+        verified: bool,
+        frozen: bool,
+        version: Optional[int] = None,
+        now: Optional[float] = None
+    ) -> ComplianceRecord:
+        """
+        Store status read from the chain
+        
+        Args:
+            token: Token contract address
+            address: Investor address
+            verified: Identity registry verification
+            frozen: Frozen flag on the token
+            version: Cache version read before the chain lookup started
+            now: Timestamp of the read
+        
+        Returns:
+            The status (not stored if an invalidation happened since version)
+        """
+        status = ComplianceRecord(bool(verified), bool(frozen), time.time() if now is None else now)
+        key = self._key(token, address)
+        with self.lock:
+            if version is not None and version != self.version:
+                self.stats['discarded_writes'] += 1
+                return status
+            self.entries[key] = status
+            self.entries.move_to_end(key)
+            self.tokens_by_address.setdefault(key[1], set()).add(key[0])
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+                self.stats['evictions'] += 1
+        return status
+    
+    def invalidate(self, address: str, token: Optional[str] = None) -> int:
+        """Drop an address on one token, or on every token when token is None"""
+        address = address.lower()
+        with self.lock:
+            self.version += 1
+            tokens = [token.lower()] if token else list(self.tokens_by_address.get(address, ()))
+            removed = sum(self._remove((cached_token, address)) for cached_token in tokens)
+            self.stats['invalidations'] += removed
+        
+        # Reads started before the event must not be shared with later callers
+        self.flights.forget(lambda key: key[1] == address and (not token or key[0] == token.lower()))
+        return removed
+    
+    def invalidate_event(self, token: str, event_name: str, args: Mapping[str, Any]) -> int:
+        """
+        Drop entries made stale by a token or identity registry event
+        
+        Args:
+            token: Address of the emitting contract
+            event_name: Decoded event name
+            args: Decoded event arguments
+        
+        Returns:
+            Number of entries removed
+        """
+        if event_name in FREEZE_EVENTS:
+            scope: Optional[str] = token
+        elif event_name in IDENTITY_EVENTS:
+            scope = None
+        else:
+            return 0
+        
+        addresses = [
+            value for value in args.values()
+            if isinstance(value, str) and len(value) == 42 and value.startswith('0x')
+        ]
+        return sum(self.invalidate(address, scope) for address in addresses)
+    
+    def clear(self):
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+            self.tokens_by_address.clear()
+        self.flights.forget(lambda key: True)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.effective_ttl,
+                'watchers': self.watchers,
+                'stale_ttl_seconds': self.stale_ttl,
+                **self.stats,
+                **{f'lookups_{name}': value for name, value in self.flights.get_stats().items()}
+            }
+
+
+# Process-wide cache used by handlers that are not given their own
+shared_compliance_cache = ComplianceCache()
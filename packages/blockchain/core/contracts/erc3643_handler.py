@@ -5,17 +5,25 @@ Implements T-REX standard for regulated token exchanges
 
 import json
 import logging
-from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from threading import Lock, local
+from weakref import WeakKeyDictionary
+from typing import Optional, Dict, Any, Callable, List, Tuple, Iterable, Iterator
 from dataclasses import dataclass
 from enum import Enum
 from decimal import Decimal
 
 from web3 import Web3
 from web3.contract import Contract
-from web3.types import HexBytes, TxReceipt
+from web3.types import BlockIdentifier, HexBytes, TxReceipt
 from eth_typing import ChecksumAddress
 
 from ..providers.polygon_provider import PolygonProvider
+from ..monitoring.indexer import EventIndexer
+from .multicall import Multicall3
+from .compliance_cache import ComplianceCache, ComplianceRecord, shared_compliance_cache
 
 
 class ComplianceStatus(Enum):
@@ -62,6 +70,47 @@ class TransferRequest:
     metadata: Optional[Dict[str, Any]] = None
 
 
+class BlockSnapshot:
+    """Contract reads pinned to one block, memoized per (call, arguments)"""
+    
+    def __init__(self, block_number: int):
+        self.block_number = block_number
+        self.results: Dict[Tuple, Any] = {}
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, key: Tuple) -> Tuple[bool, Any]:
+        """(found, value) for a memoized read"""
+        with self.lock:
+            if key in self.results:
+                self.hits += 1
+                return True, self.results[key]
+            self.misses += 1
+            return False, None
+    
+    def store(self, key: Tuple, value: Any):
+        with self.lock:
+            self.results[key] = value
+    
+    def memoize(self, key: Tuple, read: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(value, whether it was memoized) for a read at this block"""
+        found, value = self.lookup(key)
+        if not found:
+            value = read()
+            self.store(key, value)
+        return value, found
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                'block_number': self.block_number,
+                'memoized_reads': len(self.results),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
 class ERC3643Handler:
     """
     Handler for ERC-3643 compliant tokenized RWA interactions
@@ -199,11 +248,17 @@ class ERC3643Handler:
         }
     ]
     
+    # Recent pinned blocks whose memoized reads are kept for later at_block() calls
+    SNAPSHOT_HISTORY = 16
+    
     def __init__(
         self,
         provider: PolygonProvider,
         contract_address: str,
-        abi: Optional[List[Dict]] = None
+        abi: Optional[List[Dict]] = None,
+        indexer: Optional[EventIndexer] = None,
+        multicall: Optional[Multicall3] = None,
+        compliance_cache: Optional[ComplianceCache] = None
     ):
         """
         Initialize ERC-3643 handler
@@ -212,19 +267,32 @@ class ERC3643Handler:
             provider: Polygon provider instance
             contract_address: Token contract address
             abi: Optional custom ABI (uses standard if not provided)
+            indexer: Token event index answering history queries without RPC scans
+            multicall: Aggregator for batched view calls (Multicall3 on the provider if None)
+            compliance_cache: Compliance status cache (the process-wide one if None)
         """
         self.provider = provider
         self.contract_address = Web3.to_checksum_address(contract_address)
         self.abi = abi or self.STANDARD_ABI
+        self.indexer = indexer
+        self.multicall = multicall or Multicall3(provider)
         self.contract: Optional[Contract] = None
+        
+        # Contract objects per pooled connection, dropped when the connection is reaped
+        self._bound: 'WeakKeyDictionary[Web3, Contract]' = WeakKeyDictionary()
+        self._bound_lock = Lock()
+        
+        # Block pinned by at_block() on each thread, and memoized reads of recent blocks
+        self._pinned = local()
+        self._snapshots: 'OrderedDict[int, BlockSnapshot]' = OrderedDict()
+        self._snapshots_lock = Lock()
         self.metadata: Optional[TokenMetadata] = None
         
         # Setup logging
         self.logger = logging.getLogger(f"veria.blockchain.erc3643.{contract_address[:8]}")
         
-        # Cache for compliance checks
-        self.compliance_cache: Dict[str, Tuple[bool, float]] = {}
-        self.cache_ttl = 300  # 5 minutes
+        # Compliance status cache, shared with other handlers and invalidated by monitor events
+        self.compliance_cache = shared_compliance_cache if compliance_cache is None else compliance_cache
         
         self._initialize_contract()
     
@@ -233,10 +301,7 @@ class ERC3643Handler:
         try:
             # Get a connection from the pool
             with self.provider.connection_pool.get_connection() as w3:
-                self.contract = w3.eth.contract(
-                    address=self.contract_address,
-                    abi=self.abi
-                )
+                self.contract = self._bind(w3)
                 self.logger.info(f"Initialized ERC-3643 contract at {self.contract_address}")
                 
                 # Load metadata
@@ -245,14 +310,79 @@ class ERC3643Handler:
             self.logger.error(f"Failed to initialize contract: {e}")
             raise
     
+    def _bind(self, w3: Web3) -> Contract:
+        """
+        Contract bound to a checked-out connection, so calls run on the
+        connection that was actually handed out. Built once per connection
+        and reused for every later checkout of it.
+        """
+        contract = self._bound.get(w3)
+        if contract is None:
+            with self._bound_lock:
+                contract = self._bound.get(w3)
+                if contract is None:
+                    contract = self._bound[w3] = w3.eth.contract(address=self.contract_address, abi=self.abi)
+        return contract
+    
+    @contextmanager
+    def at_block(self, block_number: Optional[int] = None) -> Iterator[BlockSnapshot]:
+        """
+        Pin this thread's contract reads to one block
+        
+        Reads inside the context (balances, compliance, transfer checks) use
+        block_number and are memoized per call, so repeated checks at the
+        block cost nothing and decisions can be replayed for audit. Memoized
+        reads are kept for the last SNAPSHOT_HISTORY blocks; pin confirmed
+        blocks if reorgs must not leave stale results behind.
+        
+        Args:
+            block_number: Block to read at (current head if None)
+        
+        Yields:
+            The block snapshot holding the memoized reads
+        """
+        if block_number is None:
+            with self.provider.connection_pool.get_connection() as w3:
+                block_number = w3.eth.block_number
+        
+        with self._snapshots_lock:
+            snapshot = self._snapshots.get(block_number)
+            if snapshot is None:
+                snapshot = self._snapshots[block_number] = BlockSnapshot(block_number)
+                while len(self._snapshots) > self.SNAPSHOT_HISTORY:
+                    self._snapshots.popitem(last=False)
+            else:
+                self._snapshots.move_to_end(block_number)
+        
+        previous = getattr(self._pinned, 'snapshot', None)
+        self._pinned.snapshot = snapshot
+        try:
+            yield snapshot
+        finally:
+            self._pinned.snapshot = previous
+    
+    @property
+    def pinned_block(self) -> Optional[int]:
+        """Block this thread's reads are pinned to, if any"""
+        snapshot = getattr(self._pinned, 'snapshot', None)
+        return snapshot.block_number if snapshot else None
+    
+    def _pinned_read(self, key: Tuple, read: Callable[[BlockIdentifier], Any]) -> Tuple[Any, bool]:
+        """(value, memoized) for a read at the pinned block, or at latest when unpinned"""
+        snapshot = getattr(self._pinned, 'snapshot', None)
+        if snapshot is None:
+            return read('latest'), False
+        return snapshot.memoize(key, lambda: read(snapshot.block_number))
+    
     def _load_metadata(self, w3: Web3):
         """Load token metadata from contract"""
         try:
+            contract = self._bind(w3)
             self.metadata = TokenMetadata(
-                name=self.contract.functions.name().call(),
-                symbol=self.contract.functions.symbol().call(),
-                decimals=self.contract.functions.decimals().call(),
-                total_supply=self.contract.functions.totalSupply().call(),
+                name=contract.functions.name().call(),
+                symbol=contract.functions.symbol().call(),
+                decimals=contract.functions.decimals().call(),
+                total_supply=contract.functions.totalSupply().call(),
                 version="1.0.0"  # Would be read from contract if available
             )
             self.logger.info(f"Loaded token metadata: {self.metadata.symbol}")
@@ -280,8 +410,12 @@ class ERC3643Handler:
         """
         def _get_balance():
             with self.provider.connection_pool.get_connection() as w3:
+                contract = self._bind(w3)
                 checksum_address = w3.to_checksum_address(address)
-                balance_raw = self.contract.functions.balanceOf(checksum_address).call()
+                balance_raw, _ = self._pinned_read(
+                    ('balanceOf', checksum_address),
+                    lambda block: contract.functions.balanceOf(checksum_address).call(block_identifier=block)
+                )
                 
                 result = {
                     'address': checksum_address,
@@ -301,57 +435,64 @@ class ERC3643Handler:
     def check_compliance(
         self,
         investor_address: str,
-        use_cache: bool = True
+        use_cache: bool = True,
+        block_identifier: Optional[BlockIdentifier] = None
     ) -> Dict[str, Any]:
         """
         Check investor compliance status
         
+        Concurrent checks of the same investor share one set of RPCs.
+        
         Args:
             investor_address: Investor wallet address
             use_cache: Use cached results if available
+            block_identifier: Block to read at (the at_block() block, else latest;
+                only 'latest' results go to the compliance cache)
         
         Returns:
             Compliance status information
         """
-        import time
+        checksum_address = Web3.to_checksum_address(investor_address)
         
-        # Check cache
-        if use_cache and investor_address in self.compliance_cache:
-            cached_result, cached_time = self.compliance_cache[investor_address]
-            if time.time() - cached_time < self.cache_ttl:
-                self.logger.info(f"Using cached compliance for {investor_address}")
-                return {'verified': cached_result, 'cached': True}
+        def _check_compliance(block_identifier: BlockIdentifier) -> Tuple[bool, bool]:
+            # Both flags in one aggregated eth_call (retried by batch_request)
+            raw = self._batch_view_calls(
+                [('isVerified', [checksum_address]), ('isFrozen', [checksum_address])],
+                block_identifier=block_identifier
+            )
+            if raw[0] is None:
+                raise RuntimeError(f"isVerified read failed for {checksum_address}")
+            
+            # isFrozen may not exist in all implementations; failures read as not frozen
+            return self._decode_bool(raw[0]), self._decode_bool(raw[1])
         
-        def _check_compliance():
-            with self.provider.connection_pool.get_connection() as w3:
-                checksum_address = w3.to_checksum_address(investor_address)
-                
-                # Check verification status
-                is_verified = self.contract.functions.isVerified(checksum_address).call()
-                
-                # Check frozen status
-                is_frozen = False
-                try:
-                    is_frozen = self.contract.functions.isFrozen(checksum_address).call()
-                except:
-                    # Function might not exist in all implementations
-                    pass
-                
-                result = {
-                    'address': checksum_address,
-                    'verified': is_verified,
-                    'frozen': is_frozen,
-                    'can_transact': is_verified and not is_frozen,
-                    'cached': False,
-                    'timestamp': int(time.time())
-                }
-                
-                # Update cache
-                self.compliance_cache[investor_address] = (is_verified, time.time())
-                
-                return result
+        def _lookup(block: BlockIdentifier) -> Tuple[ComplianceRecord, bool]:
+            return self.compliance_cache.lookup(
+                self.contract_address,
+                checksum_address,
+                lambda: _check_compliance(block),
+                block_identifier=block,
+                use_cache=use_cache
+            )
         
-        return self.provider._retry_operation(_check_compliance)
+        if block_identifier is None and self.pinned_block is not None:
+            (status, _), cached = self._pinned_read(('compliance', checksum_address), _lookup)
+        else:
+            status, cached = _lookup(block_identifier or 'latest')
+        if cached:
+            self.logger.info(f"Using cached compliance for {investor_address}")
+        return self._compliance_result(checksum_address, status, cached=cached)
+    
+    @staticmethod
+    def _compliance_result(address: str, status: ComplianceRecord, cached: bool) -> Dict[str, Any]:
+        return {
+            'address': address,
+            'verified': status.verified,
+            'frozen': status.frozen,
+            'can_transact': status.can_transact,
+            'cached': cached,
+            'timestamp': int(status.cached_at)
+        }
     
     def can_transfer(
         self,
@@ -370,44 +511,53 @@ class ERC3643Handler:
         Returns:
             Transfer eligibility information
         """
-        def _can_transfer():
-            with self.provider.connection_pool.get_connection() as w3:
-                from_checksum = w3.to_checksum_address(from_address)
-                to_checksum = w3.to_checksum_address(to_address)
-                
-                # Check if transfer is allowed
-                can_transfer = self.contract.functions.canTransfer(
-                    from_checksum,
-                    to_checksum,
-                    amount
-                ).call()
-                
-                # Get additional compliance info
-                from_compliance = self.check_compliance(from_address)
-                to_compliance = self.check_compliance(to_address)
-                
-                # Check balances
-                from_balance = self.get_balance(from_address)
-                
-                return {
-                    'can_transfer': can_transfer,
-                    'from_address': from_checksum,
-                    'to_address': to_checksum,
-                    'amount': amount,
-                    'from_verified': from_compliance['verified'],
-                    'to_verified': to_compliance['verified'],
-                    'from_frozen': from_compliance.get('frozen', False),
-                    'to_frozen': to_compliance.get('frozen', False),
-                    'sufficient_balance': from_balance['balance_raw'] >= amount,
-                    'reasons': self._get_transfer_denial_reasons(
-                        can_transfer,
-                        from_compliance,
-                        to_compliance,
-                        from_balance['balance_raw'] >= amount
-                    )
-                }
+        from_checksum = Web3.to_checksum_address(from_address)
+        to_checksum = Web3.to_checksum_address(to_address)
+        version = self.compliance_cache.version
+        pinned_block = self.pinned_block
         
-        return self.provider._retry_operation(_can_transfer)
+        # Every read for the check in one aggregated eth_call (batch_request retries it)
+        raw = self._batch_view_calls([
+            ('canTransfer', [from_checksum, to_checksum, amount]),
+            ('isVerified', [from_checksum]),
+            ('isFrozen', [from_checksum]),
+            ('isVerified', [to_checksum]),
+            ('isFrozen', [to_checksum]),
+            ('balanceOf', [from_checksum])
+        ])
+        if raw[0] is None or raw[1] is None or raw[3] is None or raw[5] is None:
+            raise RuntimeError(f"Transfer check reads failed for {from_checksum} -> {to_checksum}")
+        
+        can_transfer = self._decode_bool(raw[0])
+        from_balance = self._decode_uint(raw[5])
+        
+        # isFrozen may not exist in all implementations; failures read as not frozen
+        from_compliance = {'verified': self._decode_bool(raw[1]), 'frozen': self._decode_bool(raw[2])}
+        to_compliance = {'verified': self._decode_bool(raw[3]), 'frozen': self._decode_bool(raw[4])}
+        if pinned_block is None:
+            for address, compliance in ((from_checksum, from_compliance), (to_checksum, to_compliance)):
+                self.compliance_cache.set(
+                    self.contract_address, address, compliance['verified'], compliance['frozen'], version=version
+                )
+        
+        return {
+            'can_transfer': can_transfer,
+            'block_number': pinned_block,
+            'from_address': from_checksum,
+            'to_address': to_checksum,
+            'amount': amount,
+            'from_verified': from_compliance['verified'],
+            'to_verified': to_compliance['verified'],
+            'from_frozen': from_compliance['frozen'],
+            'to_frozen': to_compliance['frozen'],
+            'sufficient_balance': from_balance >= amount,
+            'reasons': self._get_transfer_denial_reasons(
+                can_transfer,
+                from_compliance,
+                to_compliance,
+                from_balance >= amount
+            )
+        }
     
     def _get_transfer_denial_reasons(
         self,
@@ -435,6 +585,41 @@ class ERC3643Handler:
         
         return reasons
     
+    def _build_transaction(self, fn_name: str, args: List[Any], params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a contract write on a pooled connection. The connection is
+        released before the caller estimates, sends or waits for a receipt,
+        which check out connections of their own.
+        """
+        with self.provider.connection_pool.get_connection() as w3:
+            return getattr(self._bind(w3).functions, fn_name)(*args).build_transaction(params)
+    
+    def _estimate_write(
+        self,
+        fn_name: str,
+        args: List[Any],
+        sender: ChecksumAddress,
+        priority_level: str = 'standard'
+    ) -> Dict[str, Any]:
+        """Gas limit and fees for a contract write, from calldata encoded locally"""
+        return self.provider.estimate_gas_optimized(
+            {
+                'from': sender,
+                'to': self.contract_address,
+                'data': self.contract.encode_abi(fn_name=fn_name, args=args),
+                'value': 0
+            },
+            priority_level
+        )
+    
+    @staticmethod
+    def _gas_params(gas_estimate: Dict[str, Any]) -> Dict[str, int]:
+        return {
+            'gas': gas_estimate['gas_limit'],
+            'maxPriorityFeePerGas': gas_estimate['max_priority_fee_per_gas'],
+            'maxFeePerGas': gas_estimate['max_fee_per_gas']
+        }
+    
     def prepare_transfer(
         self,
         from_address: str,
@@ -464,38 +649,24 @@ class ERC3643Handler:
                 f"Transfer not allowed: {', '.join(transfer_check['reasons'])}"
             )
         
-        # Prepare transaction
-        with self.provider.connection_pool.get_connection() as w3:
-            from_checksum = w3.to_checksum_address(from_address)
-            to_checksum = w3.to_checksum_address(to_address)
-            
-            # Build transaction
-            transaction = self.contract.functions.transfer(
-                to_checksum,
-                amount
-            ).build_transaction({
-                'from': from_checksum,
-                'chainId': self.provider.chain_id
-            })
-            
-            # Estimate gas
-            gas_estimate = self.provider.estimate_gas_optimized(
-                transaction,
-                priority_level
-            )
-            
-            return TransferRequest(
-                from_address=from_checksum,
-                to_address=to_checksum,
-                amount=amount,
-                compliance_checked=True,
-                gas_estimate=gas_estimate,
-                metadata={
-                    'token_symbol': self.metadata.symbol if self.metadata else 'TOKEN',
-                    'priority_level': priority_level,
-                    'estimated_cost': gas_estimate['estimated_cost_formatted']
-                }
-            )
+        from_checksum = Web3.to_checksum_address(from_address)
+        to_checksum = Web3.to_checksum_address(to_address)
+        
+        # Estimate gas
+        gas_estimate = self._estimate_write('transfer', [to_checksum, amount], from_checksum, priority_level)
+        
+        return TransferRequest(
+            from_address=from_checksum,
+            to_address=to_checksum,
+            amount=amount,
+            compliance_checked=True,
+            gas_estimate=gas_estimate,
+            metadata={
+                'token_symbol': self.metadata.symbol if self.metadata else 'TOKEN',
+                'priority_level': priority_level,
+                'estimated_cost': gas_estimate['estimated_cost_formatted']
+            }
+        )
     
     def execute_transfer(
         self,
@@ -518,41 +689,39 @@ class ERC3643Handler:
             raise ValueError("Transfer request must be compliance checked")
         
         # Build transaction
-        with self.provider.connection_pool.get_connection() as w3:
-            transaction = self.contract.functions.transfer(
-                transfer_request.to_address,
-                transfer_request.amount
-            ).build_transaction({
+        transaction = self._build_transaction(
+            'transfer',
+            [transfer_request.to_address, transfer_request.amount],
+            {
                 'from': transfer_request.from_address,
                 'chainId': self.provider.chain_id,
-                'gas': transfer_request.gas_estimate['gas_limit'],
-                'maxPriorityFeePerGas': transfer_request.gas_estimate['max_priority_fee_per_gas'],
-                'maxFeePerGas': transfer_request.gas_estimate['max_fee_per_gas']
-            })
-            
-            # Send transaction
-            result = self.provider.send_transaction(
-                transaction,
-                private_key,
-                wait_for_receipt
-            )
-            
-            # Add transfer metadata to result
-            result['transfer_info'] = {
-                'from': transfer_request.from_address,
-                'to': transfer_request.to_address,
-                'amount': transfer_request.amount,
-                'token': self.metadata.symbol if self.metadata else 'TOKEN'
+                **self._gas_params(transfer_request.gas_estimate)
             }
-            
-            # Log successful transfer
-            if result.get('status') == 'success':
-                self.logger.info(
-                    f"Transfer successful: {transfer_request.amount} tokens "
-                    f"from {transfer_request.from_address[:8]} to {transfer_request.to_address[:8]}"
-                )
-            
-            return result
+        )
+        
+        # Send transaction
+        result = self.provider.send_transaction(
+            transaction,
+            private_key,
+            wait_for_receipt
+        )
+        
+        # Add transfer metadata to result
+        result['transfer_info'] = {
+            'from': transfer_request.from_address,
+            'to': transfer_request.to_address,
+            'amount': transfer_request.amount,
+            'token': self.metadata.symbol if self.metadata else 'TOKEN'
+        }
+        
+        # Log successful transfer
+        if result.get('status') == 'success':
+            self.logger.info(
+                f"Transfer successful: {transfer_request.amount} tokens "
+                f"from {transfer_request.from_address[:8]} to {transfer_request.to_address[:8]}"
+            )
+        
+        return result
     
     def mint_tokens(
         self,
@@ -578,40 +747,352 @@ class ERC3643Handler:
         if not compliance['verified']:
             raise ValueError(f"Recipient {to_address} is not verified")
         
-        with self.provider.connection_pool.get_connection() as w3:
-            to_checksum = w3.to_checksum_address(to_address)
-            
-            # Build mint transaction
-            transaction = self.contract.functions.mint(
-                to_checksum,
-                amount
-            ).build_transaction({
-                'chainId': self.provider.chain_id
-            })
+        to_checksum = Web3.to_checksum_address(to_address)
+        sender = self.provider.signer.account(private_key).address
+        
+        # Estimate gas, then build the mint transaction with it
+        gas_estimate = self._estimate_write('mint', [to_checksum, amount], sender)
+        transaction = self._build_transaction(
+            'mint',
+            [to_checksum, amount],
+            {'from': sender, 'chainId': self.provider.chain_id, **self._gas_params(gas_estimate)}
+        )
+        
+        # Send transaction
+        result = self.provider.send_transaction(
+            transaction,
+            private_key,
+            wait_for_receipt
+        )
+        
+        # Add mint info
+        result['mint_info'] = {
+            'to': to_checksum,
+            'amount': amount,
+            'token': self.metadata.symbol if self.metadata else 'TOKEN'
+        }
+        
+        return result
+    
+    def bulk_mint(
+        self,
+        recipients: Iterable[Tuple[str, int]],
+        private_key: str,
+        chunk_size: int = 500,
+        send_concurrency: int = 8,
+        wait_for_receipt: bool = False,
+        timeout: int = 120
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Mint to many recipients, streaming one result per recipient
+        
+        Args:
+            recipients: Iterable of (address, amount) pairs
+            private_key: Minter's private key
+            chunk_size: Recipients checked, signed and sent per round
+            send_concurrency: Broadcasts in flight at once
+            wait_for_receipt: Wait for each chunk's confirmations before yielding
+            timeout: Receipt timeout in seconds
+        
+        Yields:
+            Per-recipient results in input order ('rejected' when not compliant,
+            'error' when the compliance read failed and may be retried)
+        """
+        minter = self.provider.signer.account(private_key).address
+        for chunk in self._chunked(recipients, chunk_size):
+            yield from self._distribute_chunk(
+                'mint', minter, chunk, private_key,
+                send_concurrency, wait_for_receipt, timeout
+            )
+    
+    def bulk_transfer(
+        self,
+        transfers: Iterable[Tuple[str, int]],
+        private_key: str,
+        chunk_size: int = 500,
+        send_concurrency: int = 8,
+        wait_for_receipt: bool = False,
+        timeout: int = 120
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Transfer from one sender to many recipients, streaming one result per recipient
+        
+        Args:
+            transfers: Iterable of (recipient, amount) pairs
+            private_key: Sender's private key
+            chunk_size: Recipients checked, signed and sent per round
+            send_concurrency: Broadcasts in flight at once
+            wait_for_receipt: Wait for each chunk's confirmations before yielding
+            timeout: Receipt timeout in seconds
+        
+        Yields:
+            Per-recipient results in input order ('rejected' when not allowed,
+            'error' when a compliance read failed and may be retried)
+        """
+        sender = self.provider.signer.account(private_key).address
+        
+        sender_compliance = self._batch_compliance([sender])[sender]
+        balance_raw = self._batch_view_calls([('balanceOf', [sender])])[0]
+        remaining = self._decode_uint(balance_raw) or 0
+        
+        for chunk in self._chunked(transfers, chunk_size):
+            if 'error' in sender_compliance:
+                # Re-read for every chunk until the sender's status is known
+                sender_compliance = self._batch_compliance([sender])[sender]
+            if 'error' in sender_compliance:
+                error = f"Sender compliance check failed: {sender_compliance['error']}"
+                for address, amount in chunk:
+                    yield self._failed(address, amount, error)
+                continue
+            if not sender_compliance['can_transact']:
+                reason = ("Sender account is frozen" if sender_compliance['frozen']
+                          else "Sender is not KYC verified")
+                for address, amount in chunk:
+                    yield self._rejected(address, amount, reason)
+                continue
             
-            # Estimate gas
-            gas_estimate = self.provider.estimate_gas_optimized(transaction)
-            transaction.update({
-                'gas': gas_estimate['gas_limit'],
-                'maxPriorityFeePerGas': gas_estimate['max_priority_fee_per_gas'],
-                'maxFeePerGas': gas_estimate['max_fee_per_gas']
-            })
+            # Reserve balance in input order so later transfers are rejected, not reverted
+            affordable = []
+            rejected = {}
+            for index, (address, amount) in enumerate(chunk):
+                if amount > remaining:
+                    rejected[index] = self._rejected(address, amount, "Insufficient balance")
+                else:
+                    remaining -= amount
+                    affordable.append((index, (address, amount)))
             
-            # Send transaction
-            result = self.provider.send_transaction(
-                transaction,
-                private_key,
-                wait_for_receipt
+            results = dict(rejected)
+            sent = self._distribute_chunk(
+                'transfer', sender, [item for _, item in affordable], private_key,
+                send_concurrency, wait_for_receipt, timeout
             )
+            for (index, (address, amount)), result in zip(affordable, sent):
+                if result['status'] in ('rejected', 'error'):
+                    remaining += amount
+                results[index] = result
             
-            # Add mint info
-            result['mint_info'] = {
-                'to': to_checksum,
-                'amount': amount,
-                'token': self.metadata.symbol if self.metadata else 'TOKEN'
+            for index in range(len(chunk)):
+                yield results[index]
+    
+    @staticmethod
+    def _chunked(items: Iterable[Tuple[str, int]], size: int) -> Iterator[List[Tuple[str, int]]]:
+        iterator = iter(items)
+        while True:
+            chunk = list(islice(iterator, max(1, size)))
+            if not chunk:
+                return
+            yield chunk
+    
+    @staticmethod
+    def _rejected(address: str, amount: int, reason: str) -> Dict[str, Any]:
+        return {'to': address, 'amount': amount, 'status': 'rejected', 'reason': reason}
+    
+    @staticmethod
+    def _failed(address: str, amount: int, error: str) -> Dict[str, Any]:
+        return {'to': address, 'amount': amount, 'status': 'error', 'error': error}
+    
+    def _distribute_chunk(
+        self,
+        fn_name: str,
+        sender: ChecksumAddress,
+        chunk: List[Tuple[str, int]],
+        private_key: str,
+        send_concurrency: int,
+        wait_for_receipt: bool,
+        timeout: int
+    ) -> List[Dict[str, Any]]:
+        """Check, encode and send one chunk of mint/transfer calls"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(chunk)
+        
+        eligible: List[Tuple[int, ChecksumAddress, int]] = []
+        for index, (address, amount) in enumerate(chunk):
+            try:
+                eligible.append((index, Web3.to_checksum_address(address), amount))
+            except ValueError as e:
+                results[index] = self._rejected(address, amount, f"Invalid address: {e}")
+        
+        # Compliance for every recipient up front, in batched calls
+        compliance = self._batch_compliance([to for _, to, _ in eligible])
+        if fn_name == 'transfer':
+            allowed = self._batch_view_calls([
+                ('canTransfer', [sender, to, amount]) for _, to, amount in eligible
+            ])
+        else:
+            allowed = [None] * len(eligible)
+        
+        to_send: List[Tuple[int, ChecksumAddress, int]] = []
+        for (index, to, amount), can_transfer in zip(eligible, allowed):
+            status = compliance[to]
+            if 'error' in status:
+                results[index] = self._failed(to, amount, f"Recipient compliance check failed: {status['error']}")
+            elif not status['verified']:
+                results[index] = self._rejected(to, amount, "Recipient is not KYC verified")
+            elif status['frozen']:
+                results[index] = self._rejected(to, amount, "Recipient account is frozen")
+            elif fn_name == 'transfer' and not self._decode_bool(can_transfer):
+                results[index] = self._rejected(to, amount, "Transfer not allowed by compliance rules")
+            else:
+                to_send.append((index, to, amount))
+        
+        # Calldata is encoded locally; gas is estimated once per call shape by the provider
+        transactions = [
+            {
+                'from': sender,
+                'to': self.contract_address,
+                'data': self.contract.encode_abi(fn_name=fn_name, args=[to, amount]),
+                'value': 0
             }
-            
-            return result
+            for _, to, amount in to_send
+        ]
+        sent = self.provider.send_transactions(
+            transactions,
+            private_key,
+            wait_for_receipt=wait_for_receipt,
+            timeout=timeout,
+            send_concurrency=send_concurrency
+        ) if transactions else []
+        
+        for (index, to, amount), result in zip(to_send, sent):
+            results[index] = dict(result, to=to, amount=amount)
+        
+        succeeded = sum(1 for result in results if result['status'] in ('pending', 'success'))
+        self.logger.info(f"Bulk {fn_name}: {succeeded}/{len(chunk)} submitted")
+        
+        return results
+    
+    def _batch_view_calls(
+        self,
+        calls: List[Tuple[str, List[Any]]],
+        block_identifier: Optional[BlockIdentifier] = None
+    ) -> List[Optional[bytes]]:
+        """
+        Run contract view calls through Multicall3; failed calls return None.
+        Calls run at block_identifier when given, else at the pinned block
+        (memoized there), else at latest.
+        """
+        snapshot = getattr(self._pinned, 'snapshot', None)
+        if snapshot is None or block_identifier is not None:
+            return self.multicall.call(
+                [
+                    (self.contract_address, self.contract.encode_abi(fn_name=fn_name, args=args))
+                    for fn_name, args in calls
+                ],
+                block_identifier=None if block_identifier == 'latest' else block_identifier
+            )
+        
+        # Only reads not yet memoized at the pinned block go out
+        keys = [('eth_call', fn_name, *args) for fn_name, args in calls]
+        results: List[Optional[bytes]] = []
+        missing: List[int] = []
+        for index, key in enumerate(keys):
+            found, raw = snapshot.lookup(key)
+            results.append(raw)
+            if not found:
+                missing.append(index)
+        
+        if missing:
+            fetched = self.multicall.call(
+                [
+                    (self.contract_address, self.contract.encode_abi(fn_name=calls[index][0], args=calls[index][1]))
+                    for index in missing
+                ],
+                block_identifier=snapshot.block_number
+            )
+            for index, raw in zip(missing, fetched):
+                results[index] = raw
+                if raw is not None:
+                    snapshot.store(keys[index], raw)
+        return results
+    
+    @staticmethod
+    def _decode_uint(raw: Optional[bytes]) -> Optional[int]:
+        if not raw or len(raw) < 32:
+            return None
+        return int.from_bytes(raw[:32], 'big')
+    
+    @classmethod
+    def _decode_bool(cls, raw: Optional[bytes]) -> bool:
+        return bool(cls._decode_uint(raw))
+    
+    def _batch_compliance(
+        self,
+        addresses: List[ChecksumAddress],
+        use_cache: bool = True
+    ) -> Dict[ChecksumAddress, Dict[str, Any]]:
+        """Verification and frozen status for many addresses with batched calls"""
+        # Reads pinned by at_block() are memoized there instead of cached as latest
+        latest = self.pinned_block is None
+        results = {}
+        uncached = []
+        for address in dict.fromkeys(addresses):
+            cached = self.compliance_cache.get(self.contract_address, address) if use_cache and latest else None
+            if cached is not None:
+                results[address] = {'verified': cached.verified, 'frozen': cached.frozen, 'cached': True}
+            else:
+                uncached.append(address)
+        
+        if uncached:
+            version = self.compliance_cache.version
+            raw = self._batch_view_calls([
+                call for address in uncached
+                for call in (('isVerified', [address]), ('isFrozen', [address]))
+            ])
+            for i, address in enumerate(uncached):
+                if raw[2 * i] is None:
+                    # A failed read is not a KYC rejection; callers retry these
+                    results[address] = {
+                        'verified': False, 'frozen': False, 'cached': False,
+                        'error': "isVerified call failed"
+                    }
+                    continue
+                # isFrozen may not exist in all implementations; failures read as not frozen
+                is_verified = self._decode_bool(raw[2 * i])
+                is_frozen = self._decode_bool(raw[2 * i + 1])
+                if latest:
+                    self.compliance_cache.set(
+                        self.contract_address, address, is_verified, is_frozen, version=version
+                    )
+                results[address] = {'verified': is_verified, 'frozen': is_frozen, 'cached': False}
+        
+        for status in results.values():
+            status['can_transact'] = status['verified'] and not status['frozen']
+        return results
+    
+    def bulk_check_compliance(
+        self,
+        addresses: Iterable[str],
+        use_cache: bool = True
+    ) -> Dict[ChecksumAddress, Dict[str, Any]]:
+        """
+        Check verification and frozen status for many investors
+        
+        Args:
+            addresses: Investor wallet addresses
+            use_cache: Use cached verification results if available
+        
+        Returns:
+            Compliance status per checksum address ('error' set where the read failed)
+        """
+        checksum_addresses = [Web3.to_checksum_address(address) for address in addresses]
+        results = self._batch_compliance(checksum_addresses, use_cache=use_cache)
+        return {address: {'address': address, **status} for address, status in results.items()}
+    
+    def bulk_balances(self, addresses: Iterable[str]) -> Dict[ChecksumAddress, Optional[int]]:
+        """
+        Get raw token balances for many addresses
+        
+        Args:
+            addresses: Wallet addresses
+        
+        Returns:
+            Balance per checksum address (None where the call failed)
+        """
+        checksum_addresses = list(dict.fromkeys(Web3.to_checksum_address(address) for address in addresses))
+        raw = self._batch_view_calls([('balanceOf', [address]) for address in checksum_addresses])
+        return {
+            address: self._decode_uint(result)
+            for address, result in zip(checksum_addresses, raw)
+        }
     
     def burn_tokens(
         self,
@@ -632,40 +1113,32 @@ class ERC3643Handler:
         Returns:
             Transaction result
         """
-        with self.provider.connection_pool.get_connection() as w3:
-            from_checksum = w3.to_checksum_address(from_address)
-            
-            # Build burn transaction
-            transaction = self.contract.functions.burn(
-                from_checksum,
-                amount
-            ).build_transaction({
-                'chainId': self.provider.chain_id
-            })
-            
-            # Estimate gas
-            gas_estimate = self.provider.estimate_gas_optimized(transaction)
-            transaction.update({
-                'gas': gas_estimate['gas_limit'],
-                'maxPriorityFeePerGas': gas_estimate['max_priority_fee_per_gas'],
-                'maxFeePerGas': gas_estimate['max_fee_per_gas']
-            })
-            
-            # Send transaction
-            result = self.provider.send_transaction(
-                transaction,
-                private_key,
-                wait_for_receipt
-            )
-            
-            # Add burn info
-            result['burn_info'] = {
-                'from': from_checksum,
-                'amount': amount,
-                'token': self.metadata.symbol if self.metadata else 'TOKEN'
-            }
-            
-            return result
+        from_checksum = Web3.to_checksum_address(from_address)
+        sender = self.provider.signer.account(private_key).address
+        
+        # Estimate gas, then build the burn transaction with it
+        gas_estimate = self._estimate_write('burn', [from_checksum, amount], sender)
+        transaction = self._build_transaction(
+            'burn',
+            [from_checksum, amount],
+            {'from': sender, 'chainId': self.provider.chain_id, **self._gas_params(gas_estimate)}
+        )
+        
+        # Send transaction
+        result = self.provider.send_transaction(
+            transaction,
+            private_key,
+            wait_for_receipt
+        )
+        
+        # Add burn info
+        result['burn_info'] = {
+            'from': from_checksum,
+            'amount': amount,
+            'token': self.metadata.symbol if self.metadata else 'TOKEN'
+        }
+        
+        return result
     
     def freeze_account(
         self,
@@ -684,33 +1157,31 @@ class ERC3643Handler:
         Returns:
             Transaction result
         """
-        with self.provider.connection_pool.get_connection() as w3:
-            investor_checksum = w3.to_checksum_address(investor_address)
-            
-            # Build freeze transaction
-            transaction = self.contract.functions.freezePartialTokens(
-                investor_checksum
-            ).build_transaction({
-                'chainId': self.provider.chain_id
-            })
-            
-            # Send transaction
-            result = self.provider.send_transaction(
-                transaction,
-                private_key,
-                wait_for_receipt
-            )
-            
-            # Clear compliance cache for this address
-            if investor_address in self.compliance_cache:
-                del self.compliance_cache[investor_address]
-            
-            result['freeze_info'] = {
-                'investor': investor_checksum,
-                'action': 'frozen'
-            }
-            
-            return result
+        investor_checksum = Web3.to_checksum_address(investor_address)
+        
+        # Build freeze transaction
+        transaction = self._build_transaction(
+            'freezePartialTokens',
+            [investor_checksum],
+            {'chainId': self.provider.chain_id}
+        )
+        
+        # Send transaction
+        result = self.provider.send_transaction(
+            transaction,
+            private_key,
+            wait_for_receipt
+        )
+        
+        # Clear compliance cache for this address
+        self.compliance_cache.invalidate(investor_checksum, self.contract_address)
+        
+        result['freeze_info'] = {
+            'investor': investor_checksum,
+            'action': 'frozen'
+        }
+        
+        return result
     
     def unfreeze_account(
         self,
@@ -729,33 +1200,31 @@ class ERC3643Handler:
         Returns:
             Transaction result
         """
-        with self.provider.connection_pool.get_connection() as w3:
-            investor_checksum = w3.to_checksum_address(investor_address)
-            
-            # Build unfreeze transaction
-            transaction = self.contract.functions.unfreezePartialTokens(
-                investor_checksum
-            ).build_transaction({
-                'chainId': self.provider.chain_id
-            })
-            
-            # Send transaction
-            result = self.provider.send_transaction(
-                transaction,
-                private_key,
-                wait_for_receipt
-            )
-            
-            # Clear compliance cache for this address
-            if investor_address in self.compliance_cache:
-                del self.compliance_cache[investor_address]
-            
-            result['freeze_info'] = {
-                'investor': investor_checksum,
-                'action': 'unfrozen'
-            }
-            
-            return result
+        investor_checksum = Web3.to_checksum_address(investor_address)
+        
+        # Build unfreeze transaction
+        transaction = self._build_transaction(
+            'unfreezePartialTokens',
+            [investor_checksum],
+            {'chainId': self.provider.chain_id}
+        )
+        
+        # Send transaction
+        result = self.provider.send_transaction(
+            transaction,
+            private_key,
+            wait_for_receipt
+        )
+        
+        # Clear compliance cache for this address
+        self.compliance_cache.invalidate(investor_checksum, self.contract_address)
+        
+        result['freeze_info'] = {
+            'investor': investor_checksum,
+            'action': 'unfrozen'
+        }
+        
+        return result
     
     def watch_transfer_events(
         self,
@@ -774,13 +1243,16 @@ class ERC3643Handler:
             if callback:
                 callback(event)
         
-        # Create event filter
-        event_filter = self.contract.events.Transfer.create_filter(
-            fromBlock=from_block
-        )
+        # Create event filter; it lives on the node behind this connection and
+        # keeps polling through it
+        with self.provider.connection_pool.get_connection() as w3:
+            event_filter = self._bind(w3).events.Transfer.create_filter(
+                fromBlock=from_block
+            )
+            entries = event_filter.get_new_entries()
         
         # Process events
-        for event in event_filter.get_new_entries():
+        for event in entries:
             event_handler(event)
         
         return event_filter
@@ -802,18 +1274,39 @@ class ERC3643Handler:
         Returns:
             List of transfer events
         """
+        # Indexed blocks are read from the database, only the rest from the chain
+        indexed = None
+        if self.indexer is not None:
+            indexed = self.indexer.indexed_prefix(self.contract_address, from_block, to_block)
+        if indexed is None:
+            return self._chain_transaction_history(address, from_block, to_block)
+        
+        transfers = self._indexed_transaction_history(address, from_block, indexed)
+        if isinstance(to_block, int) and to_block <= indexed:
+            return transfers
+        # The unindexed tail is newer than every indexed row
+        return self._chain_transaction_history(address, indexed + 1, to_block) + transfers
+    
+    def _chain_transaction_history(
+        self,
+        address: str,
+        from_block: int,
+        to_block: Any
+    ) -> List[Dict[str, Any]]:
+        """get_transaction_history from Transfer logs on the chain"""
         with self.provider.connection_pool.get_connection() as w3:
+            contract = self._bind(w3)
             checksum_address = w3.to_checksum_address(address)
             
             # Get sent transfers
-            sent_filter = self.contract.events.Transfer.create_filter(
+            sent_filter = contract.events.Transfer.create_filter(
                 fromBlock=from_block,
                 toBlock=to_block,
                 argument_filters={'from': checksum_address}
             )
             
             # Get received transfers
-            received_filter = self.contract.events.Transfer.create_filter(
+            received_filter = contract.events.Transfer.create_filter(
                 fromBlock=from_block,
                 toBlock=to_block,
                 argument_filters={'to': checksum_address}
@@ -844,4 +1337,36 @@ class ERC3643Handler:
             # Sort by block number
             transfers.sort(key=lambda x: x['block_number'], reverse=True)
             
-            return transfers
\ No newline at end of file
+            return transfers
+    
+    def _indexed_transaction_history(
+        self,
+        address: str,
+        from_block: int,
+        to_block: int
+    ) -> List[Dict[str, Any]]:
+        """get_transaction_history from the token event index"""
+        checksum_address = Web3.to_checksum_address(address)
+        rows = self.indexer.get_history(
+            self.contract_address,
+            address=checksum_address,
+            from_block=from_block,
+            to_block=to_block,
+            event_types=['Transfer']
+        )
+        
+        transfers = []
+        for row in rows:
+            entry = {
+                'from': row.from_address,
+                'to': row.to_address,
+                'amount': int(row.amount),
+                'block_number': row.block_number,
+                'transaction_hash': row.transaction_hash
+            }
+            if row.from_address == checksum_address:
+                transfers.append({'type': 'sent', **entry})
+            if row.to_address == checksum_address:
+                transfers.append({'type': 'received', **entry})
+        
+        return transfers
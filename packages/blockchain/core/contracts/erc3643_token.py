@@ -16,8 +16,12 @@ from enum import Enum
 
 from web3 import Web3
 from web3.contract import Contract
+from web3.types import BlockIdentifier
 from eth_typing import HexStr, ChecksumAddress
 
+from ..providers.polygon_provider import TransactionSigner, shared_transaction_signer
+from .single_flight import SingleFlight
+
 
 class ComplianceStatus(Enum):
     """Token transfer compliance status"""
@@ -156,7 +160,9 @@ class ERC3643Token:
         self,
         web3: Web3,
         contract_address: str,
-        identity_registry_address: Optional[str] = None
+        identity_registry_address: Optional[str] = None,
+        signer: Optional[TransactionSigner] = None,
+        lookups: Optional[SingleFlight] = None
     ):
         """
         Initialize ERC-3643 token contract interface
@@ -165,10 +171,14 @@ class ERC3643Token:
             web3: Web3 instance
             contract_address: Deployed token contract address
             identity_registry_address: Identity registry contract address
+            signer: Signing service (the process-wide shared signer if None)
+            lookups: Coalesces concurrent identical compliance reads (one per token if None)
         """
         self.w3 = web3
+        self.signer = signer or shared_transaction_signer
         self.address = self.w3.to_checksum_address(contract_address)
         self.identity_registry = identity_registry_address
+        self.lookups = lookups or SingleFlight()
         
         # Initialize contract
         self.contract: Contract = self.w3.eth.contract(
@@ -203,7 +213,8 @@ class ERC3643Token:
         self,
         from_address: str,
         to_address: str,
-        amount: Decimal
+        amount: Decimal,
+        block_identifier: BlockIdentifier = 'latest'
     ) -> Tuple[bool, ComplianceStatus, str]:
         """
         Check if transfer meets compliance requirements
@@ -212,6 +223,7 @@ class ERC3643Token:
             from_address: Sender address
             to_address: Recipient address
             amount: Transfer amount
+            block_identifier: Block to read at
             
         Returns:
             Tuple of (can_transfer, status, reason)
@@ -222,18 +234,21 @@ class ERC3643Token:
             amount_wei = int(amount * 10**self.token_info['decimals'])
             
             # Check if transfer is allowed
-            can_transfer = self.contract.functions.canTransfer(
-                from_addr,
-                to_addr,
-                amount_wei
-            ).call()
+            can_transfer = self.lookups.do(
+                (self.address, 'canTransfer', from_addr, to_addr, amount_wei, block_identifier),
+                lambda: self.contract.functions.canTransfer(
+                    from_addr,
+                    to_addr,
+                    amount_wei
+                ).call(block_identifier=block_identifier)
+            )
             
             if can_transfer:
                 return (True, ComplianceStatus.APPROVED, "Transfer approved")
             
             # Determine why transfer is blocked
-            from_verified = self.contract.functions.isVerified(from_addr).call()
-            to_verified = self.contract.functions.isVerified(to_addr).call()
+            from_verified = self._is_verified(from_addr, block_identifier)
+            to_verified = self._is_verified(to_addr, block_identifier)
             
             if not from_verified:
                 return (False, ComplianceStatus.PENDING_KYC, "Sender not KYC verified")
@@ -245,6 +260,13 @@ class ERC3643Token:
         except Exception as e:
             return (False, ComplianceStatus.BLOCKED, f"Compliance check failed: {str(e)}")
     
+    def _is_verified(self, address: ChecksumAddress, block_identifier: BlockIdentifier) -> bool:
+        """isVerified, shared with concurrent checks of the same investor"""
+        return self.lookups.do(
+            (self.address, 'isVerified', address, block_identifier),
+            lambda: self.contract.functions.isVerified(address).call(block_identifier=block_identifier)
+        )
+    
     def get_balance(self, address: str) -> Dict[str, Any]:
         """Get token balance for address"""
         checksum_addr = self.w3.to_checksum_address(address)
@@ -278,10 +300,8 @@ class ERC3643Token:
         Returns:
             Transaction result
         """
-        from eth_account import Account
-        
         # Get sender account
-        account = Account.from_key(from_private_key)
+        account = self.signer.account(from_private_key)
         from_addr = account.address
         to_addr = self.w3.to_checksum_address(to_address)
         amount_wei = int(amount * 10**self.token_info['decimals'])
@@ -316,8 +336,8 @@ class ERC3643Token:
             'gasPrice': self.w3.eth.gas_price
         })
         
-        # Sign and send
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, from_private_key)
+        # Sign offline and send
+        signed_txn = self.signer.sign(transaction, from_private_key)
         tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
         
         # Wait for receipt
@@ -350,9 +370,7 @@ class ERC3643Token:
         Returns:
             Transaction result
         """
-        from eth_account import Account
-        
-        account = Account.from_key(minter_private_key)
+        account = self.signer.account(minter_private_key)
         to_addr = self.w3.to_checksum_address(to_address)
         amount_wei = int(amount * 10**self.token_info['decimals'])
         
@@ -368,8 +386,8 @@ class ERC3643Token:
             'gasPrice': self.w3.eth.gas_price
         })
         
-        # Sign and send
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, minter_private_key)
+        # Sign offline and send
+        signed_txn = self.signer.sign(transaction, minter_private_key)
         tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
         
         # Wait for receipt
@@ -402,9 +420,7 @@ class ERC3643Token:
         Returns:
             Transaction result
         """
-        from eth_account import Account
-        
-        account = Account.from_key(burner_private_key)
+        account = self.signer.account(burner_private_key)
         from_addr = self.w3.to_checksum_address(from_address)
         amount_wei = int(amount * 10**self.token_info['decimals'])
         
@@ -420,8 +436,8 @@ class ERC3643Token:
             'gasPrice': self.w3.eth.gas_price
         })
         
-        # Sign and send
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, burner_private_key)
+        # Sign offline and send
+        signed_txn = self.signer.sign(transaction, burner_private_key)
         tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
         
         # Wait for receipt
@@ -439,9 +455,7 @@ class ERC3643Token:
     
     def freeze_account(self, account: str, admin_private_key: str) -> Dict[str, Any]:
         """Freeze an account (admin function)"""
-        from eth_account import Account
-        
-        admin = Account.from_key(admin_private_key)
+        admin = self.signer.account(admin_private_key)
         target = self.w3.to_checksum_address(account)
         
         transaction = self.contract.functions.freeze(target).build_transaction({
@@ -452,7 +466,7 @@ class ERC3643Token:
             'gasPrice': self.w3.eth.gas_price
         })
         
-        signed_txn = self.w3.eth.account.sign_transaction(transaction, admin_private_key)
+        signed_txn = self.signer.sign(transaction, admin_private_key)
         tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
         receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
         
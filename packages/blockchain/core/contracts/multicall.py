@@ -0,0 +1,132 @@
+"""
+Multicall3 Aggregation for Veria Platform
+Packs many contract view calls into one eth_call to the Multicall3 contract,
+which is deployed at the same address on Polygon PoS, Amoy and most EVM chains
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from eth_abi import decode as abi_decode, encode as abi_encode
+from hexbytes import HexBytes
+from web3 import Web3
+
+from ..providers.polygon_provider import PolygonProvider
+
+MULTICALL3_ADDRESS = Web3.to_checksum_address('0xca11bde05977b3631167028862be2a173976ca11')
+
+# aggregate3((address target, bool allowFailure, bytes callData)[]) returns ((bool success, bytes returnData)[])
+AGGREGATE3_SELECTOR = Web3.keccak(text='aggregate3((address,bool,bytes)[])')[:4]
+
+ViewCall = Tuple[str, Any]  # (target, calldata as bytes or 0x-hex)
+
+
+class Multicall3:
+    """
+    Runs (target, calldata) view calls through Multicall3.aggregate3 with
+    allowFailure set, so one reverting call does not fail the others.
+    Calls are split into chunks of max_calls; all chunks go out in a single
+    JSON-RPC batch. Chunks whose aggregate call fails are retried as plain
+    eth_calls (chains or devnets without Multicall3).
+    """
+    
+    def __init__(
+        self,
+        provider: PolygonProvider,
+        address: str = MULTICALL3_ADDRESS,
+        max_calls: int = 500
+    ):
+        """
+        Args:
+            provider: Polygon provider used for the batched eth_calls
+            address: Multicall3 deployment
+            max_calls: Calls per aggregate3 (bounded by the node's eth_call gas cap)
+        """
+        self.provider = provider
+        self.address = Web3.to_checksum_address(address)
+        self.max_calls = max(1, max_calls)
+        self.logger = logging.getLogger(f"{__name__}.Multicall3")
+        self.stats = {'aggregate_calls': 0, 'view_calls': 0, 'fallback_chunks': 0}
+    
+    @staticmethod
+    def encode(calls: Sequence[ViewCall]) -> bytes:
+        """aggregate3 calldata for a list of calls"""
+        return AGGREGATE3_SELECTOR + abi_encode(
+            ['(address,bool,bytes)[]'],
+            [[(target, True, bytes(HexBytes(data))) for target, data in calls]]
+        )
+    
+    @staticmethod
+    def decode(raw: bytes, expected: int) -> List[Optional[bytes]]:
+        """Return data per call; None for calls that reverted"""
+        (results,) = abi_decode(['(bool,bytes)[]'], raw)
+        if len(results) != expected:
+            raise ValueError(f"aggregate3 returned {len(results)} results for {expected} calls")
+        return [bytes(data) if success else None for success, data in results]
+    
+    def _request(self, to: str, data: bytes, block_identifier: Any) -> Tuple[str, List[Any]]:
+        params: List[Any] = [{'to': to, 'data': '0x' + bytes(HexBytes(data)).hex()}]
+        if block_identifier is not None:
+            params.append(block_identifier)
+        return 'call', params
+    
+    @staticmethod
+    def _as_bytes(result: Any) -> Optional[bytes]:
+        return None if result is None or isinstance(result, dict) else bytes(result)
+    
+    def call(
+        self,
+        calls: Sequence[ViewCall],
+        block_identifier: Any = None
+    ) -> List[Optional[bytes]]:
+        """
+        Execute view calls
+        
+        Args:
+            calls: (target address, calldata) pairs
+            block_identifier: Block to read at (latest if None)
+        
+        Returns:
+            Return data per call in order; None where the call failed
+        """
+        if not calls:
+            return []
+        
+        chunks = [calls[start:start + self.max_calls] for start in range(0, len(calls), self.max_calls)]
+        responses = self.provider.batch_request([
+            self._request(self.address, self.encode(chunk), block_identifier) for chunk in chunks
+        ])
+        self.stats['aggregate_calls'] += len(chunks)
+        self.stats['view_calls'] += len(calls)
+        
+        results: List[Optional[bytes]] = []
+        failed: List[int] = []
+        for index, (chunk, response) in enumerate(zip(chunks, responses)):
+            raw = self._as_bytes(response)
+            try:
+                if raw is None:
+                    raise ValueError(response.get('error') if isinstance(response, dict) else 'no result')
+                results.extend(self.decode(raw, len(chunk)))
+            except Exception as e:
+                self.logger.warning(f"aggregate3 at {self.address} failed, using plain eth_calls: {e}")
+                failed.append(index)
+                results.extend([None] * len(chunk))
+        
+        if failed:
+            self.stats['fallback_chunks'] += len(failed)
+            retry = [entry for index in failed for entry in self._positions(chunks, index)]
+            direct = self.provider.batch_request([
+                self._request(target, data, block_identifier) for _, (target, data) in retry
+            ])
+            for (position, _), response in zip(retry, direct):
+                results[position] = self._as_bytes(response)
+        
+        return results
+    
+    def _positions(self, chunks: List[Sequence[ViewCall]], index: int):
+        """(result position, call) pairs of one chunk"""
+        offset = index * self.max_calls
+        return [(offset + i, call) for i, call in enumerate(chunks[index])]
+    
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
@@ -0,0 +1,71 @@
+"""
+Request Coalescing for Veria Platform
+Concurrent calls for the same key share one execution, so a burst of lookups
+for one investor costs one set of RPCs instead of one per caller
+"""
+
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for and share its result (or exception). Nothing is kept once
+    the call completes, so later callers run it again.
+    """
+    
+    def __init__(self):
+        self.lock = Lock()
+        self.calls: Dict[Hashable, Future] = {}
+        self.stats = {'calls': 0, 'coalesced': 0}
+    
+    def join(self, key: Hashable) -> Tuple[Future, bool]:
+        """In-flight future for key and whether the caller is its leader"""
+        with self.lock:
+            future = self.calls.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                return future, False
+            future = self.calls[key] = Future()
+            self.stats['calls'] += 1
+            return future, True
+    
+    def run(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> Any:
+        """Execute fn as the leader of key and publish its outcome to the waiters"""
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                if self.calls.get(key) is future:
+                    del self.calls[key]
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Result of fn, shared with concurrent callers using the same key"""
+        future, leader = self.join(key)
+        if not leader:
+            return future.result()
+        return self.run(key, future, fn)
+    
+    def forget(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Detach matching in-flight calls so later callers start a new one"""
+        with self.lock:
+            keys = [key for key in self.calls if predicate(key)]
+            for key in keys:
+                del self.calls[key]
+            return len(keys)
+    
+    def in_flight(self, key: Hashable) -> bool:
+        with self.lock:
+            return key in self.calls
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {**self.stats, 'in_flight': len(self.calls)}
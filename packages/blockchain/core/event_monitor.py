@@ -12,18 +12,28 @@ Real-time event monitoring for smart contracts with:
 import asyncio
 import json
 import logging
+import os
 import time
 from typing import Dict, Any, List, Callable, Optional, Set
+from functools import partial
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from threading import Lock
-import queue
 
 from web3 import Web3
 from web3.types import LogReceipt, FilterParams
 from eth_typing import HexStr
 
+from .monitoring.block_ranges import BlockRangeSplitter
+from .monitoring.decoding import STANDARD_EVENTS_ABI, EventDecoderRegistry
+from .monitoring.checkpoints import CheckpointMarker, CheckpointStore, create_checkpoint_store
+from .monitoring.reorgs import BlockRef, ReorgBuffer, ReorgRetraction, normalize_hash
+from .monitoring.subscriptions import SubscriptionFeed
+from .monitoring.sharding import AsyncShardedWorkerPool, holder_key
+from .monitoring.indexer import INDEXED_EVENTS, EventIndexer
+from .contracts.compliance_cache import ComplianceCache, shared_compliance_cache
+
 
 class EventType(Enum):
     """Supported blockchain event types"""
@@ -50,6 +60,7 @@ class MonitoredEvent:
     args: Dict[str, Any]
     log_index: int
     processed: bool = False
+    block_hash: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -74,6 +85,21 @@ class EventProcessor:
             True if processed successfully
         """
         raise NotImplementedError("Subclasses must implement process()")
+    
+    async def retract(self, event: MonitoredEvent) -> bool:
+        """
+        Undo an event whose block was orphaned by a chain reorganization
+        
+        Args:
+            event: The previously processed event
+            
+        Returns:
+            True if retracted successfully
+        """
+        self.logger.warning(
+            f"Retracted {event.event_type} {event.transaction_hash} (Block: {event.block_number})"
+        )
+        return True
 
 
 class TransferEventProcessor(EventProcessor):
@@ -128,15 +154,35 @@ class EventMonitor:
         EventType.APPROVAL: "Approval(address,address,uint256)",
         EventType.FREEZE: "Freeze(address)",
         EventType.UNFREEZE: "Unfreeze(address)",
+        EventType.IDENTITY_VERIFIED: "IdentityVerified(address)",
         EventType.PAUSED: "Paused()",
         EventType.UNPAUSED: "Unpaused()"
     }
     
+    # topic0 per event type, hashed once
+    EVENT_TOPICS = {
+        event_type: normalize_hash(Web3.keccak(text=signature))
+        for event_type, signature in EVENT_SIGNATURES.items()
+    }
+    
+    # Sweep anyway if no head is pushed for this long (stalled WebSocket)
+    PUSH_HEARTBEAT = 30.0
+    
     def __init__(
         self,
         web3: Web3,
         poll_interval: float = 2.0,
-        max_event_queue: int = 10000
+        max_event_queue: int = 10000,
+        range_splitter: Optional[BlockRangeSplitter] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        reorg_buffer: Optional[ReorgBuffer] = None,
+        ws_url: Optional[str] = None,
+        shards: int = 4,
+        max_pending_events: int = 1000,
+        shard_by: str = 'contract',
+        indexer: Optional[EventIndexer] = None,
+        compliance_cache: Optional[ComplianceCache] = None,
+        checkpoint_namespace: str = 'async-monitor'
     ):
         """
         Initialize event monitor
@@ -145,19 +191,51 @@ class EventMonitor:
             web3: Web3 instance
             poll_interval: Polling interval in seconds
             max_event_queue: Maximum queued events
+            range_splitter: Adaptive eth_getLogs range sizing
+            checkpoint_store: Durable cursors and processed event keys (SQLite file
+                under the user state directory if None)
+            reorg_buffer: Recent block hashes used to retract events from orphaned blocks
+            ws_url: WebSocket endpoint for newHeads/logs push mode (polling if None)
+            shards: Concurrent processing tasks; events keep their order within a shard
+            max_pending_events: Queue bound per shard
+            shard_by: 'contract' or 'holder' (first non-zero address in the event args)
+            indexer: Token event index answering historical queries without RPC scans
+            compliance_cache: Handler cache to invalidate on freeze and identity events
+                (the process-wide cache the handlers share if None)
+            checkpoint_namespace: Cursor namespace of the default checkpoint store
         """
         self.w3 = web3
         self.poll_interval = poll_interval
+        self.range_splitter = range_splitter or BlockRangeSplitter()
+        self.checkpoint_store = checkpoint_store or create_checkpoint_store(namespace=checkpoint_namespace)
+        self.reorg_buffer = reorg_buffer or ReorgBuffer()
+        self.ws_url = ws_url
+        self.indexer = indexer
+        self.compliance_cache = shared_compliance_cache if compliance_cache is None else compliance_cache
+        self.decoders = EventDecoderRegistry(STANDARD_EVENTS_ABI)
+        self.subscription_feed: Optional[SubscriptionFeed] = None
+        self.subscription_task: Optional[asyncio.Task] = None
+        self.poll_task: Optional[asyncio.Task] = None
+        self.router_task: Optional[asyncio.Task] = None
         
         # Event tracking
         self.monitored_contracts: Set[str] = set()
         self.event_filters: Dict[str, Any] = {}
         self.event_processors: Dict[str, EventProcessor] = {}
-        self.event_queue: queue.Queue = queue.Queue(maxsize=max_event_queue)
+        self.event_queue: asyncio.Queue = asyncio.Queue(maxsize=max_event_queue)
+        self.shard_by = shard_by
+        self.workers = AsyncShardedWorkerPool(
+            self._handle_event,
+            shards=shards,
+            max_pending=max_pending_events,
+            name='event-monitor'
+        )
         
         # State management
         self.is_running = False
-        self.last_block = self.w3.eth.block_number
+        # Head and saved cursors are looked up by start() and the poll loop, off the event loop
+        self.last_block: Optional[int] = None
+        self.unresumed_contracts: Set[str] = set()
         self.lock = Lock()
         
         # Statistics
@@ -165,6 +243,8 @@ class EventMonitor:
             'events_received': 0,
             'events_processed': 0,
             'events_failed': 0,
+            'events_retracted': 0,
+            'events_pushed': 0,
             'start_time': None,
             'last_event_time': None
         }
@@ -192,7 +272,8 @@ class EventMonitor:
         self,
         contract_address: str,
         event_types: List[EventType],
-        from_block: Optional[int] = None
+        from_block: Optional[int] = None,
+        abi: Optional[List[Dict]] = None
     ) -> None:
         """
         Add a contract to monitor
@@ -201,21 +282,24 @@ class EventMonitor:
             contract_address: Contract address to monitor
             event_types: List of event types to monitor
             from_block: Starting block number
+            abi: Contract ABI whose events should be decoded (standard events otherwise)
         """
         checksum_address = self.w3.to_checksum_address(contract_address)
+        if abi:
+            self.decoders.register(abi)
         
         with self.lock:
             self.monitored_contracts.add(checksum_address)
+            # Rewound to the saved cursor before the next sweep so missed blocks are replayed
+            if from_block is None:
+                self.unresumed_contracts.add(checksum_address)
             
             for event_type in event_types:
                 filter_id = f"{checksum_address}_{event_type.value}"
                 
                 if filter_id not in self.event_filters:
-                    # Create event signature hash
-                    event_sig = self.EVENT_SIGNATURES.get(event_type)
-                    if event_sig:
-                        event_hash = self.w3.keccak(text=event_sig).hex()
-                        
+                    event_hash = self.EVENT_TOPICS.get(event_type)
+                    if event_hash:
                         # Create filter
                         filter_params = FilterParams(
                             address=checksum_address,
@@ -233,6 +317,9 @@ class EventMonitor:
                         self.logger.info(
                             f"Added monitor for {event_type.value} on {checksum_address[:10]}..."
                         )
+        
+        if self.subscription_feed:
+            self.subscription_feed.refresh()
     
     def remove_contract(self, contract_address: str) -> None:
         """Remove a contract from monitoring"""
@@ -251,6 +338,9 @@ class EventMonitor:
                 del self.event_filters[filter_id]
                 
             self.logger.info(f"Removed monitor for {checksum_address[:10]}...")
+        
+        if self.subscription_feed:
+            self.subscription_feed.refresh()
     
     def add_processor(self, event_type: EventType, processor: EventProcessor) -> None:
         """Add an event processor"""
@@ -263,119 +353,417 @@ class EventMonitor:
             return
             
         self.is_running = True
+        self.compliance_cache.watch()
         self.stats['start_time'] = time.time()
         
         self.logger.info("Starting event monitor...")
+        await self._resume_from_checkpoints()
+        
+        # Push mode: new heads trigger sweeps, logs are delivered as they arrive
+        if self.ws_url:
+            self.subscription_feed = SubscriptionFeed(
+                self.ws_url,
+                self._subscription_filter,
+                self._on_pushed_log
+            )
+            self.subscription_task = asyncio.create_task(self.subscription_feed.run())
         
         # Start polling task
-        asyncio.create_task(self._poll_events())
+        self.poll_task = asyncio.create_task(self._poll_events())
         
-        # Start processing task
-        asyncio.create_task(self._process_events())
+        # Start processing shards and the task feeding them
+        self.workers.start()
+        self.router_task = asyncio.create_task(self._process_events())
         
-    async def stop(self) -> None:
-        """Stop the event monitoring system"""
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """
+        Stop the event monitoring system
+        
+        Args:
+            drain_timeout: Seconds to let already queued events finish before cancelling
+        """
+        if self.is_running:
+            self.compliance_cache.unwatch()
         self.is_running = False
         self.logger.info("Stopping event monitor...")
+        
+        # Stop fetching first so nothing new is queued
+        if self.subscription_feed:
+            self.subscription_feed.stop()
+        await self._cancel(self.subscription_task, self.poll_task)
+        self.subscription_task = self.poll_task = None
+        
+        if self.router_task:
+            try:
+                await asyncio.wait_for(self._drain(), drain_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    f"{self.event_queue.qsize() + self.workers.pending} events still queued after "
+                    f"{drain_timeout}s; cancelling"
+                )
+        
+        await self._cancel(self.router_task)
+        self.router_task = None
+        await self.workers.stop()
+    
+    @staticmethod
+    async def _cancel(*tasks: Optional[asyncio.Task]) -> None:
+        """Cancel tasks and wait until they have finished"""
+        tasks = [task for task in tasks if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _drain(self) -> None:
+        """Wait until every queued event has been handled"""
+        await self.event_queue.join()
+        await self.workers.drain()
+    
+    async def _block_number(self) -> int:
+        """Current head, fetched off the event loop"""
+        return await asyncio.to_thread(lambda: self.w3.eth.block_number)
+    
+    async def _resume_from_checkpoints(self) -> None:
+        """Start from the head, rewound to the saved cursors of newly added contracts"""
+        if self.last_block is None:
+            self.last_block = await self._block_number()
+        
+        with self.lock:
+            contracts, self.unresumed_contracts = self.unresumed_contracts, set()
+        
+        for contract in contracts:
+            cursor = await asyncio.to_thread(self.checkpoint_store.load_cursor, contract)
+            if cursor is not None and cursor < self.last_block:
+                self.logger.info(f"Resuming {contract[:10]}... after checkpointed block {cursor}")
+                self.last_block = cursor
+    
+    @property
+    def push_mode(self) -> bool:
+        """True while the WebSocket feed is connected"""
+        return bool(self.subscription_feed and self.subscription_feed.connected)
+    
+    def _subscription_filter(self) -> Dict[str, Any]:
+        """eth_subscribe logs filter covering every active event filter"""
+        with self.lock:
+            filters = list(self.event_filters.values())
+        
+        if not filters:
+            return {}
+        return {
+            'address': sorted({info['contract'] for info in filters}),
+            'topics': [sorted({normalize_hash(info['params']['topics'][0]) for info in filters})]
+        }
+    
+    def _on_pushed_log(self, log: LogReceipt) -> None:
+        """Queue a pushed log straight away; the next sweep confirms it"""
+        if not log.get('topics'):
+            return
+        
+        address = self.w3.to_checksum_address(log['address'])
+        topic = normalize_hash(log['topics'][0])
+        with self.lock:
+            filter_info = next((
+                info for info in self.event_filters.values()
+                if info['contract'] == address and normalize_hash(info['params']['topics'][0]) == topic
+            ), None)
+        if filter_info is None:
+            return
+        
+        event = self._parse_log(log, filter_info)
+        if event is None:
+            return
+        
+        # The sweep delivers the same logs, so a full queue only loses the head start
+        try:
+            if log.get('removed'):
+                # The node dropped this log from its canonical chain
+                self.event_queue.put_nowait(ReorgRetraction(event.block_number, [event]))
+            else:
+                self.event_queue.put_nowait(event)
+                self.stats['events_pushed'] += 1
+                self.stats['last_event_time'] = time.time()
+        except asyncio.QueueFull:
+            self.logger.debug(f"Event queue full; leaving pushed log {event.transaction_hash} to the sweep")
+    
+    async def _wait_for_next_round(self, caught_up: bool) -> None:
+        """Sleep between sweeps: none while behind, until the next head in push mode"""
+        if not caught_up:
+            await asyncio.sleep(0)
+        elif self.push_mode:
+            await self.subscription_feed.wait_for_head(self.PUSH_HEARTBEAT)
+        else:
+            await asyncio.sleep(self.poll_interval)
     
     async def _poll_events(self) -> None:
         """Poll for new events"""
         while self.is_running:
+            caught_up = True
             try:
-                current_block = self.w3.eth.block_number
+                # Pushed heads save the eth_blockNumber round trip
+                if self.push_mode and self.subscription_feed.head is not None:
+                    current_block = self.subscription_feed.head
+                else:
+                    current_block = await self._block_number()
+                
+                # Contracts added while running resume from their own cursors
+                if self.unresumed_contracts:
+                    await self._resume_from_checkpoints()
+                
+                # Events are emitted at the head; retract them if their block is orphaned
+                fork_block = await self._detect_reorg()
+                if fork_block is not None:
+                    await self._rollback(fork_block)
+                
+                # Cap each round so a long outage is backfilled in bounded windows
+                from_block = self.last_block + 1
+                to_block = min(current_block, self.last_block + self.range_splitter.max_window)
+                caught_up = to_block >= current_block
                 
                 with self.lock:
-                    for filter_id, filter_info in self.event_filters.items():
-                        try:
-                            # Get logs for filter
-                            params = filter_info['params']
-                            params['fromBlock'] = self.last_block + 1
-                            params['toBlock'] = current_block
-                            
-                            logs = self.w3.eth.get_logs(params)
-                            
-                            for log in logs:
-                                event = self._parse_log(log, filter_info)
-                                if event:
-                                    self.event_queue.put(event)
-                                    self.stats['events_received'] += 1
-                                    self.stats['last_event_time'] = time.time()
-                                    
-                        except Exception as e:
-                            self.logger.error(f"Error polling filter {filter_id}: {e}")
+                    filters = list(self.event_filters.items())
+                    contracts = list(self.monitored_contracts)
                 
-                self.last_block = current_block
+                events: List[MonitoredEvent] = []
+                complete = True
+                for filter_id, filter_info in filters:
+                    try:
+                        logs = await self._get_logs_adaptive(
+                            filter_info['params'], from_block, to_block
+                        )
+                        events.extend(self._parse_logs(logs, filter_info))
+                    except Exception as e:
+                        complete = False
+                        self.logger.error(f"Error polling filter {filter_id}: {e}")
+                
+                if complete and to_block >= from_block:
+                    complete = await self._confirm_blocks(events, from_block, to_block)
+                
+                # Retry the window next round rather than skip a filter's logs
+                if complete:
+                    events.sort(key=lambda event: (event.block_number, event.log_index))
+                    for event in events:
+                        await self.event_queue.put(event)
+                        self.reorg_buffer.track(event.block_number, event)
+                        self.stats['events_received'] += 1
+                        self.stats['last_event_time'] = time.time()
+                    
+                    if to_block >= from_block:
+                        self.last_block = max(self.last_block, to_block)
+                        await self.event_queue.put(CheckpointMarker({
+                            contract: self.last_block for contract in contracts
+                        }))
+                else:
+                    caught_up = True
                 
             except Exception as e:
                 self.logger.error(f"Polling error: {e}")
+            
+            # Keep going without sleeping while catching up
+            await self._wait_for_next_round(caught_up)
+    
+    def _fetch_block_refs(self, block_numbers: List[int]) -> List[BlockRef]:
+        """Block headers for the given heights"""
+        return [
+            BlockRef.from_block(self.w3.eth.get_block(number))
+            for number in block_numbers
+        ]
+    
+    async def _detect_reorg(self) -> Optional[int]:
+        """First orphaned block number among the buffered blocks, if any"""
+        if self.reorg_buffer.tip is None:
+            return None
+        
+        return await asyncio.to_thread(
+            self.reorg_buffer.find_fork,
+            lambda number: self.w3.eth.get_block(number)['hash']
+        )
+    
+    async def _rollback(self, fork_block: int) -> None:
+        """Rewind below a fork and queue retractions for its emitted events"""
+        events = self.reorg_buffer.rollback(fork_block)
+        self.last_block = min(self.last_block, fork_block - 1)
+        
+        with self.lock:
+            contracts = list(self.monitored_contracts)
+        
+        await self.event_queue.put(ReorgRetraction(fork_block, events))
+        await self.event_queue.put(CheckpointMarker({
+            contract: self.last_block for contract in contracts
+        }))
+    
+    async def _confirm_blocks(
+        self,
+        events: List[MonitoredEvent],
+        from_block: int,
+        to_block: int
+    ) -> bool:
+        """Record hashes of blocks inside the reorg window; False if the logs are from another fork"""
+        window = self.reorg_buffer.window(from_block, to_block)
+        try:
+            refs = await asyncio.to_thread(self._fetch_block_refs, list(window))
+        except Exception as e:
+            self.logger.error(f"Error fetching block headers {window.start}-{window.stop - 1}: {e}")
+            return False
+        
+        canonical = {ref.number: ref.hash for ref in refs}
+        for event in events:
+            if event.block_hash and canonical.get(event.block_number, event.block_hash) != event.block_hash:
+                self.logger.warning(f"Logs for block {event.block_number} are from an orphaned fork; retrying")
+                return False
+        
+        # A mismatch with the buffered tip is found and rolled back next round
+        return self.reorg_buffer.record_blocks(refs)
+    
+    async def _get_logs_adaptive(
+        self,
+        params: FilterParams,
+        from_block: int,
+        to_block: int
+    ) -> List[LogReceipt]:
+        """Fetch logs over a block range, splitting it as the provider requires"""
+        async def _get_logs(start: int, end: int) -> List[LogReceipt]:
+            return await asyncio.to_thread(
+                self.w3.eth.get_logs,
+                FilterParams(**{**params, 'fromBlock': start, 'toBlock': end})
+            )
+        
+        return await self.range_splitter.fetch_async(from_block, to_block, _get_logs)
+    
+    def _parse_logs(self, logs: List[LogReceipt], filter_info: Dict) -> List[MonitoredEvent]:
+        """Decode a batch of logs for one filter into MonitoredEvents"""
+        event_type = filter_info['event_type'].value
+        contract = filter_info['contract']
+        events = []
+        
+        for log, decoded in zip(logs, self.decoders.decode_batch(logs)):
+            try:
+                if decoded is not None:
+                    args = decoded.args
+                else:
+                    # No decoder for this layout; hand over the raw log
+                    args = {
+                        'topics': [normalize_hash(topic) for topic in log.get('topics', [])],
+                        'data': log.get('data', '0x')
+                    }
                 
-            await asyncio.sleep(self.poll_interval)
+                events.append(MonitoredEvent(
+                    event_type=event_type,
+                    contract_address=contract,
+                    transaction_hash=normalize_hash(log['transactionHash']),
+                    block_number=log['blockNumber'],
+                    timestamp=int(time.time()),  # Would get actual block timestamp
+                    args=args,
+                    log_index=log['logIndex'],
+                    block_hash=normalize_hash(log.get('blockHash'))
+                ))
+            except Exception as e:
+                self.logger.error(f"Failed to parse log: {e}")
+        
+        return events
     
     def _parse_log(self, log: LogReceipt, filter_info: Dict) -> Optional[MonitoredEvent]:
         """Parse a log into a MonitoredEvent"""
-        try:
-            # Extract event arguments (simplified - actual implementation would decode based on ABI)
-            args = {
-                'topics': [topic.hex() if hasattr(topic, 'hex') else str(topic) 
-                          for topic in log.get('topics', [])],
-                'data': log.get('data', '0x')
-            }
-            
-            # For Transfer events, parse the standard arguments
-            event_type = filter_info['event_type']
-            if event_type == EventType.TRANSFER and len(log['topics']) >= 3:
-                args = {
-                    'from': '0x' + log['topics'][1].hex()[-40:],
-                    'to': '0x' + log['topics'][2].hex()[-40:],
-                    'value': int(log['data'], 16) if log['data'] != '0x' else 0
-                }
-            
-            return MonitoredEvent(
-                event_type=event_type.value,
-                contract_address=filter_info['contract'],
-                transaction_hash=log['transactionHash'].hex(),
-                block_number=log['blockNumber'],
-                timestamp=int(time.time()),  # Would get actual block timestamp
-                args=args,
-                log_index=log['logIndex']
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Failed to parse log: {e}")
-            return None
+        events = self._parse_logs([log], filter_info)
+        return events[0] if events else None
+    
+    def _shard_key(self, event: MonitoredEvent) -> str:
+        """Shard for an event: its contract, or its first holder address"""
+        if self.shard_by == 'holder':
+            holder = holder_key(event.args)
+            if holder:
+                return holder
+        return event.contract_address
     
     async def _process_events(self) -> None:
-        """Process events from the queue"""
-        while self.is_running:
+        """Route queued events to the processing shards until cancelled"""
+        while True:
+            event = await self.event_queue.get()
             try:
-                # Get event from queue (non-blocking)
-                try:
-                    event = self.event_queue.get(timeout=1)
-                except queue.Empty:
-                    await asyncio.sleep(0.1)
-                    continue
+                # Saved once every shard has handled the events queued before it
+                if isinstance(event, CheckpointMarker):
+                    await self.workers.broadcast(
+                        partial(asyncio.to_thread, self.checkpoint_store.save_cursors, event.cursors)
+                    )
                 
-                # Find processor for event type
-                processor = self.event_processors.get(event.event_type)
+                # Orphaned events may still be queued on a shard; finish them first
+                elif isinstance(event, ReorgRetraction):
+                    await self.workers.drain()
+                    await self._retract_events(event)
                 
-                if processor:
-                    success = await processor.process(event)
-                    if success:
-                        event.processed = True
-                        self.stats['events_processed'] += 1
-                    else:
-                        self.stats['events_failed'] += 1
+                # Full shards hold the router back, and with it the fetch queue
                 else:
-                    # No processor, just log
-                    self.logger.info(
-                        f"Event {event.event_type} from {event.contract_address[:10]}... "
-                        f"(Block: {event.block_number})"
-                    )
-                    self.stats['events_processed'] += 1
+                    await self.workers.submit(self._shard_key(event), event, event.block_number)
                     
             except Exception as e:
                 self.logger.error(f"Event processing error: {e}")
                 self.stats['events_failed'] += 1
+            finally:
+                self.event_queue.task_done()
+    
+    async def _handle_event(self, event: MonitoredEvent) -> None:
+        """Run an event through its processor on its shard"""
+        try:
+            # Skip events a previous run already handled
+            if await asyncio.to_thread(
+                self.checkpoint_store.is_processed, event.transaction_hash, event.log_index
+            ):
+                return
+            
+            # Drop cached compliance the event makes stale
+            self.compliance_cache.invalidate_event(event.contract_address, event.event_type, event.args)
+            
+            # Find processor for event type
+            processor = self.event_processors.get(event.event_type)
+            
+            if processor:
+                success = await processor.process(event)
+                if success:
+                    event.processed = True
+                    self.stats['events_processed'] += 1
+                else:
+                    self.stats['events_failed'] += 1
+            else:
+                # No processor, just log
+                self.logger.info(
+                    f"Event {event.event_type} from {event.contract_address[:10]}... "
+                    f"(Block: {event.block_number})"
+                )
+                event.processed = True
+                self.stats['events_processed'] += 1
+            
+            if event.processed:
+                await asyncio.to_thread(
+                    self.checkpoint_store.mark_processed,
+                    event.transaction_hash, event.log_index, event.block_number
+                )
+        
+        except Exception as e:
+            self.logger.error(f"Event processing error: {e}")
+            self.stats['events_failed'] += 1
+    
+    async def _retract_events(self, retraction: ReorgRetraction) -> None:
+        """Hand orphaned events back to their processors and allow their replay"""
+        def _forget() -> List[bool]:
+            handled = [
+                event.processed
+                or self.checkpoint_store.is_processed(event.transaction_hash, event.log_index)
+                for event in retraction.events
+            ]
+            self.checkpoint_store.forget_processed(retraction.fork_block)
+            return handled
+        
+        handled = await asyncio.to_thread(_forget)
+        
+        for event, was_processed in zip(retraction.events, handled):
+            self.compliance_cache.invalidate_event(event.contract_address, event.event_type, event.args)
+            processor = self.event_processors.get(event.event_type)
+            try:
+                if processor and was_processed:
+                    await processor.retract(event)
+            except Exception as e:
+                self.logger.error(f"Event retraction error: {e}")
+            event.processed = False
+            self.stats['events_retracted'] += 1
     
     def get_stats(self) -> Dict[str, Any]:
         """Get monitoring statistics"""
@@ -390,10 +778,16 @@ class EventMonitor:
             'events_received': self.stats['events_received'],
             'events_processed': self.stats['events_processed'],
             'events_failed': self.stats['events_failed'],
-            'queue_size': self.event_queue.qsize(),
+            'events_retracted': self.stats['events_retracted'],
+            'events_pushed': self.stats['events_pushed'],
+            'push_mode': self.subscription_feed.get_stats() if self.subscription_feed else None,
+            'queue_size': self.event_queue.qsize() + self.workers.pending,
             'runtime_seconds': runtime,
             'last_block': self.last_block,
-            'last_event_time': self.stats['last_event_time']
+            'last_event_time': self.stats['last_event_time'],
+            'log_ranges': self.range_splitter.get_stats(),
+            'reorgs': self.reorg_buffer.get_stats(),
+            'shards': self.workers.get_stats()
         }
     
     async def get_historical_events(
@@ -416,39 +810,77 @@ class EventMonitor:
             List of historical events
         """
         checksum_address = self.w3.to_checksum_address(contract_address)
-        event_sig = self.EVENT_SIGNATURES.get(event_type)
+        event_hash = self.EVENT_TOPICS.get(event_type)
         
-        if not event_sig:
+        if not event_hash:
             return []
-            
-        event_hash = self.w3.keccak(text=event_sig).hex()
         
-        # Get logs
+        # Indexed blocks are read from the database, only the rest from the chain
+        events: List[MonitoredEvent] = []
+        if self.indexer is not None and event_type.value in INDEXED_EVENTS:
+            indexed = await asyncio.to_thread(
+                self.indexer.indexed_prefix, checksum_address, from_block, to_block
+            )
+            if indexed is not None:
+                events = await asyncio.to_thread(
+                    self._indexed_events, checksum_address, event_type, from_block, indexed
+                )
+                if to_block is not None and to_block <= indexed:
+                    return events
+                from_block = indexed + 1
+        
+        # Get logs, split into ranges the provider accepts
         params = FilterParams(
             address=checksum_address,
-            fromBlock=from_block,
-            toBlock=to_block or 'latest',
             topics=[event_hash]
         )
         
-        logs = self.w3.eth.get_logs(params)
+        if to_block is None:
+            to_block = await self._block_number()
+        if to_block < from_block:
+            return events
+        logs = await self._get_logs_adaptive(params, from_block, to_block)
         
-        # Parse logs into events
-        events = []
-        for log in logs:
-            event = self._parse_log(log, {
-                'event_type': event_type,
-                'contract': checksum_address
-            })
-            if event:
-                events.append(event)
-                
-        return events
+        # Decode logs into events in one pass
+        return events + self._parse_logs(logs, {
+            'event_type': event_type,
+            'contract': checksum_address
+        })
+    
+    def _indexed_events(
+        self,
+        contract_address: str,
+        event_type: EventType,
+        from_block: int,
+        to_block: Optional[int]
+    ) -> List[MonitoredEvent]:
+        """get_historical_events from the token event index, oldest first"""
+        rows = self.indexer.get_history(
+            contract_address,
+            from_block=from_block,
+            to_block=to_block,
+            event_types=[event_type.value]
+        )
+        return [
+            MonitoredEvent(
+                event_type=event_type.value,
+                contract_address=contract_address,
+                transaction_hash=row.transaction_hash,
+                block_number=row.block_number,
+                timestamp=int(row.block_timestamp.replace(tzinfo=timezone.utc).timestamp())
+                if row.block_timestamp else int(time.time()),
+                args=self.indexer.row_args(row),
+                log_index=row.log_index,
+                block_hash=row.block_hash
+            )
+            for row in reversed(rows)
+        ]
 
 
 def create_event_monitor(
     web3: Web3,
-    contracts: Optional[List[Dict[str, Any]]] = None
+    contracts: Optional[List[Dict[str, Any]]] = None,
+    ws_url: Optional[str] = None
 ) -> EventMonitor:
     """
     Factory function to create configured event monitor
@@ -456,11 +888,12 @@ def create_event_monitor(
     Args:
         web3: Web3 instance
         contracts: List of contracts to monitor
+        ws_url: WebSocket endpoint for push mode (defaults to POLYGON_WS_URL)
         
     Returns:
         Configured EventMonitor instance
     """
-    monitor = EventMonitor(web3)
+    monitor = EventMonitor(web3, ws_url=ws_url or os.getenv('POLYGON_WS_URL'))
     
     # Add default processors
     monitor.add_processor(EventType.TRANSFER, TransferEventProcessor())
@@ -0,0 +1,253 @@
+"""
+Adaptive Block Range Splitting for Veria Platform
+Sizes eth_getLogs ranges to what the RPC provider will accept, shared by the
+threaded and asyncio event monitors for live polling and backfill
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import Lock
+
+from requests.exceptions import HTTPError, Timeout
+
+
+# Provider error fragments meaning "ask for fewer blocks"
+RANGE_ERROR_MARKERS = (
+    'too many results',
+    'query returned more than',
+    'more than 10000 results',
+    'block range',
+    'range too large',
+    'range is too large',
+    'is limited to a',
+    'response size',
+    'exceed maximum',
+    'timeout',
+    'timed out'
+)
+
+# Provider error fragments meaning "slow down"; checked before the range markers
+RATE_LIMIT_MARKERS = (
+    'rate limit',
+    'too many requests',
+    'request limit',
+    'requests limit',
+    'daily limit',
+    'quota',
+    'compute units',
+    'capacity exceeded'
+)
+
+BlockRange = Tuple[int, int]
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True when the provider throttled the request rather than rejecting its range"""
+    response = getattr(error, 'response', None)
+    if isinstance(error, HTTPError) and getattr(response, 'status_code', None) == 429:
+        return True
+    if getattr(error, 'status', None) == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def is_range_error(error: BaseException) -> bool:
+    """True when a failed eth_getLogs should be retried over a smaller range"""
+    if isinstance(error, (Timeout, asyncio.TimeoutError, FutureTimeoutError, TimeoutError)):
+        return True
+    if is_rate_limited(error):
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in RANGE_ERROR_MARKERS)
+
+
+class BlockRangeSplitter:
+    """
+    Adaptive eth_getLogs range sizing.
+    Starts with a large span, halves the failing sub-range when the provider
+    rejects it as too large or times out, grows the span again after a run of
+    successes, and fetches independent sub-ranges concurrently. Rate-limited
+    requests are retried after an exponential backoff without splitting.
+    """
+    
+    def __init__(
+        self,
+        initial_span: int = 2000,
+        min_span: int = 1,
+        max_span: int = 10000,
+        max_concurrency: int = 4,
+        grow_after: int = 3,
+        rate_limit_backoff: float = 1.0,
+        max_rate_limit_retries: int = 5
+    ):
+        self.min_span = max(1, min_span)
+        self.max_span = max(self.min_span, max_span)
+        self.span = min(max(initial_span, self.min_span), self.max_span)
+        self.max_concurrency = max(1, max_concurrency)
+        self.grow_after = grow_after
+        self.rate_limit_backoff = rate_limit_backoff
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.lock = Lock()
+        self.logger = logging.getLogger(f"{__name__}.BlockRangeSplitter")
+        self._successes = 0
+        self._throttled = 0
+        self.stats = {'requests': 0, 'splits': 0, 'blocks_fetched': 0, 'rate_limited': 0}
+    
+    @property
+    def max_window(self) -> int:
+        """Blocks covered by one wave of concurrent requests at the current span"""
+        return self.span * self.max_concurrency
+    
+    def ranges(self, from_block: int, to_block: int) -> List[BlockRange]:
+        """Split an inclusive block range into sub-ranges of the current span"""
+        span = self.span
+        return [
+            (start, min(start + span - 1, to_block))
+            for start in range(from_block, to_block + 1, span)
+        ]
+    
+    def record_success(self, block_range: BlockRange):
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['blocks_fetched'] += block_range[1] - block_range[0] + 1
+            self._successes += 1
+            self._throttled = 0
+            if self._successes >= self.grow_after and self.span < self.max_span:
+                self.span = min(self.max_span, self.span * 2)
+                self._successes = 0
+    
+    def record_failure(self, block_range: BlockRange) -> List[BlockRange]:
+        """Shrink the span and return the halves of the rejected range"""
+        start, end = block_range
+        size = end - start + 1
+        with self.lock:
+            self.stats['requests'] += 1
+            self._successes = 0
+            if size <= self.min_span:
+                return []
+            self.stats['splits'] += 1
+            self.span = max(self.min_span, min(self.span, size) // 2)
+        
+        middle = start + size // 2 - 1
+        self.logger.debug(f"Splitting blocks {start}-{end}; span now {self.span}")
+        return [(start, middle), (middle + 1, end)]
+    
+    def _next_wave(self, pending: deque) -> List[BlockRange]:
+        wave = []
+        while pending and len(wave) < self.max_concurrency:
+            start, end = pending.popleft()
+            # Re-chunk ranges queued before the span shrank
+            pieces = self.ranges(start, end)
+            wave.append(pieces[0])
+            if len(pieces) > 1:
+                pending.appendleft((pieces[1][0], end))
+        return wave
+    
+    def record_rate_limit(self) -> Optional[float]:
+        """Seconds to back off after a throttled request; None past the retry limit"""
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['rate_limited'] += 1
+            self._throttled += 1
+            if self._throttled > self.max_rate_limit_retries:
+                self._throttled = 0
+                return None
+            return min(30.0, self.rate_limit_backoff * 2 ** (self._throttled - 1))
+    
+    def _handle_error(self, block_range: BlockRange, error: BaseException, pending: deque) -> float:
+        """Requeue a failed range; returns seconds to wait before the next wave"""
+        if is_rate_limited(error):
+            delay = self.record_rate_limit()
+            if delay is None:
+                raise error
+            self.logger.warning(f"Rate limited on blocks {block_range[0]}-{block_range[1]}; retrying in {delay:.1f}s")
+            pending.appendleft(block_range)
+            return delay
+        if not is_range_error(error):
+            raise error
+        halves = self.record_failure(block_range)
+        if not halves:
+            raise error
+        for half in reversed(halves):
+            pending.appendleft(half)
+        return 0.0
+    
+    @staticmethod
+    def _ordered(results: Dict[BlockRange, List[Any]]) -> List[Any]:
+        return [log for block_range in sorted(results) for log in results[block_range]]
+    
+    def fetch(
+        self,
+        from_block: int,
+        to_block: int,
+        fetch_logs: Callable[[int, int], List[Any]]
+    ) -> List[Any]:
+        """
+        Fetch logs for an inclusive block range, in block order
+        fetch_logs(start, end) performs one eth_getLogs; errors that are not
+        range errors (or persist at min_span) propagate to the caller.
+        """
+        if to_block < from_block:
+            return []
+        
+        pending = deque([(from_block, to_block)])
+        results: Dict[BlockRange, List[Any]] = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while pending:
+                wave = self._next_wave(pending)
+                futures = [(r, executor.submit(fetch_logs, r[0], r[1])) for r in wave]
+                backoff = 0.0
+                for block_range, future in futures:
+                    try:
+                        results[block_range] = list(future.result())
+                    except Exception as e:
+                        backoff = max(backoff, self._handle_error(block_range, e, pending))
+                    else:
+                        self.record_success(block_range)
+                if backoff:
+                    time.sleep(backoff)
+        
+        return self._ordered(results)
+    
+    async def fetch_async(
+        self,
+        from_block: int,
+        to_block: int,
+        fetch_logs: Callable[[int, int], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """Asyncio counterpart of fetch; fetch_logs is a coroutine function"""
+        if to_block < from_block:
+            return []
+        
+        pending = deque([(from_block, to_block)])
+        results: Dict[BlockRange, List[Any]] = {}
+        
+        while pending:
+            wave = self._next_wave(pending)
+            outcomes = await asyncio.gather(
+                *(fetch_logs(start, end) for start, end in wave),
+                return_exceptions=True
+            )
+            backoff = 0.0
+            for block_range, outcome in zip(wave, outcomes):
+                if isinstance(outcome, BaseException):
+                    if isinstance(outcome, asyncio.CancelledError):
+                        raise outcome
+                    backoff = max(backoff, self._handle_error(block_range, outcome, pending))
+                else:
+                    results[block_range] = list(outcome)
+                    self.record_success(block_range)
+            if backoff:
+                await asyncio.sleep(backoff)
+        
+        return self._ordered(results)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {'span': self.span, **self.stats}
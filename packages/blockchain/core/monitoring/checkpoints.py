@@ -0,0 +1,293 @@
+"""
+Durable Event Monitor Checkpoints for Veria Platform
+Per-contract block cursors and processed event keys so monitors resume where
+they stopped and handle each (transaction hash, log index) exactly once.
+Each consumer writes under its own namespace, so monitors (and the token
+indexer's 'index:' streams) can share a database without touching each
+other's cursors or pruning each other's keys.
+"""
+
+import os
+import sqlite3
+import logging
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, Optional
+
+
+@dataclass
+class CheckpointMarker:
+    """
+    Queued after the events of a fetched range; when the processor reaches it
+    every event before it has been handled and the cursors can be saved
+    """
+    cursors: Dict[str, int] = field(default_factory=dict)
+
+
+# Streams are stored as '<namespace>:<contract>' in a 100 character column
+MAX_NAMESPACE_LENGTH = 50
+
+
+class CheckpointStore:
+    """Base class for durable monitor cursors and processed event keys"""
+    
+    def __init__(self, namespace: str):
+        """
+        Args:
+            namespace: Consumer name prefixed to every cursor and processed key
+        """
+        if not namespace or ':' in namespace or len(namespace) > MAX_NAMESPACE_LENGTH:
+            raise ValueError(f"Invalid checkpoint namespace: {namespace!r}")
+        self.namespace = namespace
+        self.prefix = f"{namespace}:"
+    
+    def _stream_key(self, stream: str) -> str:
+        return self.prefix + stream
+    
+    def load_cursors(self) -> Dict[str, int]:
+        """This namespace's saved cursors keyed by stream (contract address)"""
+        raise NotImplementedError("Subclasses must implement load_cursors()")
+    
+    def load_cursor(self, stream: str) -> Optional[int]:
+        """Last fully processed block for a stream, or None if never saved"""
+        return self.load_cursors().get(stream)
+    
+    def save_cursors(self, cursors: Dict[str, int]) -> None:
+        """Atomically save cursors and drop this namespace's processed keys no replay can reach"""
+        raise NotImplementedError("Subclasses must implement save_cursors()")
+    
+    def is_processed(self, transaction_hash: str, log_index: int) -> bool:
+        raise NotImplementedError("Subclasses must implement is_processed()")
+    
+    def mark_processed(self, transaction_hash: str, log_index: int, block_number: int) -> bool:
+        """Record an event as handled; returns False if it already was"""
+        raise NotImplementedError("Subclasses must implement mark_processed()")
+    
+    def forget_processed(self, from_block: int) -> None:
+        """Drop processed keys from orphaned blocks so their events can be handled again"""
+        raise NotImplementedError("Subclasses must implement forget_processed()")
+    
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Checkpoint store in a local SQLite file (default backend)"""
+    
+    def __init__(self, path: str, namespace: str = 'events'):
+        """
+        Args:
+            path: SQLite file (or ':memory:')
+            namespace: Consumer name prefixed to every cursor and processed key
+        """
+        super().__init__(namespace)
+        self.path = path
+        self.lock = Lock()
+        self.logger = logging.getLogger(f"{__name__}.SQLiteCheckpointStore")
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS monitor_checkpoints ('
+            ' stream TEXT PRIMARY KEY, block_number INTEGER NOT NULL,'
+            " updated_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS processed_events ('
+            ' namespace TEXT NOT NULL, transaction_hash TEXT NOT NULL,'
+            ' log_index INTEGER NOT NULL, block_number INTEGER NOT NULL,'
+            ' PRIMARY KEY (namespace, transaction_hash, log_index))'
+        )
+        self.db.execute(
+            'CREATE INDEX IF NOT EXISTS idx_processed_events_block'
+            ' ON processed_events (namespace, block_number)'
+        )
+    
+    def load_cursors(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.db.execute(
+                'SELECT stream, block_number FROM monitor_checkpoints WHERE substr(stream, 1, ?) = ?',
+                (len(self.prefix), self.prefix)
+            ).fetchall()
+        return {stream[len(self.prefix):]: block_number for stream, block_number in rows}
+    
+    def load_cursor(self, stream: str) -> Optional[int]:
+        with self.lock:
+            row = self.db.execute(
+                'SELECT block_number FROM monitor_checkpoints WHERE stream = ?',
+                (self._stream_key(stream),)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def save_cursors(self, cursors: Dict[str, int]) -> None:
+        if not cursors:
+            return
+        with self.lock:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                self.db.executemany(
+                    'INSERT INTO monitor_checkpoints (stream, block_number) VALUES (?, ?)'
+                    ' ON CONFLICT(stream) DO UPDATE SET'
+                    ' block_number = excluded.block_number, updated_at = CURRENT_TIMESTAMP',
+                    [(self._stream_key(stream), block_number) for stream, block_number in cursors.items()]
+                )
+                # Replays never start below this namespace's lowest cursor
+                self.db.execute(
+                    'DELETE FROM processed_events WHERE namespace = ? AND block_number <='
+                    ' (SELECT MIN(block_number) FROM monitor_checkpoints WHERE substr(stream, 1, ?) = ?)',
+                    (self.namespace, len(self.prefix), self.prefix)
+                )
+                self.db.execute('COMMIT')
+            except Exception:
+                self.db.execute('ROLLBACK')
+                raise
+    
+    def is_processed(self, transaction_hash: str, log_index: int) -> bool:
+        with self.lock:
+            row = self.db.execute(
+                'SELECT 1 FROM processed_events'
+                ' WHERE namespace = ? AND transaction_hash = ? AND log_index = ?',
+                (self.namespace, transaction_hash, log_index)
+            ).fetchone()
+        return row is not None
+    
+    def mark_processed(self, transaction_hash: str, log_index: int, block_number: int) -> bool:
+        with self.lock:
+            cursor = self.db.execute(
+                'INSERT OR IGNORE INTO processed_events'
+                ' (namespace, transaction_hash, log_index, block_number) VALUES (?, ?, ?, ?)',
+                (self.namespace, transaction_hash, log_index, block_number)
+            )
+        return cursor.rowcount == 1
+    
+    def forget_processed(self, from_block: int) -> None:
+        with self.lock:
+            self.db.execute(
+                'DELETE FROM processed_events WHERE namespace = ? AND block_number >= ?',
+                (self.namespace, from_block)
+            )
+    
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+
+class SQLAlchemyCheckpointStore(CheckpointStore):
+    """Checkpoint store in the platform PostgreSQL database (packages/database)"""
+    
+    def __init__(self, database_url: Optional[str] = None, session_factory=None, namespace: str = 'events'):
+        super().__init__(namespace)
+        # Imported lazily so the monitors do not require SQLAlchemy
+        from sqlalchemy import create_engine, delete, select, func
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.dialects.postgresql import insert
+        from packages.database.models import MonitorCheckpoint, ProcessedEvent
+        
+        self._delete, self._select, self._func, self._insert = delete, select, func, insert
+        self.MonitorCheckpoint = MonitorCheckpoint
+        self.ProcessedEvent = ProcessedEvent
+        
+        if session_factory is None:
+            engine = create_engine(
+                database_url or os.getenv('DATABASE_URL'),
+                pool_pre_ping=True
+            )
+            session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.session_factory = session_factory
+    
+    def load_cursors(self) -> Dict[str, int]:
+        with self.session_factory() as session:
+            rows = session.execute(
+                self._select(self.MonitorCheckpoint.stream, self.MonitorCheckpoint.block_number)
+                .where(self._in_namespace())
+            ).all()
+        return {stream[len(self.prefix):]: block_number for stream, block_number in rows}
+    
+    def _in_namespace(self):
+        return self.MonitorCheckpoint.stream.startswith(self.prefix, autoescape=True)
+    
+    def save_cursors(self, cursors: Dict[str, int]) -> None:
+        if not cursors:
+            return
+        statement = self._insert(self.MonitorCheckpoint).values([
+            {'stream': self._stream_key(stream), 'block_number': block_number}
+            for stream, block_number in cursors.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.MonitorCheckpoint.stream],
+            set_={'block_number': statement.excluded.block_number, 'updated_at': self._func.now()}
+        )
+        
+        with self.session_factory() as session, session.begin():
+            session.execute(statement)
+            lowest = self._select(
+                self._func.min(self.MonitorCheckpoint.block_number)
+            ).where(self._in_namespace()).scalar_subquery()
+            session.execute(
+                self._delete(self.ProcessedEvent).where(
+                    self.ProcessedEvent.namespace == self.namespace,
+                    self.ProcessedEvent.block_number <= lowest
+                )
+            )
+    
+    def is_processed(self, transaction_hash: str, log_index: int) -> bool:
+        with self.session_factory() as session:
+            return session.get(
+                self.ProcessedEvent, (self.namespace, transaction_hash, log_index)
+            ) is not None
+    
+    def mark_processed(self, transaction_hash: str, log_index: int, block_number: int) -> bool:
+        statement = self._insert(self.ProcessedEvent).values(
+            namespace=self.namespace,
+            transaction_hash=transaction_hash,
+            log_index=log_index,
+            block_number=block_number
+        ).on_conflict_do_nothing()
+        
+        with self.session_factory() as session, session.begin():
+            result = session.execute(statement)
+        return result.rowcount == 1
+    
+    def forget_processed(self, from_block: int) -> None:
+        with self.session_factory() as session, session.begin():
+            session.execute(
+                self._delete(self.ProcessedEvent).where(
+                    self.ProcessedEvent.namespace == self.namespace,
+                    self.ProcessedEvent.block_number >= from_block
+                )
+            )
+
+
+def default_checkpoint_path() -> str:
+    """VERIA_CHECKPOINT_DB, else event_checkpoints.db in the user state directory"""
+    path = os.getenv('VERIA_CHECKPOINT_DB')
+    if path:
+        return path
+    state_home = os.getenv('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(state_home, 'veria', 'event_checkpoints.db')
+
+
+def create_checkpoint_store(url: Optional[str] = None, namespace: str = 'events') -> CheckpointStore:
+    """
+    Create a checkpoint store from a URL or path
+    
+    Args:
+        url: postgresql:// URL, sqlite:/// URL or file path (default_checkpoint_path() if None)
+        namespace: Consumer name keeping this store's cursors and processed keys apart
+    
+    Returns:
+        Configured CheckpointStore
+    """
+    url = url or default_checkpoint_path()
+    
+    if url.startswith(('postgresql://', 'postgresql+', 'postgres://')):
+        return SQLAlchemyCheckpointStore(database_url=url, namespace=namespace)
+    if url.startswith('sqlite:///'):
+        url = url[len('sqlite:///'):]
+    if url != ':memory:':
+        url = os.path.abspath(url)
+        os.makedirs(os.path.dirname(url), exist_ok=True)
+        logging.getLogger(f"{__name__}.create_checkpoint_store").info(
+            f"Checkpoints for '{namespace}' stored in {url}"
+        )
+    return SQLiteCheckpointStore(url, namespace=namespace)
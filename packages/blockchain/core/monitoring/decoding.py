@@ -0,0 +1,286 @@
+"""
+Event Log Decoding for Veria Platform
+Registry of event decoders compiled once from contract ABIs and keyed by
+topic0, decoding log batches into compact slotted records
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eth_abi import decode as abi_decode
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+
+
+# Events emitted by the ERC-3643 tokens the monitors watch, with their
+# conventional indexed parameters
+STANDARD_EVENTS_ABI = [
+    {
+        "name": "Transfer",
+        "type": "event",
+        "inputs": [
+            {"indexed": True, "name": "from", "type": "address"},
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": False, "name": "value", "type": "uint256"}
+        ]
+    },
+    {
+        "name": "Approval",
+        "type": "event",
+        "inputs": [
+            {"indexed": True, "name": "owner", "type": "address"},
+            {"indexed": True, "name": "spender", "type": "address"},
+            {"indexed": False, "name": "value", "type": "uint256"}
+        ]
+    },
+    {
+        "name": "Mint",
+        "type": "event",
+        "inputs": [
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": False, "name": "amount", "type": "uint256"}
+        ]
+    },
+    {
+        "name": "Burn",
+        "type": "event",
+        "inputs": [
+            {"indexed": True, "name": "from", "type": "address"},
+            {"indexed": False, "name": "amount", "type": "uint256"}
+        ]
+    },
+    {
+        "name": "Freeze",
+        "type": "event",
+        "inputs": [{"indexed": True, "name": "account", "type": "address"}]
+    },
+    {
+        "name": "Unfreeze",
+        "type": "event",
+        "inputs": [{"indexed": True, "name": "account", "type": "address"}]
+    },
+    {
+        "name": "TokensFrozen",
+        "type": "event",
+        "inputs": [
+            {"indexed": True, "name": "userAddress", "type": "address"},
+            {"indexed": False, "name": "amount", "type": "uint256"}
+        ]
+    },
+    {
+        "name": "TokensUnfrozen",
+        "type": "event",
+        "inputs": [
+            {"indexed": True, "name": "userAddress", "type": "address"},
+            {"indexed": False, "name": "amount", "type": "uint256"}
+        ]
+    },
+    {
+        "name": "IdentityVerified",
+        "type": "event",
+        "inputs": [{"indexed": True, "name": "investor", "type": "address"}]
+    },
+    {"name": "Paused", "type": "event", "inputs": []},
+    {"name": "Unpaused", "type": "event", "inputs": []}
+]
+
+WordDecoder = Callable[[bytes], Any]
+
+
+@lru_cache(maxsize=65536)
+def _checksum(raw: bytes) -> str:
+    return to_checksum_address(raw)
+
+
+def _to_bytes(value: Any) -> bytes:
+    """bytes for HexBytes / bytes / 0x-hex str log fields"""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    return bytes(value)
+
+
+def _word_decoder(abi_type: str) -> Optional[WordDecoder]:
+    """Decoder for a type encoded in a single 32-byte word, or None if it is not"""
+    if abi_type == 'address':
+        return lambda word: _checksum(word[12:])
+    if abi_type == 'bool':
+        return lambda word: word != bytes(32)
+    if abi_type.startswith('uint') and '[' not in abi_type:
+        return lambda word: int.from_bytes(word, 'big')
+    if abi_type.startswith('int') and '[' not in abi_type:
+        return lambda word: int.from_bytes(word, 'big', signed=True)
+    if abi_type.startswith('bytes') and abi_type[5:].isdigit():
+        size = int(abi_type[5:])
+        return lambda word: word[:size]
+    return None
+
+
+def _raw_word(word: bytes) -> bytes:
+    # Indexed dynamic values are only available as their keccak hash
+    return word
+
+
+class EventDecoder:
+    """Decoder for one event, compiled from its ABI entry"""
+    __slots__ = (
+        'name', 'topic', 'topic_count', 'arg_names',
+        '_indexed', '_data_words', '_data_size', '_data_types', '_data_positions'
+    )
+    
+    def __init__(self, abi_entry: Dict[str, Any]):
+        inputs = abi_entry.get('inputs', [])
+        self.name: str = abi_entry['name']
+        self.topic: bytes = event_abi_to_log_topic(abi_entry)
+        self.arg_names: Tuple[str, ...] = tuple(item['name'] for item in inputs)
+        
+        indexed = [(i, item) for i, item in enumerate(inputs) if item.get('indexed')]
+        unindexed = [(i, item) for i, item in enumerate(inputs) if not item.get('indexed')]
+        
+        self.topic_count = 1 + len(indexed)
+        self._indexed = tuple(
+            (position, _word_decoder(item['type']) or _raw_word)
+            for position, item in indexed
+        )
+        
+        # Fast path: every data value is one static word at a fixed offset
+        words = [_word_decoder(item['type']) for _, item in unindexed]
+        if all(words):
+            self._data_words = tuple(
+                (position, offset * 32, decoder)
+                for offset, ((position, _), decoder) in enumerate(zip(unindexed, words))
+            )
+            self._data_size = 32 * len(words)
+            self._data_types = None
+        else:
+            self._data_size = 0
+            self._data_words = None
+            self._data_types = tuple(item['type'] for _, item in unindexed)
+        self._data_positions = tuple(position for position, _ in unindexed)
+    
+    @property
+    def topic_hex(self) -> str:
+        return '0x' + self.topic.hex()
+    
+    def decode_values(self, topics: Sequence[Any], data: bytes) -> Tuple[Any, ...]:
+        """Argument values in ABI order"""
+        values: List[Any] = [None] * len(self.arg_names)
+        
+        for (position, decoder), topic in zip(self._indexed, topics[1:]):
+            values[position] = decoder(_to_bytes(topic))
+        
+        if self._data_words is not None:
+            if len(data) < self._data_size:
+                raise ValueError(f"{self.name} log data is {len(data)} bytes, expected {self._data_size}")
+            for position, offset, decoder in self._data_words:
+                values[position] = decoder(data[offset:offset + 32])
+        elif self._data_types:
+            for position, value in zip(self._data_positions, abi_decode(self._data_types, data)):
+                values[position] = value
+        
+        return tuple(values)
+
+
+class DecodedEvent:
+    """Decoded log; args are built from values on access"""
+    __slots__ = (
+        'decoder', 'address', 'block_number', 'block_hash',
+        'transaction_hash', 'log_index', 'values'
+    )
+    
+    def __init__(
+        self,
+        decoder: EventDecoder,
+        address: str,
+        block_number: int,
+        block_hash: Optional[str],
+        transaction_hash: str,
+        log_index: int,
+        values: Tuple[Any, ...]
+    ):
+        self.decoder = decoder
+        self.address = address
+        self.block_number = block_number
+        self.block_hash = block_hash
+        self.transaction_hash = transaction_hash
+        self.log_index = log_index
+        self.values = values
+    
+    @property
+    def name(self) -> str:
+        return self.decoder.name
+    
+    @property
+    def args(self) -> Dict[str, Any]:
+        return dict(zip(self.decoder.arg_names, self.values))
+    
+    def __repr__(self) -> str:
+        return f"<DecodedEvent({self.name} block={self.block_number} log={self.log_index})>"
+
+
+class EventDecoderRegistry:
+    """
+    topic0 -> EventDecoder table built once from ABIs.
+    Decoders are keyed by (topic0, topic count) so events sharing a
+    signature with different indexed parameters (ERC-20 vs ERC-721
+    Transfer) are told apart.
+    """
+    
+    def __init__(self, abi: Optional[Iterable[Dict[str, Any]]] = None):
+        self.decoders: Dict[Tuple[bytes, int], EventDecoder] = {}
+        if abi:
+            self.register(abi)
+    
+    def __len__(self) -> int:
+        return len(self.decoders)
+    
+    def register(self, abi: Iterable[Dict[str, Any]]) -> List[EventDecoder]:
+        """Compile decoders for the events of an ABI; returns the new ones"""
+        added = []
+        for entry in abi:
+            if entry.get('type') != 'event' or entry.get('anonymous'):
+                continue
+            decoder = EventDecoder(entry)
+            key = (decoder.topic, decoder.topic_count)
+            if key not in self.decoders:
+                self.decoders[key] = decoder
+                added.append(decoder)
+        return added
+    
+    def decoder_for(self, topic: Any, topic_count: int) -> Optional[EventDecoder]:
+        return self.decoders.get((_to_bytes(topic), topic_count))
+    
+    def decode(self, log: Dict[str, Any]) -> Optional[DecodedEvent]:
+        """Decode one log; None for unknown or malformed logs"""
+        return self.decode_batch([log])[0]
+    
+    def decode_batch(self, logs: Iterable[Dict[str, Any]]) -> List[Optional[DecodedEvent]]:
+        """Decode logs in one pass, keeping their order"""
+        decoders = self.decoders
+        results: List[Optional[DecodedEvent]] = []
+        append = results.append
+        
+        for log in logs:
+            topics = log.get('topics') or ()
+            decoder = decoders.get((_to_bytes(topics[0]), len(topics))) if topics else None
+            if decoder is None:
+                append(None)
+                continue
+            
+            try:
+                values = decoder.decode_values(topics, _to_bytes(log.get('data') or b''))
+            except Exception:
+                append(None)
+                continue
+            
+            tx_hash = log.get('transactionHash')
+            block_hash = log.get('blockHash')
+            append(DecodedEvent(
+                decoder,
+                log['address'],
+                log['blockNumber'],
+                '0x' + _to_bytes(block_hash).hex() if block_hash is not None else None,
+                '0x' + _to_bytes(tx_hash).hex() if tx_hash is not None else '',
+                log.get('logIndex', 0),
+                values
+            ))
+        
+        return results
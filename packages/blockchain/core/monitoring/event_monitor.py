@@ -7,18 +7,27 @@ import asyncio
 import json
 import logging
 import time
-from typing import Optional, Dict, Any, List, Callable, Set
+from typing import Optional, Dict, Any, List, Callable, Set, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 from threading import Thread, Lock
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 from collections import defaultdict
+from functools import partial
 
 from web3 import Web3
 from web3.types import BlockData, TxData, LogReceipt
 from eth_typing import HexStr, ChecksumAddress
+from eth_utils import event_abi_to_log_topic
 
 from ..providers.polygon_provider import PolygonProvider
+from ..contracts.compliance_cache import ComplianceCache, shared_compliance_cache
+from .block_ranges import BlockRangeSplitter
+from .decoding import STANDARD_EVENTS_ABI, DecodedEvent, EventDecoderRegistry
+from .checkpoints import CheckpointMarker, CheckpointStore, create_checkpoint_store
+from .reorgs import BlockRef, ReorgBuffer, ReorgRetraction, normalize_hash
+from .velocity import VelocityTracker
+from .sharding import ShardedWorkerPool, holder_key
 
 
 class EventType(Enum):
@@ -33,6 +42,27 @@ class EventType(Enum):
     ROLE_REVOKED = "role_revoked"
     PAUSE = "pause"
     UNPAUSE = "unpause"
+    REORG = "reorg"
+
+
+# topic0 -> EventType, hashed once from the standard ERC-3643 event ABIs
+EVENT_TYPE_TOPICS: Dict[str, EventType] = {
+    '0x' + event_abi_to_log_topic(entry).hex(): event_type
+    for entry in STANDARD_EVENTS_ABI
+    for name, event_type in (
+        ('Transfer', EventType.TRANSFER),
+        ('Mint', EventType.MINT),
+        ('Burn', EventType.BURN),
+        ('Freeze', EventType.FREEZE),
+        ('TokensFrozen', EventType.FREEZE),
+        ('Unfreeze', EventType.UNFREEZE),
+        ('TokensUnfrozen', EventType.UNFREEZE),
+        ('IdentityVerified', EventType.COMPLIANCE_UPDATE),
+        ('Paused', EventType.PAUSE),
+        ('Unpaused', EventType.UNPAUSE)
+    )
+    if entry['name'] == name
+}
 
 
 class AlertSeverity(Enum):
@@ -51,6 +81,14 @@ class MonitoredContract:
     name: str
     event_filters: List[str] = field(default_factory=list)
     last_block_processed: int = 0
+    topics: Set[str] = field(default_factory=set)  # topic0 hashes of event_filters; empty = all
+
+
+@dataclass
+class QueuedEvent:
+    """Swept log with its decoding, done once per batch before it is queued"""
+    log: LogReceipt
+    decoded: Optional[DecodedEvent]
 
 
 @dataclass
@@ -87,7 +125,15 @@ class EventMonitor:
         self,
         provider: PolygonProvider,
         alert_callback: Optional[Callable[[EventAlert], None]] = None,
-        block_confirmations: int = 3
+        block_confirmations: int = 3,
+        range_splitter: Optional[BlockRangeSplitter] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        reorg_buffer: Optional[ReorgBuffer] = None,
+        shards: int = 4,
+        max_pending_events: int = 1000,
+        shard_by: str = 'contract',
+        compliance_cache: Optional[ComplianceCache] = None,
+        checkpoint_namespace: str = 'monitor'
     ):
         """
         Initialize event monitor
@@ -95,15 +141,39 @@ class EventMonitor:
         Args:
             provider: Polygon provider instance
             alert_callback: Function to call when alerts are generated
-            block_confirmations: Number of blocks to wait for finality
+            block_confirmations: Blocks to lag behind the head before emitting events
+            range_splitter: Adaptive eth_getLogs range sizing (shared default if None)
+            checkpoint_store: Durable cursors and processed event keys (SQLite file
+                under the user state directory if None)
+            reorg_buffer: Recent block hashes used to retract events from orphaned blocks
+            shards: Processing threads; events keep their order within a shard
+            max_pending_events: Queue bound per shard (and for the fetch queue)
+            shard_by: 'contract' or 'holder' (first non-zero address in the event)
+            compliance_cache: Handler cache to invalidate on freeze and identity events
+                (the process-wide cache the handlers share if None)
+            checkpoint_namespace: Cursor namespace of the default checkpoint store
         """
         self.provider = provider
         self.alert_callback = alert_callback
         self.block_confirmations = block_confirmations
+        self.range_splitter = range_splitter or BlockRangeSplitter()
+        self.checkpoint_store = checkpoint_store or create_checkpoint_store(namespace=checkpoint_namespace)
+        self.reorg_buffer = reorg_buffer or ReorgBuffer()
+        self.decoders = EventDecoderRegistry(STANDARD_EVENTS_ABI)
+        self.compliance_cache = shared_compliance_cache if compliance_cache is None else compliance_cache
         
         # Monitoring state
         self.monitored_contracts: Dict[ChecksumAddress, MonitoredContract] = {}
-        self.event_queue: Queue[LogReceipt] = Queue()
+        self.event_queue: Queue[Union[QueuedEvent, CheckpointMarker, ReorgRetraction]] = Queue(
+            maxsize=max_pending_events
+        )
+        self.shard_by = shard_by
+        self.workers = ShardedWorkerPool(
+            self._process_event_once,
+            shards=shards,
+            max_pending=max_pending_events,
+            name='event-monitor'
+        )
         self.alert_queue: Queue[EventAlert] = Queue()
         
         # Metrics
@@ -123,9 +193,10 @@ class EventMonitor:
             'suspicious_gas_multiplier': 5  # 5x normal gas
         }
         
-        # Recent activity tracking
-        self.recent_transfers: List[Dict[str, Any]] = []
-        self.address_activity: Dict[str, List[float]] = defaultdict(list)
+        # Recent activity tracking: transfers per token and per sender/recipient
+        # over the rapid-transfer window, and per-contract activity over an hour
+        self.transfer_velocity = VelocityTracker(self.compliance_thresholds['rapid_transfers_window'])
+        self.address_activity = VelocityTracker(3600)
         
         # Setup logging
         self.logger = logging.getLogger("veria.blockchain.event_monitor")
@@ -147,21 +218,40 @@ class EventMonitor:
             event_names: Specific events to monitor (monitors all if None)
         """
         checksum_address = Web3.to_checksum_address(address)
+        self.decoders.register(abi)
         
-        # Get current block number
-        with self.provider.connection_pool.get_connection() as w3:
-            current_block = w3.eth.block_number
+        # Resume from the saved cursor, otherwise start at the current block
+        start_block = self.checkpoint_store.load_cursor(checksum_address)
+        if start_block is None:
+            with self.provider.connection_pool.get_connection() as w3:
+                start_block = w3.eth.block_number
+        else:
+            self.logger.info(f"Resuming {name} after checkpointed block {start_block}")
         
         self.monitored_contracts[checksum_address] = MonitoredContract(
             address=checksum_address,
             abi=abi,
             name=name,
             event_filters=event_names or [],
-            last_block_processed=current_block
+            last_block_processed=start_block,
+            topics=self._event_topics(abi, event_names or [])
         )
         
+        if event_names and not self.monitored_contracts[checksum_address].topics:
+            self.logger.warning(f"None of {event_names} found in ABI for {name}; monitoring all events")
+        
         self.logger.info(f"Added contract {name} at {checksum_address} for monitoring")
     
+    @staticmethod
+    def _event_topics(abi: List[Dict], event_names: List[str]) -> Set[str]:
+        """topic0 hashes for the named events in an ABI"""
+        wanted = set(event_names)
+        return {
+            '0x' + event_abi_to_log_topic(entry).hex()
+            for entry in abi
+            if entry.get('type') == 'event' and entry.get('name') in wanted
+        }
+    
     def remove_contract(self, address: str):
         """Remove contract from monitoring"""
         checksum_address = Web3.to_checksum_address(address)
@@ -176,6 +266,8 @@ class EventMonitor:
             return
         
         self.is_running = True
+        self.compliance_cache.watch()
+        self.workers.start()
         
         # Start monitoring thread
         self.monitor_thread = Thread(target=self._monitor_loop, daemon=True)
@@ -193,12 +285,15 @@ class EventMonitor:
     
     def stop(self):
         """Stop event monitoring"""
+        if self.is_running:
+            self.compliance_cache.unwatch()
         self.is_running = False
         
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         if self.processor_thread:
             self.processor_thread.join(timeout=5)
+        self.workers.stop()
         
         self.logger.info("Event monitoring stopped")
     
@@ -206,97 +301,256 @@ class EventMonitor:
         """Main monitoring loop"""
         while self.is_running:
             try:
-                self._check_new_blocks()
-                time.sleep(2)  # Poll every 2 seconds
+                # Keep sweeping without sleeping while catching up
+                if self._check_new_blocks():
+                    time.sleep(2)  # Poll every 2 seconds
             except Exception as e:
                 self.logger.error(f"Error in monitor loop: {e}")
                 time.sleep(5)
     
-    def _check_new_blocks(self):
-        """Check for new blocks and fetch events"""
+    def _check_new_blocks(self) -> bool:
+        """Check for new blocks and fetch events; returns True once caught up"""
+        contracts = list(self.monitored_contracts.values())
+        if not contracts:
+            return True
+        
         with self.provider.connection_pool.get_connection() as w3:
             current_block = w3.eth.block_number
-            
-            for contract in self.monitored_contracts.values():
-                # Get events from last processed block to current
-                from_block = contract.last_block_processed + 1
-                to_block = min(
-                    current_block - self.block_confirmations,
-                    from_block + 100  # Process max 100 blocks at once
-                )
-                
-                if to_block > from_block:
-                    self._fetch_contract_events(w3, contract, from_block, to_block)
-                    contract.last_block_processed = to_block
+        
+        # Retract events from orphaned blocks before sweeping forward again
+        fork_block = self._detect_reorg()
+        if fork_block is not None:
+            self._rollback(contracts, fork_block)
+        
+        # One range covering every contract; routing drops blocks a contract already saw
+        head = current_block - self.block_confirmations
+        from_block = min(contract.last_block_processed for contract in contracts) + 1
+        to_block = min(head, from_block + self.range_splitter.max_window - 1)
+        
+        if to_block >= from_block:
+            if not self._fetch_events(contracts, from_block, to_block):
+                return True
+        
+        return to_block >= head
     
-    def _fetch_contract_events(
+    def _fetch_events(
         self,
-        w3: Web3,
-        contract: MonitoredContract,
+        contracts: List[MonitoredContract],
         from_block: int,
         to_block: int
-    ):
-        """Fetch events for a specific contract"""
+    ) -> bool:
+        """Fetch logs for all contracts with one eth_getLogs per sub-range and route them back"""
+        log_filter: Dict[str, Any] = {
+            'address': [contract.address for contract in contracts]
+        }
+        
+        # topics[0] can only be narrowed when every contract filters by event
+        if all(contract.topics for contract in contracts):
+            log_filter['topics'] = [sorted(set().union(*(c.topics for c in contracts)))]
+        
+        def _get_logs(start: int, end: int) -> List[LogReceipt]:
+            with self.provider.connection_pool.get_connection() as w3:
+                return w3.eth.get_logs({**log_filter, 'fromBlock': start, 'toBlock': end})
+        
         try:
-            # Create contract instance
-            contract_instance = w3.eth.contract(
-                address=contract.address,
-                abi=contract.abi
-            )
-            
-            # Get all events or specific ones
-            if contract.event_filters:
-                for event_name in contract.event_filters:
-                    if hasattr(contract_instance.events, event_name):
-                        event_filter = getattr(contract_instance.events, event_name)
-                        events = event_filter.create_filter(
-                            fromBlock=from_block,
-                            toBlock=to_block
-                        ).get_all_entries()
-                        
-                        for event in events:
-                            self.event_queue.put(event)
-            else:
-                # Get all events
-                events = w3.eth.get_logs({
-                    'address': contract.address,
-                    'fromBlock': from_block,
-                    'toBlock': to_block
-                })
-                
-                for event in events:
-                    self.event_queue.put(event)
-            
-            self.logger.debug(
-                f"Fetched events for {contract.name} blocks {from_block}-{to_block}"
-            )
-            
+            logs = self.range_splitter.fetch(from_block, to_block, _get_logs)
         except Exception as e:
-            self.logger.error(f"Error fetching events for {contract.name}: {e}")
+            self.logger.error(f"Error fetching events for blocks {from_block}-{to_block}: {e}")
+            return False
+        
+        # Hashes of the blocks still inside the reorg window; logs must agree with them
+        window = self.reorg_buffer.window(from_block, to_block)
+        refs = self._fetch_block_refs(list(window))
+        if refs is None:
+            self.logger.error(f"Error fetching block headers {window.start}-{window.stop - 1}")
+            return False
+        
+        canonical = {ref.number: ref.hash for ref in refs}
+        for log in logs:
+            block_hash = normalize_hash(log.get('blockHash'))
+            if block_hash and canonical.get(log['blockNumber'], block_hash) != block_hash:
+                self.logger.warning(f"Logs for block {log['blockNumber']} are from an orphaned fork; retrying")
+                return False
+        
+        if not self.reorg_buffer.record_blocks(refs):
+            # Chain moved under us; the next round finds the fork and rolls back
+            return False
+        
+        routed = 0
+        for log, decoded in zip(logs, self.decoders.decode_batch(logs)):
+            if self._route_log(log):
+                self._enqueue(QueuedEvent(log, decoded))
+                self.reorg_buffer.track(log['blockNumber'], log)
+                routed += 1
+        
+        for contract in contracts:
+            contract.last_block_processed = max(contract.last_block_processed, to_block)
+        
+        # Saved by the processor once every event above has been handled
+        self._enqueue(CheckpointMarker({
+            contract.address: contract.last_block_processed for contract in contracts
+        }))
+        
+        self.logger.debug(
+            f"Fetched {routed} events for {len(contracts)} contracts blocks {from_block}-{to_block}"
+        )
+        return True
+    
+    def _fetch_block_refs(self, block_numbers: List[int]) -> Optional[List[BlockRef]]:
+        """Block headers for the given heights in one batch; None if any are missing"""
+        if not block_numbers:
+            return []
+        
+        blocks = self.provider.batch_request([
+            ('get_block', [number, False]) for number in block_numbers
+        ])
+        if len(blocks) != len(block_numbers):
+            return None
+        
+        refs = []
+        for block in blocks:
+            if not block or 'error' in block:
+                return None
+            refs.append(BlockRef.from_block(block))
+        return refs
+    
+    def _detect_reorg(self) -> Optional[int]:
+        """First orphaned block number among the buffered blocks, if any"""
+        if self.reorg_buffer.tip is None:
+            return None
+        
+        def _canonical_hash(number: int) -> str:
+            refs = self._fetch_block_refs([number])
+            if not refs:
+                raise RuntimeError(f"Could not fetch block {number}")
+            return refs[0].hash
+        
+        return self.reorg_buffer.find_fork(_canonical_hash)
+    
+    def _rollback(self, contracts: List[MonitoredContract], fork_block: int):
+        """Rewind cursors below a fork and queue retractions for its emitted events"""
+        events = self.reorg_buffer.rollback(fork_block)
+        
+        for contract in contracts:
+            contract.last_block_processed = min(contract.last_block_processed, fork_block - 1)
+        
+        self._enqueue(ReorgRetraction(fork_block, events))
+        self._enqueue(CheckpointMarker({
+            contract.address: contract.last_block_processed for contract in contracts
+        }))
+    
+    @staticmethod
+    def _topic0(log: LogReceipt) -> Optional[str]:
+        """Lowercase 0x-prefixed event signature hash of a log"""
+        topics = log.get('topics') or []
+        if not topics:
+            return None
+        topic = topics[0]
+        value = topic if isinstance(topic, str) else bytes(topic).hex()
+        return '0x' + value.lower().removeprefix('0x')
+    
+    def _route_log(self, log: LogReceipt) -> Optional[MonitoredContract]:
+        """Match a swept log to its MonitoredContract, applying its event and block filters"""
+        contract = self.monitored_contracts.get(Web3.to_checksum_address(log['address']))
+        if contract is None or log['blockNumber'] <= contract.last_block_processed:
+            return None
+        
+        if contract.topics and self._topic0(log) not in contract.topics:
+            return None
+        
+        return contract
+    
+    def _enqueue(self, item: Union[QueuedEvent, CheckpointMarker, ReorgRetraction]):
+        """Queue for the processor, waiting while it is backed up"""
+        while True:
+            try:
+                self.event_queue.put(item, timeout=1)
+                return
+            except Full:
+                if not self.is_running:
+                    raise
+    
+    def _shard_key(self, item: QueuedEvent) -> str:
+        """Shard for an event: its contract, or its first holder address"""
+        if self.shard_by == 'holder' and item.decoded is not None:
+            holder = holder_key(item.decoded.args)
+            if holder:
+                return holder
+        return item.log['address']
     
     def _process_events_loop(self):
-        """Process events from queue"""
+        """Route queued events to the processing shards"""
         while self.is_running:
             try:
                 # Get event from queue (timeout to allow checking is_running)
-                event = self.event_queue.get(timeout=1)
-                self._process_event(event)
+                item = self.event_queue.get(timeout=1)
+                if isinstance(item, CheckpointMarker):
+                    # Saved once every shard has handled the events queued before it
+                    self.workers.broadcast(partial(self.checkpoint_store.save_cursors, item.cursors))
+                elif isinstance(item, ReorgRetraction):
+                    # Orphaned events may still be queued on a shard; finish them first
+                    self.workers.drain()
+                    self._retract_events(item)
+                else:
+                    self.workers.submit(self._shard_key(item), item, item.log['blockNumber'])
             except Empty:
                 continue
             except Exception as e:
                 self.logger.error(f"Error processing event: {e}")
     
-    def _process_event(self, event: LogReceipt):
+    @staticmethod
+    def _event_key(event: LogReceipt) -> Tuple[str, int]:
+        """(transaction hash, log index) identifying a log across replays"""
+        tx_hash = event['transactionHash']
+        tx_hash = tx_hash if isinstance(tx_hash, str) else '0x' + bytes(tx_hash).hex()
+        return tx_hash.lower(), int(event.get('logIndex', 0))
+    
+    def _process_event_once(self, item: QueuedEvent):
+        """Process an event unless a previous run already handled it"""
+        event = item.log
+        tx_hash, log_index = self._event_key(event)
+        if self.checkpoint_store.is_processed(tx_hash, log_index):
+            return
+        
+        self._process_event(event, item.decoded)
+        self.checkpoint_store.mark_processed(tx_hash, log_index, event['blockNumber'])
+    
+    def _retract_events(self, retraction: ReorgRetraction):
+        """Alert on events whose blocks were orphaned and allow their replay"""
+        self.checkpoint_store.forget_processed(retraction.fork_block)
+        
+        for event, decoded in zip(retraction.events, self.decoders.decode_batch(retraction.events)):
+            tx_hash, log_index = self._event_key(event)
+            self._invalidate_compliance(event, decoded)
+            self.alert_queue.put(EventAlert(
+                event_type=EventType.REORG,
+                severity=AlertSeverity.WARNING,
+                contract_address=event['address'],
+                transaction_hash=tx_hash,
+                block_number=event['blockNumber'],
+                timestamp=int(time.time()),
+                message=f"Event retracted by chain reorganization at block {retraction.fork_block}",
+                details={
+                    'log_index': log_index,
+                    'block_hash': normalize_hash(event.get('blockHash')),
+                    'fork_block': retraction.fork_block
+                }
+            ))
+    
+    def _process_event(self, event: LogReceipt, decoded: Optional[DecodedEvent]):
         """Process individual event"""
         try:
             # Identify event type
             event_type = self._identify_event_type(event)
             
+            # Drop cached compliance the event makes stale
+            self._invalidate_compliance(event, decoded)
+            
             # Update metrics
             self._update_metrics(event, event_type)
             
             # Check compliance rules
-            alerts = self._check_compliance_rules(event, event_type)
+            alerts = self._check_compliance_rules(event, event_type, decoded)
             
             # Queue alerts
             for alert in alerts:
@@ -308,24 +562,15 @@ class EventMonitor:
         except Exception as e:
             self.logger.error(f"Error processing individual event: {e}")
     
+    def _invalidate_compliance(self, event: LogReceipt, decoded: Optional[DecodedEvent]):
+        """Invalidate cached compliance for the addresses in a freeze or identity event"""
+        if decoded is not None:
+            self.compliance_cache.invalidate_event(event['address'], decoded.decoder.name, decoded.args)
+    
     def _identify_event_type(self, event: LogReceipt) -> Optional[EventType]:
         """Identify the type of event"""
         # Check event signature (first topic)
-        if not event.get('topics'):
-            return None
-        
-        signature = event['topics'][0].hex() if hasattr(event['topics'][0], 'hex') else event['topics'][0]
-        
-        # Common ERC-3643 event signatures
-        signatures = {
-            '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef': EventType.TRANSFER,
-            '0x0f6798a560793a54c3bcfe86a93cde1e73087d944c0ea20544137d4121396885': EventType.MINT,
-            '0xcc16f5dbb4873280815c1ee09dbd06736cffcc184412cf7a71a0fdb75d397ca5': EventType.BURN,
-            '0x6f3517d74d0c8d1e09d0e7e6e990c24b5e13d3f4e68a87a35c5e09e6e45c8a41': EventType.FREEZE,
-            '0x3be5b7f8cd88e14f4c6f1e15e0a7e9f3d0b8b9c2e1f0e8c7b4a3d1c9e5f2a8b1': EventType.UNFREEZE,
-        }
-        
-        return signatures.get(signature)
+        return EVENT_TYPE_TOPICS.get(self._topic0(event))
     
     def _update_metrics(self, event: LogReceipt, event_type: Optional[EventType]):
         """Update transaction metrics"""
@@ -346,17 +591,18 @@ class EventMonitor:
     def _check_compliance_rules(
         self,
         event: LogReceipt,
-        event_type: Optional[EventType]
+        event_type: Optional[EventType],
+        decoded: Optional[DecodedEvent] = None
     ) -> List[EventAlert]:
         """Check compliance rules and generate alerts"""
         alerts = []
         
         # Check large transfers
         if event_type == EventType.TRANSFER:
-            alerts.extend(self._check_large_transfer(event))
+            alerts.extend(self._check_large_transfer(event, decoded))
         
         # Check rapid transfers
-        alerts.extend(self._check_rapid_transfers(event))
+        alerts.extend(self._check_rapid_transfers(event, decoded))
         
         # Check suspicious gas usage
         alerts.extend(self._check_suspicious_gas(event))
@@ -367,15 +613,14 @@ class EventMonitor:
         
         return alerts
     
-    def _check_large_transfer(self, event: LogReceipt) -> List[EventAlert]:
+    def _check_large_transfer(self, event: LogReceipt, decoded: Optional[DecodedEvent] = None) -> List[EventAlert]:
         """Check for large transfer amounts"""
         alerts = []
         
-        # Extract transfer amount (usually in data field)
-        if len(event.get('data', '')) > 2:
+        # Extract transfer amount (decoded value, else the data field)
+        amount = self._transfer_amount(event, decoded)
+        if amount is not None:
             try:
-                amount = int(event['data'], 16)
-                
                 if amount > self.compliance_thresholds['large_transfer_amount']:
                     alert = EventAlert(
                         event_type=EventType.TRANSFER,
@@ -396,28 +641,29 @@ class EventMonitor:
         
         return alerts
     
-    def _check_rapid_transfers(self, event: LogReceipt) -> List[EventAlert]:
+    def _transfer_amount(self, event: LogReceipt, decoded: Optional[DecodedEvent] = None) -> Optional[int]:
+        """Transfer value from the decoded log, falling back to the raw data word"""
+        if decoded is not None and 'value' in decoded.decoder.arg_names:
+            return decoded.args['value']
+        
+        data = event.get('data') or '0x'
+        data = data if isinstance(data, str) else '0x' + bytes(data).hex()
+        return int(data, 16) if len(data) > 2 else None
+    
+    def _check_rapid_transfers(self, event: LogReceipt, decoded: Optional[DecodedEvent] = None) -> List[EventAlert]:
         """Check for rapid transfer patterns"""
         alerts = []
         
-        # Track transfer timestamp
+        # Track transfer against its token and parties
         current_time = time.time()
-        
-        # Clean old transfers
-        self.recent_transfers = [
-            t for t in self.recent_transfers
-            if current_time - t['timestamp'] < self.compliance_thresholds['rapid_transfers_window']
-        ]
-        
-        # Add current transfer
-        self.recent_transfers.append({
-            'timestamp': current_time,
-            'tx_hash': event['transactionHash'].hex(),
-            'address': event['address']
-        })
+        keys = [event['address']]
+        if decoded is not None:
+            args = decoded.args
+            keys.extend(args[party] for party in ('from', 'to') if party in args)
+        transfer_count = self.transfer_velocity.record(*set(keys), now=current_time)
         
         # Check if threshold exceeded
-        if len(self.recent_transfers) > self.compliance_thresholds['rapid_transfers_count']:
+        if transfer_count > self.compliance_thresholds['rapid_transfers_count']:
             alert = EventAlert(
                 event_type=EventType.TRANSFER,
                 severity=AlertSeverity.WARNING,
@@ -425,9 +671,9 @@ class EventMonitor:
                 transaction_hash=event['transactionHash'].hex(),
                 block_number=event['blockNumber'],
                 timestamp=int(current_time),
-                message=f"Rapid transfer pattern detected: {len(self.recent_transfers)} transfers in {self.compliance_thresholds['rapid_transfers_window']} seconds",
+                message=f"Rapid transfer pattern detected: {transfer_count} transfers in {self.compliance_thresholds['rapid_transfers_window']} seconds",
                 details={
-                    'transfer_count': len(self.recent_transfers),
+                    'transfer_count': transfer_count,
                     'window_seconds': self.compliance_thresholds['rapid_transfers_window']
                 }
             )
@@ -486,17 +732,7 @@ class EventMonitor:
     def _track_activity(self, event: LogReceipt, event_type: Optional[EventType]):
         """Track address activity patterns"""
         if 'address' in event:
-            current_time = time.time()
-            address = event['address']
-            
-            # Clean old activity
-            self.address_activity[address] = [
-                t for t in self.address_activity[address]
-                if current_time - t < 3600  # Keep last hour
-            ]
-            
-            # Add current activity
-            self.address_activity[address].append(current_time)
+            self.address_activity.record(event['address'])
     
     def _dispatch_alerts_loop(self):
         """Dispatch alerts to callback"""
@@ -535,8 +771,12 @@ class EventMonitor:
                 'unique_addresses': len(self.metrics.unique_addresses),
                 'events_by_type': dict(self.metrics.events_by_type),
                 'monitored_contracts': len(self.monitored_contracts),
-                'pending_events': self.event_queue.qsize(),
-                'pending_alerts': self.alert_queue.qsize()
+                'pending_events': self.event_queue.qsize() + self.workers.pending,
+                'pending_alerts': self.alert_queue.qsize(),
+                'log_ranges': self.range_splitter.get_stats(),
+                'reorgs': self.reorg_buffer.get_stats(),
+                'velocity': self.transfer_velocity.get_stats(),
+                'shards': self.workers.get_stats()
             }
     
     def get_recent_alerts(self, limit: int = 10) -> List[EventAlert]:
@@ -563,8 +803,21 @@ class EventMonitor:
         """Update compliance threshold"""
         if key in self.compliance_thresholds:
             self.compliance_thresholds[key] = value
+            if key == 'rapid_transfers_window':
+                self.transfer_velocity.set_window(value)
             self.logger.info(f"Updated compliance threshold {key} to {value}")
     
+    def get_velocity(self, address: Optional[str] = None) -> int:
+        """
+        Transfers inside the rapid-transfer window
+        
+        Args:
+            address: Token contract or sender/recipient address (all transfers if None)
+        """
+        if address is None:
+            return self.transfer_velocity.count()
+        return self.transfer_velocity.count(Web3.to_checksum_address(address))
+    
     def export_metrics(self, filepath: str):
         """Export metrics to JSON file"""
         metrics = self.get_metrics()
@@ -0,0 +1,382 @@
+"""
+Historical Token Event Indexer for Veria Platform
+Backfills decoded Transfer/Mint/Burn/Freeze logs into the token_events table
+(packages/database) so history, holder and volume queries read PostgreSQL
+instead of scanning the chain
+"""
+
+import os
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from web3 import Web3
+from web3.types import LogReceipt
+
+from ..providers.polygon_provider import PolygonProvider
+from .block_ranges import BlockRangeSplitter
+from .decoding import STANDARD_EVENTS_ABI, DecodedEvent, EventDecoderRegistry
+
+ZERO_ADDRESS = '0x' + '00' * 20
+
+# Events stored in token_events
+INDEXED_EVENTS = ('Transfer', 'Mint', 'Burn', 'Freeze', 'Unfreeze', 'TokensFrozen', 'TokensUnfrozen')
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class EventIndexer:
+    """
+    Indexes token event logs into token_events, keyed by (transaction hash,
+    log index) and indexed by (token, address, block).
+    Only blocks at least confirmations behind the head are indexed, so rows
+    are not affected by reorganizations. Progress per token is kept in
+    monitor_checkpoints under the stream 'index:<token>'.
+    """
+    
+    INSERT_CHUNK = 1000
+    
+    def __init__(
+        self,
+        provider: PolygonProvider,
+        database_url: Optional[str] = None,
+        session_factory=None,
+        range_splitter: Optional[BlockRangeSplitter] = None,
+        confirmations: int = 12,
+        chain_id: Optional[int] = None
+    ):
+        """
+        Args:
+            provider: Polygon provider used for backfills
+            database_url: PostgreSQL URL (DATABASE_URL if None)
+            session_factory: SQLAlchemy sessionmaker (built from database_url if None)
+            range_splitter: Adaptive eth_getLogs range sizing
+            confirmations: Blocks behind the head that are considered final
+            chain_id: Chain id stored with each row
+        """
+        # Imported lazily so the monitors do not require SQLAlchemy
+        from sqlalchemy import create_engine, select, func, or_, union_all
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.dialects import postgresql, sqlite
+        from packages.database.models import MonitorCheckpoint, TokenEvent
+        
+        self._select, self._func, self._or, self._union_all = select, func, or_, union_all
+        # SQLite (tests, local tools) has the same upserts under its own dialect
+        self._inserts = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+        self.MonitorCheckpoint = MonitorCheckpoint
+        self.TokenEvent = TokenEvent
+        
+        if session_factory is None:
+            engine = create_engine(
+                database_url or os.getenv('DATABASE_URL'),
+                pool_pre_ping=True
+            )
+            session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.session_factory = session_factory
+        
+        self.provider = provider
+        self.range_splitter = range_splitter or BlockRangeSplitter()
+        self.confirmations = confirmations
+        self.chain_id = chain_id
+        self.decoders = EventDecoderRegistry(
+            entry for entry in STANDARD_EVENTS_ABI if entry['name'] in INDEXED_EVENTS
+        )
+        self.topics = sorted({decoder.topic_hex for decoder in self.decoders.decoders.values()})
+        self.arg_names = {decoder.name: decoder.arg_names for decoder in self.decoders.decoders.values()}
+        self.logger = logging.getLogger(f"{__name__}.EventIndexer")
+    
+    @staticmethod
+    def stream(token: str) -> str:
+        return f"index:{Web3.to_checksum_address(token)}"
+    
+    def indexed_through(self, token: str) -> Optional[int]:
+        """Last block fully indexed for a token, or None if never indexed"""
+        with self.session_factory() as session:
+            checkpoint = session.get(self.MonitorCheckpoint, self.stream(token))
+            return checkpoint.block_number if checkpoint else None
+    
+    def covers(self, token: str, to_block: Any = 'latest') -> bool:
+        """True if queries up to to_block can be answered from the table alone"""
+        indexed = self.indexed_through(token)
+        if indexed is None or not isinstance(to_block, int):
+            return False
+        return to_block <= indexed
+    
+    def indexed_prefix(self, token: str, from_block: int, to_block: Any = 'latest') -> Optional[int]:
+        """
+        Last block of a query range that can be read from the table
+        
+        Args:
+            token: Token contract address
+            from_block: First block of the query
+            to_block: Last block of the query ('latest' or None for the head)
+        
+        Returns:
+            Block through which the table answers the query (callers scan the
+            chain after it), or None when nothing in the range is indexed
+        """
+        indexed = self.indexed_through(token)
+        if indexed is None or indexed < from_block:
+            return None
+        return min(indexed, to_block) if isinstance(to_block, int) else indexed
+    
+    def sync(self, token: str, start_block: int = 0) -> int:
+        """
+        Index a token from its last indexed block up to the confirmed head
+        
+        Args:
+            token: Token contract address
+            start_block: First block when the token was never indexed (deployment block)
+        
+        Returns:
+            Number of events stored
+        """
+        with self.provider.connection_pool.get_connection() as w3:
+            head = w3.eth.block_number
+        
+        indexed = self.indexed_through(token)
+        from_block = start_block if indexed is None else indexed + 1
+        to_block = head - self.confirmations
+        if to_block < from_block:
+            return 0
+        
+        stored = 0
+        # Commit in bounded windows so an interrupted backfill keeps its progress
+        window = self.range_splitter.max_window
+        for start in range(from_block, to_block + 1, window):
+            stored += self.index_range(token, start, min(to_block, start + window - 1))
+        return stored
+    
+    def index_range(self, token: str, from_block: int, to_block: int) -> int:
+        """Fetch, decode and store a token's events for an inclusive block range"""
+        token = Web3.to_checksum_address(token)
+        log_filter = {'address': token, 'topics': [self.topics]}
+        
+        def _get_logs(start: int, end: int) -> List[LogReceipt]:
+            with self.provider.connection_pool.get_connection() as w3:
+                return w3.eth.get_logs({**log_filter, 'fromBlock': start, 'toBlock': end})
+        
+        logs = self.range_splitter.fetch(from_block, to_block, _get_logs)
+        rows = self._rows(self.decoders.decode_batch(logs))
+        self._store(token, rows, to_block)
+        
+        self.logger.info(f"Indexed {len(rows)} events for {token} blocks {from_block}-{to_block}")
+        return len(rows)
+    
+    def index_events(self, token: str, events: Iterable[DecodedEvent], through_block: Optional[int] = None) -> int:
+        """
+        Store events decoded elsewhere (e.g. by an event monitor)
+        through_block advances the token's indexed cursor when given.
+        """
+        rows = self._rows(events)
+        self._store(Web3.to_checksum_address(token), rows, through_block)
+        return len(rows)
+    
+    def _rows(self, events: Iterable[Optional[DecodedEvent]]) -> List[Dict[str, Any]]:
+        events = [event for event in events if event is not None and event.name in INDEXED_EVENTS]
+        timestamps = self._block_timestamps(sorted({event.block_number for event in events}))
+        
+        rows = []
+        for event in events:
+            args = event.args
+            rows.append({
+                'transaction_hash': event.transaction_hash.lower(),
+                'log_index': event.log_index,
+                'chain_id': self.chain_id,
+                'token_address': Web3.to_checksum_address(event.address),
+                'event_type': event.name,
+                'from_address': args.get('from'),
+                'to_address': args.get('to') or args.get('account') or args.get('userAddress'),
+                'amount': args.get('value', args.get('amount')),
+                'block_number': event.block_number,
+                'block_hash': event.block_hash,
+                'block_timestamp': timestamps.get(event.block_number)
+            })
+        return rows
+    
+    def _block_timestamps(self, block_numbers: List[int]) -> Dict[int, datetime]:
+        """Block times in one batch; blocks that fail are left without a timestamp"""
+        if not block_numbers:
+            return {}
+        
+        blocks = self.provider.batch_request([
+            ('get_block', [number, False]) for number in block_numbers
+        ])
+        timestamps = {}
+        for number, block in zip(block_numbers, blocks):
+            if block and 'error' not in block and block.get('timestamp') is not None:
+                timestamps[number] = datetime.fromtimestamp(
+                    _as_int(block['timestamp']), tz=timezone.utc
+                ).replace(tzinfo=None)
+        return timestamps
+    
+    def _store(self, token: str, rows: List[Dict[str, Any]], through_block: Optional[int]):
+        """Insert rows and advance the cursor in one transaction"""
+        with self.session_factory() as session, session.begin():
+            dialect = session.get_bind().dialect.name
+            insert = self._inserts.get(dialect, self._inserts['postgresql'])
+            greatest = self._func.max if dialect == 'sqlite' else self._func.greatest
+            
+            # Chunked to stay under PostgreSQL's bind parameter limit
+            for start in range(0, len(rows), self.INSERT_CHUNK):
+                session.execute(
+                    insert(self.TokenEvent)
+                    .values(rows[start:start + self.INSERT_CHUNK])
+                    .on_conflict_do_nothing()
+                )
+            if through_block is not None:
+                statement = insert(self.MonitorCheckpoint).values(
+                    stream=self.stream(token), block_number=through_block
+                )
+                session.execute(statement.on_conflict_do_update(
+                    index_elements=[self.MonitorCheckpoint.stream],
+                    set_={
+                        'block_number': greatest(
+                            self.MonitorCheckpoint.block_number, statement.excluded.block_number
+                        ),
+                        'updated_at': self._func.now()
+                    }
+                ))
+    
+    def row_args(self, row: Any) -> Dict[str, Any]:
+        """Event args of a TokenEvent row under the event's own ABI names"""
+        columns = {
+            'from': row.from_address, 'to': row.to_address,
+            'account': row.to_address, 'userAddress': row.to_address,
+            'value': row.amount, 'amount': row.amount
+        }
+        args = {}
+        for name in self.arg_names.get(row.event_type, ()):
+            value = columns.get(name)
+            args[name] = int(value) if name in ('value', 'amount') and value is not None else value
+        return args
+    
+    def get_history(
+        self,
+        token: str,
+        address: Optional[str] = None,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+        event_types: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Indexed events for a token, newest first
+        
+        Args:
+            token: Token contract address
+            address: Only events sent from or received by this address
+            from_block: First block
+            to_block: Last block (everything indexed if None)
+            event_types: Event names to include (all if None)
+            limit: Maximum rows
+        
+        Returns:
+            TokenEvent rows
+        """
+        select, or_ = self._select, self._or
+        TokenEvent = self.TokenEvent
+        
+        statement = select(TokenEvent).where(
+            TokenEvent.token_address == Web3.to_checksum_address(token),
+            TokenEvent.block_number >= from_block
+        )
+        if to_block is not None:
+            statement = statement.where(TokenEvent.block_number <= to_block)
+        if address is not None:
+            address = Web3.to_checksum_address(address)
+            statement = statement.where(or_(
+                TokenEvent.from_address == address,
+                TokenEvent.to_address == address
+            ))
+        if event_types is not None:
+            statement = statement.where(TokenEvent.event_type.in_(list(event_types)))
+        
+        statement = statement.order_by(TokenEvent.block_number.desc(), TokenEvent.log_index.desc())
+        if limit is not None:
+            statement = statement.limit(limit)
+        
+        with self.session_factory() as session:
+            return list(session.execute(statement).scalars())
+    
+    def get_holders(self, token: str, at_block: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Balances per holder from indexed Transfer events (mints come from and
+        burns go to the zero address), largest first
+        
+        Args:
+            token: Token contract address
+            at_block: Balances as of this block (latest indexed if None)
+            limit: Maximum holders
+        """
+        select, func, union_all = self._select, self._func, self._union_all
+        TokenEvent = self.TokenEvent
+        
+        conditions = [
+            TokenEvent.token_address == Web3.to_checksum_address(token),
+            TokenEvent.event_type == 'Transfer'
+        ]
+        if at_block is not None:
+            conditions.append(TokenEvent.block_number <= at_block)
+        
+        movements = union_all(
+            select(TokenEvent.to_address.label('holder'), TokenEvent.amount.label('delta'))
+            .where(*conditions, TokenEvent.to_address != ZERO_ADDRESS),
+            select(TokenEvent.from_address.label('holder'), (-TokenEvent.amount).label('delta'))
+            .where(*conditions, TokenEvent.from_address != ZERO_ADDRESS)
+        ).subquery()
+        
+        balance = func.sum(movements.c.delta)
+        statement = (
+            select(movements.c.holder, balance.label('balance'))
+            .group_by(movements.c.holder)
+            .having(balance > 0)
+            .order_by(balance.desc())
+        )
+        if limit is not None:
+            statement = statement.limit(limit)
+        
+        with self.session_factory() as session:
+            return {holder: int(amount) for holder, amount in session.execute(statement)}
+    
+    def get_volume(self, token: str, from_block: int = 0, to_block: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Transfer count and volume between holders (mints and burns excluded)
+        
+        Args:
+            token: Token contract address
+            from_block: First block
+            to_block: Last block (everything indexed if None)
+        """
+        select, func = self._select, self._func
+        TokenEvent = self.TokenEvent
+        
+        statement = select(
+            func.count(),
+            func.coalesce(func.sum(TokenEvent.amount), 0),
+            func.count(func.distinct(TokenEvent.from_address))
+        ).where(
+            TokenEvent.token_address == Web3.to_checksum_address(token),
+            TokenEvent.event_type == 'Transfer',
+            TokenEvent.from_address != ZERO_ADDRESS,
+            TokenEvent.to_address != ZERO_ADDRESS,
+            TokenEvent.block_number >= from_block
+        )
+        if to_block is not None:
+            statement = statement.where(TokenEvent.block_number <= to_block)
+        
+        with self.session_factory() as session:
+            transfers, volume, senders = session.execute(statement).one()
+        
+        return {
+            'token': Web3.to_checksum_address(token),
+            'from_block': from_block,
+            'to_block': to_block if to_block is not None else self.indexed_through(token),
+            'transfers': transfers,
+            'volume': int(volume),
+            'unique_senders': senders
+        }
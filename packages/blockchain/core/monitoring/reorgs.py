@@ -0,0 +1,165 @@
+"""
+Chain Reorganization Tracking for Veria Platform
+Sliding window of recent block hashes with parent-hash checks, so monitors can
+emit events tentatively near the head and retract them if their block is orphaned
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+
+def normalize_hash(value: Any) -> Optional[str]:
+    """Lowercase 0x-prefixed hex for str / bytes / HexBytes block hashes"""
+    if value is None:
+        return None
+    text = value if isinstance(value, str) else bytes(value).hex()
+    return '0x' + text.lower().removeprefix('0x')
+
+
+@dataclass
+class BlockRef:
+    """Number, hash and parent hash of a block"""
+    number: int
+    hash: str
+    parent_hash: str
+    
+    @classmethod
+    def from_block(cls, block: Mapping[str, Any]) -> 'BlockRef':
+        """Build from an eth_getBlock result"""
+        number = block['number']
+        return cls(
+            number=int(number, 16) if isinstance(number, str) else int(number),
+            hash=normalize_hash(block['hash']),
+            parent_hash=normalize_hash(block['parentHash'])
+        )
+
+
+@dataclass
+class ReorgRetraction:
+    """
+    Queued when a reorganization orphans blocks whose events were already
+    emitted; events lists them in emission order
+    """
+    fork_block: int
+    events: List[Any] = field(default_factory=list)
+
+
+class ReorgBuffer:
+    """
+    Recent canonical block hashes plus the events emitted from those blocks.
+    Blocks that fall more than depth behind the newest one are treated as
+    final and their events are released.
+    """
+    
+    def __init__(self, depth: int = 64):
+        self.depth = max(1, depth)
+        self.blocks: 'OrderedDict[int, BlockRef]' = OrderedDict()
+        self.events: Dict[int, List[Any]] = {}
+        self.lock = Lock()
+        self.logger = logging.getLogger(f"{__name__}.ReorgBuffer")
+        self.stats = {'reorgs': 0, 'orphaned_blocks': 0, 'retracted_events': 0, 'deepest_reorg': 0}
+    
+    @property
+    def tip(self) -> Optional[BlockRef]:
+        with self.lock:
+            return next(reversed(self.blocks.values()), None)
+    
+    def window(self, from_block: int, to_block: int) -> range:
+        """Block numbers of an inclusive range that are still inside the buffer depth"""
+        return range(max(from_block, to_block - self.depth + 1), to_block + 1)
+    
+    def record_blocks(self, refs: Iterable[BlockRef]) -> bool:
+        """
+        Append canonical blocks in ascending order.
+        Returns False if a block does not build on the current tip, meaning the
+        chain reorganized since the tip was recorded; nothing is appended then.
+        """
+        refs = sorted(refs, key=lambda ref: ref.number)
+        if not refs:
+            return True
+        
+        with self.lock:
+            tip = next(reversed(self.blocks.values()), None)
+            if tip and refs[0].number <= tip.number:
+                refs = [ref for ref in refs if ref.number > tip.number]
+                if not refs:
+                    return True
+            
+            previous = tip if tip and refs[0].number == tip.number + 1 else None
+            if tip and previous is None:
+                # Gap: everything buffered is older than the new window and final
+                self.blocks.clear()
+                self.events.clear()
+            
+            for ref in refs:
+                if previous and ref.parent_hash != previous.hash:
+                    return False
+                previous = ref
+            
+            for ref in refs:
+                self.blocks[ref.number] = ref
+            
+            while len(self.blocks) > self.depth:
+                number, _ = self.blocks.popitem(last=False)
+                self.events.pop(number, None)
+        return True
+    
+    def track(self, block_number: int, event: Any):
+        """Remember an event emitted from a block still inside the window"""
+        with self.lock:
+            if block_number in self.blocks:
+                self.events.setdefault(block_number, []).append(event)
+    
+    def find_fork(self, canonical_hash: Callable[[int], Optional[str]]) -> Optional[int]:
+        """
+        Compare buffered hashes against the chain, newest first
+        canonical_hash(number) returns the current hash at that height.
+        Returns the first orphaned block number, or None if the tip is canonical.
+        """
+        with self.lock:
+            buffered = list(reversed(self.blocks.values()))
+        
+        fork_block = None
+        for ref in buffered:
+            if normalize_hash(canonical_hash(ref.number)) == ref.hash:
+                break
+            fork_block = ref.number
+        else:
+            if fork_block is not None:
+                self.logger.warning(
+                    f"Reorganization reaches below the {self.depth}-block buffer at {fork_block}"
+                )
+        return fork_block
+    
+    def rollback(self, fork_block: int) -> List[Any]:
+        """Drop blocks from fork_block up and return their emitted events in order"""
+        with self.lock:
+            orphaned = [number for number in self.blocks if number >= fork_block]
+            events = []
+            for number in orphaned:
+                del self.blocks[number]
+                events.extend(self.events.pop(number, []))
+            
+            self.stats['reorgs'] += 1
+            self.stats['orphaned_blocks'] += len(orphaned)
+            self.stats['retracted_events'] += len(events)
+            self.stats['deepest_reorg'] = max(self.stats['deepest_reorg'], len(orphaned))
+        
+        self.logger.warning(
+            f"Chain reorganization from block {fork_block}: "
+            f"{len(orphaned)} blocks orphaned, {len(events)} events retracted"
+        )
+        return events
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            tip = next(reversed(self.blocks.values()), None)
+            return {
+                'depth': self.depth,
+                'buffered_blocks': len(self.blocks),
+                'tip': tip.number if tip else None,
+                **self.stats
+            }
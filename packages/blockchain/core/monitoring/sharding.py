@@ -0,0 +1,289 @@
+"""
+Sharded Event Processing for Veria Platform
+Events are partitioned by key (contract or holder address) onto N workers with
+bounded queues, so each shard keeps its order, a full shard pushes back on the
+producer and one hot contract cannot starve the others
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from queue import Queue, Empty, Full
+from threading import Lock, Thread
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional
+
+ZERO_ADDRESS = '0x' + '00' * 20
+
+
+def shard_index(key: Hashable, shards: int) -> int:
+    """Stable shard for a key (crc32, so it does not vary between runs)"""
+    return zlib.crc32(str(key).lower().encode()) % shards
+
+
+def holder_key(args: Mapping[str, Any]) -> Optional[str]:
+    """First non-zero address among decoded event args (sender before recipient)"""
+    for value in args.values():
+        if isinstance(value, str) and len(value) == 42 and value.startswith('0x') \
+                and value.lower() != ZERO_ADDRESS:
+            return value
+    return None
+
+
+@dataclass
+class ShardStats:
+    """Progress of one shard"""
+    processed: int = 0
+    failed: int = 0
+    submitted_block: Optional[int] = None
+    processed_block: Optional[int] = None
+    last_wait: float = 0.0  # Seconds the last handled event spent queued
+    
+    def snapshot(self, index: int, pending: int) -> Dict[str, Any]:
+        lag_blocks = 0
+        if pending and self.submitted_block is not None and self.processed_block is not None:
+            lag_blocks = max(0, self.submitted_block - self.processed_block)
+        return {
+            'shard': index,
+            'pending': pending,
+            'processed': self.processed,
+            'failed': self.failed,
+            'lag_blocks': lag_blocks,
+            'lag_seconds': round(self.last_wait, 3)
+        }
+
+
+class _Countdown:
+    """Queued on every shard; the last shard to reach it runs the callback"""
+    __slots__ = ('remaining', 'callback', 'lock')
+    
+    def __init__(self, shards: int, callback: Callable[[], Any]):
+        self.remaining = shards
+        self.callback = callback
+        self.lock = Lock()
+    
+    def arrive(self) -> bool:
+        with self.lock:
+            self.remaining -= 1
+            return self.remaining == 0
+
+
+class ShardedWorkerPool:
+    """
+    Worker threads each draining a bounded queue.
+    submit() blocks while the target shard is full. broadcast() runs a callback
+    once every shard has handled what was submitted before it (checkpoints);
+    drain() waits until all shards are idle (reorg retractions).
+    """
+    
+    def __init__(
+        self,
+        handler: Callable[[Any], None],
+        shards: int = 4,
+        max_pending: int = 1000,
+        name: str = 'events'
+    ):
+        """
+        Args:
+            handler: Called with each submitted item on its shard's thread
+            shards: Number of worker threads
+            max_pending: Queue bound per shard
+            name: Thread name prefix
+        """
+        self.handler = handler
+        self.shards = max(1, shards)
+        self.name = name
+        self.queues: List[Queue] = [Queue(maxsize=max_pending) for _ in range(self.shards)]
+        self.stats = [ShardStats() for _ in range(self.shards)]
+        self.threads: List[Thread] = []
+        self.is_running = False
+        self.logger = logging.getLogger(f"{__name__}.ShardedWorkerPool")
+    
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.threads = [
+            Thread(target=self._worker, args=(index,), name=f"{self.name}-shard-{index}", daemon=True)
+            for index in range(self.shards)
+        ]
+        for thread in self.threads:
+            thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        self.is_running = False
+        for thread in self.threads:
+            thread.join(timeout=timeout)
+        self.threads = []
+    
+    def _put(self, index: int, entry: Any) -> bool:
+        """Put with backpressure; gives up only when the pool stops"""
+        while self.is_running:
+            try:
+                self.queues[index].put(entry, timeout=1)
+                return True
+            except Full:
+                continue
+        return False
+    
+    def submit(self, key: Hashable, item: Any, block_number: Optional[int] = None) -> bool:
+        """Queue an item on its key's shard; False if the pool is stopped"""
+        index = shard_index(key, self.shards)
+        if not self._put(index, (item, block_number, time.monotonic())):
+            return False
+        if block_number is not None:
+            self.stats[index].submitted_block = block_number
+        return True
+    
+    def broadcast(self, callback: Callable[[], Any]) -> bool:
+        """Run callback after every shard has handled the items submitted so far"""
+        countdown = _Countdown(self.shards, callback)
+        return all(self._put(index, countdown) for index in range(self.shards))
+    
+    def drain(self):
+        """Block until every submitted item has been handled (or the pool stops)"""
+        for queue in self.queues:
+            with queue.all_tasks_done:
+                while queue.unfinished_tasks and self.is_running:
+                    queue.all_tasks_done.wait(0.5)
+    
+    @property
+    def pending(self) -> int:
+        return sum(queue.qsize() for queue in self.queues)
+    
+    def _worker(self, index: int):
+        queue, stats = self.queues[index], self.stats[index]
+        while self.is_running:
+            try:
+                entry = queue.get(timeout=1)
+            except Empty:
+                continue
+            
+            try:
+                if isinstance(entry, _Countdown):
+                    if entry.arrive():
+                        entry.callback()
+                    continue
+                
+                item, block_number, queued_at = entry
+                stats.last_wait = time.monotonic() - queued_at
+                self.handler(item)
+                stats.processed += 1
+                if block_number is not None:
+                    stats.processed_block = block_number
+            except Exception as e:
+                stats.failed += 1
+                self.logger.error(f"Error in {self.name} shard {index}: {e}")
+            finally:
+                queue.task_done()
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [
+            stats.snapshot(index, queue.qsize())
+            for index, (queue, stats) in enumerate(zip(self.queues, self.stats))
+        ]
+
+
+class AsyncShardedWorkerPool:
+    """
+    asyncio counterpart of ShardedWorkerPool: one consumer task per shard,
+    awaiting a coroutine handler per item
+    """
+    
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        shards: int = 4,
+        max_pending: int = 1000,
+        name: str = 'events'
+    ):
+        """
+        Args:
+            handler: Coroutine function awaited with each submitted item
+            shards: Number of consumer tasks
+            max_pending: Queue bound per shard
+            name: Task name prefix
+        """
+        self.handler = handler
+        self.shards = max(1, shards)
+        self.name = name
+        self.queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=max_pending) for _ in range(self.shards)]
+        self.stats = [ShardStats() for _ in range(self.shards)]
+        self.tasks: List[asyncio.Task] = []
+        self.logger = logging.getLogger(f"{__name__}.AsyncShardedWorkerPool")
+    
+    @property
+    def is_running(self) -> bool:
+        return bool(self.tasks)
+    
+    def start(self):
+        """Create the consumer tasks (requires a running event loop)"""
+        if self.tasks:
+            return
+        self.tasks = [
+            asyncio.create_task(self._worker(index), name=f"{self.name}-shard-{index}")
+            for index in range(self.shards)
+        ]
+    
+    async def stop(self):
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def submit(self, key: Hashable, item: Any, block_number: Optional[int] = None) -> None:
+        """Queue an item on its key's shard, waiting while the shard is full"""
+        index = shard_index(key, self.shards)
+        await self.queues[index].put((item, block_number, time.monotonic()))
+        if block_number is not None:
+            self.stats[index].submitted_block = block_number
+    
+    async def broadcast(self, callback: Callable[[], Any]) -> None:
+        """
+        Run callback after every shard has handled the items submitted so far
+        An awaitable returned by callback (e.g. from asyncio.to_thread) is awaited
+        on the shard that runs it.
+        """
+        countdown = _Countdown(self.shards, callback)
+        for queue in self.queues:
+            await queue.put(countdown)
+    
+    async def drain(self) -> None:
+        """Wait until every submitted item has been handled"""
+        await asyncio.gather(*(queue.join() for queue in self.queues))
+    
+    @property
+    def pending(self) -> int:
+        return sum(queue.qsize() for queue in self.queues)
+    
+    async def _worker(self, index: int):
+        queue, stats = self.queues[index], self.stats[index]
+        while True:
+            entry = await queue.get()
+            try:
+                if isinstance(entry, _Countdown):
+                    if entry.arrive():
+                        result = entry.callback()
+                        if inspect.isawaitable(result):
+                            await result
+                    continue
+                
+                item, block_number, queued_at = entry
+                stats.last_wait = time.monotonic() - queued_at
+                await self.handler(item)
+                stats.processed += 1
+                if block_number is not None:
+                    stats.processed_block = block_number
+            except Exception as e:
+                stats.failed += 1
+                self.logger.error(f"Error in {self.name} shard {index}: {e}")
+            finally:
+                queue.task_done()
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [
+            stats.snapshot(index, queue.qsize())
+            for index, (queue, stats) in enumerate(zip(self.queues, self.stats))
+        ]
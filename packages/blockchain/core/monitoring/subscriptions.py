@@ -0,0 +1,165 @@
+"""
+WebSocket Subscriptions for Veria Platform
+Push feed of new heads and contract logs over a persistent WebSocket, with
+automatic reconnection and a give-up signal so monitors fall back to polling
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from web3 import AsyncWeb3, WebsocketProviderV2
+from web3.types import LogReceipt
+
+
+def _connect(ws_url: str):
+    return AsyncWeb3.persistent_websocket(WebsocketProviderV2(ws_url))
+
+
+class SubscriptionFeed:
+    """
+    newHeads and logs subscriptions on one WebSocket connection.
+    Heads wake waiters in wait_for_head(); logs (including removed=True
+    notifications on reorgs) go to on_log. Dropped connections are re-opened
+    with exponential backoff; after max_failures consecutive failed attempts
+    the feed marks itself unavailable and stops.
+    """
+    
+    def __init__(
+        self,
+        ws_url: str,
+        log_filter: Callable[[], Dict[str, Any]],
+        on_log: Optional[Callable[[LogReceipt], None]] = None,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        max_failures: int = 5,
+        connect: Callable[[str], Any] = _connect
+    ):
+        """
+        Args:
+            ws_url: WebSocket RPC endpoint
+            log_filter: Returns the current eth_subscribe logs filter ({} for none)
+            on_log: Called with every pushed log
+            reconnect_delay: First reconnect delay in seconds, doubled per failure
+            max_reconnect_delay: Upper bound for the reconnect delay
+            max_failures: Consecutive failed connects before giving up
+            connect: Returns an async context manager yielding a persistent AsyncWeb3
+        """
+        self.ws_url = ws_url
+        self.log_filter = log_filter
+        self.on_log = on_log
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_failures = max_failures
+        self.connect = connect
+        
+        self.head: Optional[int] = None
+        self.connected = False
+        self.available = True
+        self.is_running = False
+        self._head_event = asyncio.Event()
+        self._refresh = False
+        self.logger = logging.getLogger(f"{__name__}.SubscriptionFeed")
+        self.stats = {'connects': 0, 'disconnects': 0, 'heads': 0, 'logs': 0}
+    
+    async def run(self) -> None:
+        """Keep the subscriptions open until stop() or max_failures is reached"""
+        self.is_running = True
+        failures = 0
+        
+        while self.is_running:
+            try:
+                async with self.connect(self.ws_url) as w3:
+                    failures = 0
+                    await self._consume(w3)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"WebSocket subscription to {self.ws_url} failed: {e}")
+            
+            if self.connected:
+                self.stats['disconnects'] += 1
+            self.connected = False
+            if not self.is_running:
+                break
+            
+            failures += 1
+            if failures >= self.max_failures:
+                self.available = False
+                self.is_running = False
+                self.logger.error(
+                    f"WebSocket endpoint {self.ws_url} unavailable after {failures} attempts; "
+                    "falling back to polling"
+                )
+                break
+            
+            await asyncio.sleep(min(self.max_reconnect_delay, self.reconnect_delay * 2 ** (failures - 1)))
+        
+        # Release anyone waiting for a head so they notice the fallback
+        self._head_event.set()
+    
+    async def _subscribe_logs(self, w3) -> Optional[str]:
+        log_filter = self.log_filter()
+        if not log_filter.get('address'):
+            return None
+        return await w3.eth.subscribe('logs', log_filter)
+    
+    async def _consume(self, w3) -> None:
+        """Subscribe and dispatch notifications until the connection closes"""
+        logs_id = await self._subscribe_logs(w3)
+        heads_id = await w3.eth.subscribe('newHeads')
+        self._refresh = False
+        self.connected = True
+        self.stats['connects'] += 1
+        self.logger.info(f"Subscribed to newHeads and logs on {self.ws_url}")
+        
+        async for message in w3.ws.process_subscriptions():
+            subscription, result = message.get('subscription'), message.get('result')
+            
+            if subscription == heads_id:
+                number = result['number']
+                self.head = int(number, 16) if isinstance(number, str) else number
+                self.stats['heads'] += 1
+                self._head_event.set()
+            elif subscription == logs_id and logs_id is not None:
+                self.stats['logs'] += 1
+                if self.on_log:
+                    try:
+                        self.on_log(result)
+                    except Exception as e:
+                        self.logger.error(f"Error handling pushed log: {e}")
+            
+            if self._refresh:
+                # Monitored contracts changed; swap the logs subscription
+                self._refresh = False
+                if logs_id is not None:
+                    await w3.eth.unsubscribe(logs_id)
+                logs_id = await self._subscribe_logs(w3)
+            
+            if not self.is_running:
+                break
+    
+    def refresh(self) -> None:
+        """Re-subscribe logs with the current filter on the next notification"""
+        self._refresh = True
+    
+    async def wait_for_head(self, timeout: float) -> bool:
+        """Wait for a new head; False on timeout"""
+        try:
+            await asyncio.wait_for(self._head_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._head_event.clear()
+        return True
+    
+    def stop(self) -> None:
+        self.is_running = False
+        self._head_event.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'connected': self.connected,
+            'available': self.available,
+            'head': self.head,
+            **self.stats
+        }
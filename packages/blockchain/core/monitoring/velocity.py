@@ -0,0 +1,118 @@
+"""
+Sliding-Window Velocity Tracking for Veria Platform
+Per-key and overall event rates over a trailing time window in amortized O(1)
+per event, with idle keys evicted so memory follows the active set
+"""
+
+import time
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+
+
+class SlidingWindowCounter:
+    """Event count over a trailing window, kept as sparse [bucket, count] pairs"""
+    __slots__ = ('buckets', 'total')
+    
+    def __init__(self):
+        self.buckets: deque = deque()
+        self.total = 0
+    
+    def expire(self, horizon: int) -> int:
+        """Drop buckets older than horizon and return the remaining count"""
+        buckets = self.buckets
+        while buckets and buckets[0][0] < horizon:
+            self.total -= buckets.popleft()[1]
+        return self.total
+    
+    def add(self, bucket: int, horizon: int, amount: int = 1) -> int:
+        self.expire(horizon)
+        if self.buckets and self.buckets[-1][0] == bucket:
+            self.buckets[-1][1] += amount
+        else:
+            self.buckets.append([bucket, amount])
+        self.total += amount
+        return self.total
+    
+    @property
+    def last_bucket(self) -> Optional[int]:
+        return self.buckets[-1][0] if self.buckets else None
+
+
+class VelocityTracker:
+    """
+    Counts events per key (address, token) and overall within a trailing window.
+    The window is split into resolution buckets, so counts may include up to
+    one bucket of events older than the window. Keys are kept in last-seen
+    order; keys with nothing inside the window are evicted from the front.
+    """
+    
+    def __init__(self, window: float, resolution: int = 60, max_keys: int = 100000):
+        """
+        Args:
+            window: Trailing window in seconds
+            resolution: Buckets per window
+            max_keys: Upper bound on tracked keys (least recently seen dropped first)
+        """
+        self.resolution = max(1, resolution)
+        self.max_keys = max_keys
+        self.lock = Lock()
+        self.set_window(window)
+    
+    def set_window(self, window: float):
+        """Change the window; bucket boundaries move, so counting restarts"""
+        with self.lock:
+            self.window = window
+            self.bucket_seconds = max(window / self.resolution, 1e-6)
+            self.overall = SlidingWindowCounter()
+            self.keys: 'OrderedDict[Hashable, SlidingWindowCounter]' = OrderedDict()
+            self.evicted = 0
+    
+    def _position(self, now: Optional[float]):
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        return bucket, bucket - self.resolution + 1
+    
+    def _evict(self, horizon: int):
+        keys = self.keys
+        while keys:
+            key, counter = next(iter(keys.items()))
+            if len(keys) <= self.max_keys and counter.last_bucket is not None and counter.last_bucket >= horizon:
+                break
+            del keys[key]
+            self.evicted += 1
+    
+    def record(self, *keys: Hashable, now: Optional[float] = None, amount: int = 1) -> int:
+        """Count one event for each key and once overall; returns the overall count"""
+        with self.lock:
+            bucket, horizon = self._position(now)
+            for key in keys:
+                counter = self.keys.get(key)
+                if counter is None:
+                    counter = self.keys[key] = SlidingWindowCounter()
+                else:
+                    self.keys.move_to_end(key)
+                counter.add(bucket, horizon, amount)
+            
+            total = self.overall.add(bucket, horizon, amount)
+            self._evict(horizon)
+            return total
+    
+    def count(self, key: Optional[Hashable] = None, now: Optional[float] = None) -> int:
+        """Events inside the window for a key, or overall when key is None"""
+        with self.lock:
+            _, horizon = self._position(now)
+            if key is None:
+                return self.overall.expire(horizon)
+            counter = self.keys.get(key)
+            return counter.expire(horizon) if counter else 0
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'window_seconds': self.window,
+                'tracked_keys': len(self.keys),
+                'evicted_keys': self.evicted
+            }
@@ -8,8 +8,18 @@ from .polygon_provider import (
     ConnectionPool,
     GasConfig,
     RetryConfig,
+    BatchConfig,
+    NonceManager,
+    TransactionStore,
+    GasOracle,
+    TransactionSigner,
     create_polygon_provider
 )
+from .async_polygon_provider import (
+    AsyncPolygonProvider,
+    AsyncConnectionPool,
+    create_async_polygon_provider
+)
 
 __version__ = '0.1.0'
 
@@ -18,5 +28,13 @@ __all__ = [
     'ConnectionPool',
     'GasConfig',
     'RetryConfig',
-    'create_polygon_provider'
+    'BatchConfig',
+    'NonceManager',
+    'TransactionStore',
+    'GasOracle',
+    'TransactionSigner',
+    'create_polygon_provider',
+    'AsyncPolygonProvider',
+    'AsyncConnectionPool',
+    'create_async_polygon_provider'
 ]
\ No newline at end of file
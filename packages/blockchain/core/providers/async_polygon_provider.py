@@ -0,0 +1,673 @@
+"""
+Asyncio Polygon Mumbai Provider for Veria Platform
+Non-blocking counterpart of PolygonProvider built on AsyncWeb3 with persistent
+keep-alive HTTP sessions per RPC endpoint
+"""
+
+import json
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+from contextlib import asynccontextmanager
+
+import aiohttp
+from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3.middleware import async_geth_poa_middleware
+from web3.exceptions import TransactionNotFound
+from web3._utils.encoding import Web3JsonEncoder
+from web3._utils.request import async_make_post_request
+
+from .polygon_provider import (
+    PolygonProvider,
+    GasConfig,
+    RetryConfig,
+    BatchConfig,
+    BatchRejectedError,
+    GasOracle,
+    NonceManager,
+    TransactionSigner,
+    TransactionStore,
+    shared_transaction_signer
+)
+
+
+class AsyncConnectionPool:
+    """
+    Asyncio connection pool with one shared aiohttp session per RPC URL.
+    Concurrency is bounded by a semaphore rather than a fixed number of
+    clients, so hundreds of requests can be in flight over keep-alive sockets.
+    """
+    
+    def __init__(
+        self,
+        rpc_urls: List[str],
+        max_concurrency: int = 200,
+        connections_per_endpoint: int = 100,
+        request_timeout: float = 60.0
+    ):
+        self.rpc_urls = rpc_urls
+        self.max_concurrency = max_concurrency
+        self.connections_per_endpoint = connections_per_endpoint
+        self.request_timeout = request_timeout
+        self.clients: List[AsyncWeb3] = []
+        self.sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.in_flight = 0
+        self.logger = logging.getLogger(f"{__name__}.AsyncConnectionPool")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._init_lock: Optional[asyncio.Lock] = None
+        self._next_client = 0
+    
+    async def _initialize_pool(self):
+        """Create one AsyncWeb3 client and keep-alive session per RPC URL"""
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        
+        async with self._init_lock:
+            if self.clients:
+                return
+            
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            for rpc_url in self.rpc_urls:
+                try:
+                    session = aiohttp.ClientSession(
+                        connector=aiohttp.TCPConnector(
+                            limit=self.connections_per_endpoint,
+                            keepalive_timeout=60
+                        ),
+                        timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+                    )
+                    provider = AsyncHTTPProvider(rpc_url)
+                    await provider.cache_async_session(session)
+                    
+                    w3 = AsyncWeb3(provider)
+                    # Add PoA middleware for Polygon
+                    w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+                    
+                    self.sessions[rpc_url] = session
+                    self.clients.append(w3)
+                    self.logger.info(f"Opened async session for {rpc_url}")
+                except Exception as e:
+                    self.logger.error(f"Failed to create async client for {rpc_url}: {e}")
+    
+    @asynccontextmanager
+    async def get_connection(self, timeout: float = 10.0):
+        """Async context manager for getting a client from the pool"""
+        if not self.clients:
+            await self._initialize_pool()
+        if not self.clients:
+            raise ConnectionError("No available connections in pool")
+        
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError("No available connections in pool")
+        
+        self.in_flight += 1
+        try:
+            client = self.clients[self._next_client % len(self.clients)]
+            self._next_client += 1
+            yield client
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+    
+    async def close(self):
+        """Close all pooled sessions"""
+        for session in self.sessions.values():
+            if not session.closed:
+                await session.close()
+        self.sessions.clear()
+        self.clients.clear()
+
+
+class AsyncNonceManager(NonceManager):
+    """
+    NonceManager for the asyncio provider. Nonces are handed out locally;
+    the chain's pending count is awaited through the async pool when a
+    (re)sync is due.
+    """
+    
+    async def _pending_count(self, address: str) -> int:
+        async with self.connection_pool.get_connection() as w3:
+            return await w3.eth.get_transaction_count(address, 'pending')
+    
+    async def allocate(self, address: str) -> int:
+        """Reserve the next nonce for address"""
+        state = self._state(address)
+        if self._sync_due(state):
+            chain_nonce = await self._pending_count(address)
+            with state.lock:
+                # Another task may have synced while the count was fetched
+                if self._sync_due(state):
+                    self._reconcile(address, state, chain_nonce)
+        with state.lock:
+            return self._take(state)
+    
+    async def release(self, address: str, nonce: int, error: Optional[BaseException] = None):
+        """
+        Return a nonce whose send failed so it is reused, unless the node
+        reports it as already consumed, in which case resync instead
+        """
+        if not self.is_consumed(error):
+            super().release(address, nonce, error)
+            return
+        
+        state = self._state(address)
+        with state.lock:
+            state.in_flight.discard(nonce)
+        await self.resync(address)
+    
+    async def resync(self, address: str):
+        """Force reconciliation with the chain's pending nonce"""
+        chain_nonce = await self._pending_count(address)
+        state = self._state(address)
+        with state.lock:
+            self._reconcile(address, state, chain_nonce)
+
+
+class AsyncPolygonProvider:
+    """
+    Asyncio-native Polygon provider with the same surface as PolygonProvider.
+    All network I/O and retry backoff is awaited, so it can be shared by the
+    event monitor and FastAPI handlers without stalling the event loop.
+    """
+    
+    def __init__(
+        self,
+        rpc_urls: Optional[List[str]] = None,
+        max_concurrency: int = 200,
+        gas_config: Optional[GasConfig] = None,
+        retry_config: Optional[RetryConfig] = None,
+        batch_config: Optional[BatchConfig] = None,
+        signer: Optional[TransactionSigner] = None
+    ):
+        # Configure RPC endpoints with fallbacks
+        self.rpc_urls = rpc_urls or PolygonProvider._get_default_rpc_urls()
+        
+        # Initialize configurations
+        self.gas_config = gas_config or GasConfig()
+        self.retry_config = retry_config or RetryConfig()
+        self.batch_config = batch_config or BatchConfig()
+        
+        # Setup connection pool (sessions are opened lazily inside the loop)
+        self.connection_pool = AsyncConnectionPool(self.rpc_urls, max_concurrency)
+        
+        # Mumbai testnet configuration
+        self.chain_id = 80001
+        self.native_token = "MATIC"
+        
+        # Setup logging
+        self.logger = PolygonProvider._setup_logging()
+        
+        # Transaction monitoring
+        self.pending_transactions = TransactionStore()
+        
+        # Nonce allocation for concurrent sends from the same key
+        self.nonce_manager = AsyncNonceManager(self.connection_pool)
+        
+        # Per-block fee and gas limit cache
+        self.gas_oracle = GasOracle(self.gas_config)
+        
+        # Offline signing, shared with the sync provider unless one is given
+        self.signer = signer or shared_transaction_signer
+        self._gas_refresh_lock: Optional[asyncio.Lock] = None
+        
+        self.logger.info(
+            f"Initialized async Polygon Mumbai provider (max {max_concurrency} in flight)"
+        )
+    
+    async def __aenter__(self) -> 'AsyncPolygonProvider':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _retry_operation(self, operation, *args, **kwargs) -> Any:
+        """Await operation with exponential backoff retry logic"""
+        delay = self.retry_config.initial_delay
+        last_exception = None
+        
+        for attempt in range(self.retry_config.max_retries):
+            try:
+                return await operation(*args, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_exception = e
+                self.logger.warning(
+                    f"Operation failed (attempt {attempt + 1}/{self.retry_config.max_retries}): {e}"
+                )
+                
+                if attempt < self.retry_config.max_retries - 1:
+                    await asyncio.sleep(min(delay, self.retry_config.max_delay))
+                    delay *= self.retry_config.backoff_factor
+        
+        raise last_exception
+    
+    async def get_connection_status(self) -> Dict[str, Any]:
+        """Get comprehensive connection status"""
+        try:
+            async with self.connection_pool.get_connection() as w3:
+                block, gas_price = await asyncio.gather(
+                    w3.eth.get_block('latest'),
+                    w3.eth.gas_price
+                )
+                
+                return {
+                    'connected': True,
+                    'chain_id': self.chain_id,
+                    'block_number': block['number'],
+                    'block_timestamp': block['timestamp'],
+                    'gas_price_gwei': gas_price / 10**9,
+                    'endpoints': len(self.connection_pool.clients),
+                    'in_flight': self.connection_pool.in_flight
+                }
+        except Exception as e:
+            self.logger.error(f"Failed to get connection status: {e}")
+            return {
+                'connected': False,
+                'error': str(e)
+            }
+    
+    async def get_balance(self, address: str, block_number: str = 'latest') -> Dict[str, Any]:
+        """Get account balance with proper formatting"""
+        async def _get_balance():
+            async with self.connection_pool.get_connection() as w3:
+                checksum_address = w3.to_checksum_address(address)
+                balance_wei = await w3.eth.get_balance(checksum_address, block_number)
+                balance_ether = w3.from_wei(balance_wei, 'ether')
+                
+                return {
+                    'address': checksum_address,
+                    'balance_wei': balance_wei,
+                    'balance_ether': float(balance_ether),
+                    'balance_formatted': f"{balance_ether:.6f} {self.native_token}",
+                    'block': block_number
+                }
+        
+        return await self._retry_operation(_get_balance)
+    
+    async def estimate_gas_optimized(
+        self,
+        transaction: Dict[str, Any],
+        priority_level: str = 'standard'
+    ) -> Dict[str, Any]:
+        """
+        Estimate gas with optimization and MEV protection
+        Priority levels: 'slow', 'standard', 'fast', 'instant'
+        """
+        async def _estimate():
+            await self._refresh_gas_oracle()
+            base_fee, max_priority_fee, max_fee_per_gas = self.gas_oracle.quote(priority_level)
+            
+            # Estimate gas limit (memoized per contract call shape)
+            estimated_gas = self.gas_oracle.cached_gas(transaction)
+            if estimated_gas is None:
+                async with self.connection_pool.get_connection() as w3:
+                    estimated_gas = await w3.eth.estimate_gas(transaction)
+                self.gas_oracle.remember_gas(transaction, estimated_gas)
+            gas_limit = int(estimated_gas * self.gas_config.gas_limit_buffer)
+            
+            # Calculate costs
+            estimated_cost_wei = gas_limit * max_fee_per_gas
+            estimated_cost_ether = AsyncWeb3.from_wei(estimated_cost_wei, 'ether')
+            
+            return {
+                'gas_limit': gas_limit,
+                'max_priority_fee_per_gas': max_priority_fee,
+                'max_fee_per_gas': max_fee_per_gas,
+                'base_fee': base_fee,
+                'estimated_cost_wei': estimated_cost_wei,
+                'estimated_cost_ether': float(estimated_cost_ether),
+                'estimated_cost_formatted': f"{estimated_cost_ether:.6f} {self.native_token}",
+                'priority_level': priority_level
+            }
+        
+        return await self._retry_operation(_estimate)
+    
+    async def _refresh_gas_oracle(self):
+        """Fetch a fresh fee sample at most once per block"""
+        if not self.gas_oracle.is_stale():
+            return
+        if self._gas_refresh_lock is None:
+            self._gas_refresh_lock = asyncio.Lock()
+        
+        async with self._gas_refresh_lock:
+            if not self.gas_oracle.is_stale():
+                return
+            
+            async with self.connection_pool.get_connection() as w3:
+                try:
+                    fee_history = await w3.eth.fee_history(
+                        self.gas_config.fee_history_blocks,
+                        'latest',
+                        self.gas_oracle.reward_percentiles
+                    )
+                except Exception as e:
+                    self.logger.debug(f"eth_feeHistory unavailable, using eth_gasPrice: {e}")
+                    self.gas_oracle.update_from_gas_price(await w3.eth.gas_price)
+                    return
+            self.gas_oracle.update(fee_history)
+    
+    async def send_transaction(
+        self,
+        transaction: Dict[str, Any],
+        private_key: str,
+        wait_for_receipt: bool = True,
+        timeout: int = 120
+    ) -> Dict[str, Any]:
+        """
+        Send transaction with retry logic and monitoring
+        Nonces are assigned by the provider's AsyncNonceManager when not
+        supplied, so concurrent sends from the same key do not collide
+        """
+        account = self.signer.account(private_key)
+        
+        async def _send():
+            # Add chain ID
+            transaction['chainId'] = self.chain_id
+            
+            # Allocate nonce if not present
+            allocated_nonce = None
+            if 'nonce' not in transaction:
+                allocated_nonce = await self.nonce_manager.allocate(account.address)
+                transaction['nonce'] = allocated_nonce
+            
+            try:
+                # Estimate and add gas if not present
+                if 'gas' not in transaction:
+                    gas_estimate = await self.estimate_gas_optimized(transaction)
+                    transaction['gas'] = gas_estimate['gas_limit']
+                    transaction['maxPriorityFeePerGas'] = gas_estimate['max_priority_fee_per_gas']
+                    transaction['maxFeePerGas'] = gas_estimate['max_fee_per_gas']
+                
+                # Sign transaction (CPU only, no connection held)
+                signed_txn = self.signer.sign(transaction, private_key)
+                tx_hash = await self._send_raw(signed_txn)
+            except BaseException as e:
+                if allocated_nonce is not None:
+                    # Hand the nonce back (also on cancellation) and let a retry allocate afresh
+                    await self.nonce_manager.release(account.address, allocated_nonce, e)
+                    transaction.pop('nonce', None)
+                raise
+            
+            if allocated_nonce is not None:
+                self.nonce_manager.confirm(account.address, allocated_nonce)
+            return tx_hash.hex()
+        
+        tx_hash_hex = await self._retry_operation(_send)
+        self.logger.info(f"Transaction sent: {tx_hash_hex}")
+        
+        # Store in pending transactions
+        self.pending_transactions.add({
+            'hash': tx_hash_hex,
+            'timestamp': time.time(),
+            'status': 'pending',
+            'from': account.address,
+            'to': transaction.get('to'),
+            'value': transaction.get('value', 0)
+        })
+        
+        result = {
+            'transaction_hash': tx_hash_hex,
+            'from': account.address,
+            'status': 'pending'
+        }
+        
+        # Wait for receipt if requested (polls with asyncio.sleep)
+        if wait_for_receipt:
+            async with self.connection_pool.get_connection() as w3:
+                receipt = await w3.eth.wait_for_transaction_receipt(tx_hash_hex, timeout=timeout)
+            
+            status = 'success' if receipt['status'] == 1 else 'failed'
+            self.pending_transactions.update_status(
+                tx_hash_hex, status, block_number=receipt['blockNumber']
+            )
+            
+            result.update({
+                'status': status,
+                'block_number': receipt['blockNumber'],
+                'gas_used': receipt['gasUsed'],
+                'effective_gas_price': receipt.get('effectiveGasPrice', 0),
+                'receipt': dict(receipt)
+            })
+        
+        return result
+    
+    async def _send_raw(self, signed_txn):
+        """Broadcast a signed payload; a node that already holds it counts as sent"""
+        try:
+            async with self.connection_pool.get_connection() as w3:
+                return await w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception as e:
+            if NonceManager.is_already_broadcast(e):
+                self.logger.info(f"Transaction {signed_txn.hash.hex()} already known to the node")
+                return signed_txn.hash
+            raise
+    
+    async def monitor_transaction(self, tx_hash: str) -> Dict[str, Any]:
+        """Monitor transaction status and return detailed information"""
+        async def _monitor():
+            async with self.connection_pool.get_connection() as w3:
+                try:
+                    tx = await w3.eth.get_transaction(tx_hash)
+                except TransactionNotFound:
+                    return {
+                        'status': 'not_found',
+                        'transaction_hash': tx_hash,
+                        'error': 'Transaction not found'
+                    }
+                
+                try:
+                    receipt = await w3.eth.get_transaction_receipt(tx_hash)
+                except TransactionNotFound:
+                    receipt = None
+                
+                if receipt:
+                    current_block = await w3.eth.block_number
+                    return {
+                        'status': 'confirmed' if receipt['status'] == 1 else 'failed',
+                        'transaction_hash': tx_hash,
+                        'block_number': receipt['blockNumber'],
+                        'confirmations': current_block - receipt['blockNumber'],
+                        'gas_used': receipt['gasUsed'],
+                        'effective_gas_price': receipt.get('effectiveGasPrice', 0),
+                        'from': tx['from'],
+                        'to': tx['to'],
+                        'value': tx['value'],
+                        'logs': receipt.get('logs', [])
+                    }
+                
+                return {
+                    'status': 'pending',
+                    'transaction_hash': tx_hash,
+                    'from': tx['from'],
+                    'to': tx['to'],
+                    'value': tx['value'],
+                    'gas_price': tx.get('gasPrice', tx.get('maxFeePerGas', 0))
+                }
+        
+        return await self._retry_operation(_monitor)
+    
+    def get_pending_transactions(
+        self,
+        status: Optional[str] = None,
+        sender: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get transactions being monitored, optionally filtered by status or sender"""
+        return self.pending_transactions.values(status=status, sender=sender)
+    
+    async def batch_request(
+        self,
+        requests: List[Tuple[str, List[Any]]],
+        max_batch_size: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Execute multiple RPC requests as JSON-RPC 2.0 batch arrays
+        Accepts the same (method_name, params) tuples as PolygonProvider.batch_request;
+        chunks are sent concurrently.
+        """
+        results: List[Any] = [None] * len(requests)
+        encoded: List[Tuple[int, str, List[Any]]] = []
+        
+        for index, (method, params) in enumerate(requests):
+            try:
+                call = PolygonProvider._encode_batch_call(method, list(params or []))
+            except Exception as e:
+                results[index] = {'error': str(e)}
+                continue
+            
+            if call is None:
+                results[index] = {'error': f'Method {method} not found'}
+            else:
+                encoded.append((index, call[0], call[1]))
+        
+        chunk_size = max(1, max_batch_size or self.batch_config.max_batch_size)
+        chunks = [encoded[i:i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+        for chunk_results in await asyncio.gather(
+            *(self._execute_batch_chunk(chunk) for chunk in chunks)
+        ):
+            for index, value in chunk_results.items():
+                results[index] = value
+        
+        return results
+    
+    async def _execute_batch_chunk(
+        self,
+        chunk: List[Tuple[int, str, List[Any]]]
+    ) -> Dict[int, Any]:
+        """Send one chunk as a batch array, falling back to concurrent single calls"""
+        async def _attempt():
+            try:
+                return await self._send_batch(chunk)
+            except BatchRejectedError as e:
+                return e
+        
+        try:
+            outcome = await self._retry_operation(_attempt)
+        except Exception as e:
+            return {index: {'error': str(e)} for index, _, _ in chunk}
+        
+        if isinstance(outcome, BatchRejectedError):
+            self.logger.warning(f"Batch rejected, using concurrent single calls: {outcome}")
+            return await self._execute_parallel_calls(chunk)
+        
+        return outcome
+    
+    async def _send_batch(self, chunk: List[Tuple[int, str, List[Any]]]) -> Dict[int, Any]:
+        """POST a single JSON-RPC batch array and map responses back by id"""
+        async with self.connection_pool.get_connection() as w3:
+            endpoint = str(w3.provider.endpoint_uri)
+            payload = [
+                {'jsonrpc': '2.0', 'id': index, 'method': rpc_method, 'params': params}
+                for index, rpc_method, params in chunk
+            ]
+            
+            try:
+                raw_response = await async_make_post_request(
+                    endpoint,
+                    json.dumps(payload, cls=Web3JsonEncoder).encode('utf-8'),
+                    **w3.provider.get_request_kwargs()
+                )
+            except aiohttp.ClientResponseError as e:
+                if e.status in (400, 405, 413, 501):
+                    raise BatchRejectedError(f"{endpoint} returned HTTP {e.status}") from e
+                raise
+            
+            responses = json.loads(raw_response)
+            if not isinstance(responses, list):
+                error = responses.get('error') if isinstance(responses, dict) else responses
+                raise BatchRejectedError(f"{endpoint} rejected batch: {error}")
+            
+            by_id = {response.get('id'): response for response in responses}
+            return {
+                index: PolygonProvider._format_rpc_response(w3, rpc_method, by_id.get(index))
+                for index, rpc_method, _ in chunk
+            }
+    
+    async def _execute_parallel_calls(
+        self,
+        chunk: List[Tuple[int, str, List[Any]]]
+    ) -> Dict[int, Any]:
+        """Issue each call of a rejected batch concurrently"""
+        async def _single(index: int, rpc_method: str, params: List[Any]) -> Tuple[int, Any]:
+            try:
+                async with self.connection_pool.get_connection() as w3:
+                    response = await w3.provider.make_request(rpc_method, params)
+                    return index, PolygonProvider._format_rpc_response(w3, rpc_method, response)
+            except Exception as e:
+                return index, {'error': str(e)}
+        
+        return dict(await asyncio.gather(*(_single(*call) for call in chunk)))
+    
+    async def health_check(self) -> Dict[str, Any]:
+        """Comprehensive health check for monitoring"""
+        health = {
+            'timestamp': time.time(),
+            'provider': 'polygon_mumbai_async',
+            'checks': {}
+        }
+        
+        # Check connection
+        try:
+            status = await self.get_connection_status()
+            health['checks']['connection'] = {
+                'status': 'healthy' if status['connected'] else 'unhealthy',
+                'details': status
+            }
+        except Exception as e:
+            health['checks']['connection'] = {
+                'status': 'unhealthy',
+                'error': str(e)
+            }
+        
+        # Check pool status
+        health['checks']['pool'] = {
+            'status': 'healthy',
+            'endpoints': len(self.connection_pool.clients),
+            'max_concurrency': self.connection_pool.max_concurrency,
+            'in_flight': self.connection_pool.in_flight
+        }
+        
+        # Check pending transactions
+        health['checks']['transactions'] = {
+            'status': 'healthy',
+            'pending_count': self.pending_transactions.count('pending'),
+            'total_monitored': len(self.pending_transactions)
+        }
+        
+        # Overall health
+        all_healthy = all(
+            check.get('status') == 'healthy'
+            for check in health['checks'].values()
+        )
+        health['status'] = 'healthy' if all_healthy else 'degraded'
+        
+        return health
+    
+    async def close(self):
+        """Cleanup sessions and resources"""
+        self.logger.info("Closing async Polygon provider sessions")
+        await self.connection_pool.close()
+        # The signer is shared (or owned by the caller) and stays open
+        self.pending_transactions.close()
+        self.logger.info("Async Polygon provider closed")
+
+
+# Factory function for easy instantiation
+def create_async_polygon_provider(
+    rpc_urls: Optional[List[str]] = None,
+    **kwargs
+) -> AsyncPolygonProvider:
+    """
+    Create a configured asyncio Polygon Mumbai provider instance
+    
+    Args:
+        rpc_urls: Optional list of RPC URLs
+        **kwargs: Additional configuration options
+    
+    Returns:
+        Configured AsyncPolygonProvider instance
+    """
+    return AsyncPolygonProvider(rpc_urls=rpc_urls, **kwargs)
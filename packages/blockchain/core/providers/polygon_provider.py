@@ -4,19 +4,33 @@ Implements institutional-grade Web3.py connection with pooling, retry logic, and
 """
 
 import os
+import json
 import time
+import heapq
+import sqlite3
 import logging
-from typing import Optional, Dict, Any, List, Tuple
+import multiprocessing
+from typing import Optional, Dict, Any, List, Tuple, Set, Deque, Callable
 from contextlib import contextmanager
-from threading import Lock, RLock
-from queue import Queue, Empty
-from dataclasses import dataclass
+from concurrent.futures import (
+    ThreadPoolExecutor, ProcessPoolExecutor, Future, TimeoutError as FutureTimeoutError
+)
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque, defaultdict, OrderedDict
+from threading import Lock, RLock, Condition, Event, Thread
+from dataclasses import dataclass, field
 from decimal import Decimal
 
+from requests.exceptions import HTTPError
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
-from web3.exceptions import BlockNotFound, TransactionNotFound
+from web3.exceptions import BlockNotFound, TransactionNotFound, TimeExhausted
+from web3._utils.encoding import Web3JsonEncoder
+from web3._utils.method_formatters import get_request_formatters, get_result_formatters
+from web3._utils.request import make_post_request
 from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
 from eth_typing import HexStr, ChecksumAddress
 
 
@@ -27,6 +41,10 @@ class GasConfig:
     max_fee_per_gas_gwei: float = 50   # Max total fee in Gwei
     gas_limit_buffer: float = 1.2      # Buffer for gas limit estimation
     mev_protection_buffer: float = 1.1  # MEV protection buffer
+    fee_history_blocks: int = 5        # Blocks sampled per eth_feeHistory call
+    fee_cache_ttl: float = 2.0         # Seconds a fee sample is served (~1 Polygon block)
+    gas_limit_cache_size: int = 1024   # Memoized (sender, contract, selector, shape) gas limits
+    preflight_cached_gas: bool = False  # eth_call memoized sends so reverts surface before signing
 
 
 @dataclass
@@ -38,47 +56,1267 @@ class RetryConfig:
     max_delay: float = 30.0
 
 
+@dataclass
+class BatchConfig:
+    """JSON-RPC batching configuration for bulk reads"""
+    max_batch_size: int = 100          # Calls per JSON-RPC batch array
+    fallback_concurrency: int = 8      # Parallel single calls when batching is rejected
+
+
+# Web3 ``eth`` attribute names mapped to (JSON-RPC method, arity including
+# the trailing block identifier). Calls given with one parameter fewer than
+# the arity default the block identifier to 'latest'.
+BATCH_RPC_METHODS: Dict[str, Tuple[str, Optional[int]]] = {
+    'block_number': ('eth_blockNumber', None),
+    'gas_price': ('eth_gasPrice', None),
+    'chain_id': ('eth_chainId', None),
+    'max_priority_fee': ('eth_maxPriorityFeePerGas', None),
+    'get_balance': ('eth_getBalance', 2),
+    'get_transaction_count': ('eth_getTransactionCount', 2),
+    'get_code': ('eth_getCode', 2),
+    'get_storage_at': ('eth_getStorageAt', 3),
+    'call': ('eth_call', 2),
+    'estimate_gas': ('eth_estimateGas', None),
+    'get_transaction': ('eth_getTransactionByHash', None),
+    'get_transaction_receipt': ('eth_getTransactionReceipt', None),
+    'get_logs': ('eth_getLogs', None),
+    'fee_history': ('eth_feeHistory', None),
+}
+
+# Raw JSON-RPC namespaces accepted as-is by batch_request
+BATCH_RPC_NAMESPACES = ('eth_', 'net_', 'web3_')
+
+
+class BatchRejectedError(Exception):
+    """Raised when an RPC endpoint refuses JSON-RPC batch arrays"""
+
+
+@dataclass
+class PooledConnection:
+    """Web3 connection tagged with the RPC endpoint it talks to"""
+    w3: Web3
+    endpoint: str
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+
+
+class EndpointHealth:
+    """Rolling latency and error statistics for a single RPC endpoint"""
+    
+    def __init__(self, url: str, window: int = 200, ewma_alpha: float = 0.2, penalty_latency: float = 60.0):
+        """
+        Args:
+            url: RPC endpoint
+            window: Requests kept for percentiles and the error rate
+            ewma_alpha: Weight of the newest latency sample
+            penalty_latency: Latency assumed for an endpoint that has failed without ever succeeding
+        """
+        self.url = url
+        self.penalty_latency = penalty_latency
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.ewma_alpha = ewma_alpha
+        self.ewma_latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.total_requests = 0
+        self.total_failures = 0
+        self.ejected = False
+        self.ejected_at: Optional[float] = None
+    
+    def record(self, latency: float, success: bool):
+        """Record the outcome of one request against this endpoint"""
+        self.total_requests += 1
+        self.outcomes.append(success)
+        
+        if success:
+            self.latencies.append(latency)
+            self.consecutive_failures = 0
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency += self.ewma_alpha * (latency - self.ewma_latency)
+        else:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+    
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile (0-100) over the rolling window"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+    
+    @property
+    def score(self) -> float:
+        """Lower is better; untried endpoints score 0 so they get probed"""
+        if self.ewma_latency is not None:
+            latency = self.ewma_latency
+        elif self.outcomes:
+            # Only failures so far: rank behind every endpoint that has answered
+            latency = self.penalty_latency
+        else:
+            latency = 0.0
+        return latency * (1 + 10 * self.error_rate)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        p50 = self.percentile(50)
+        p99 = self.percentile(99)
+        return {
+            'url': self.url,
+            'status': 'ejected' if self.ejected else 'active',
+            'p50_latency_ms': round(p50 * 1000, 2) if p50 is not None else None,
+            'p99_latency_ms': round(p99 * 1000, 2) if p99 is not None else None,
+            'error_rate': round(self.error_rate, 4),
+            'consecutive_failures': self.consecutive_failures,
+            'total_requests': self.total_requests,
+            'total_failures': self.total_failures,
+            'ejected_at': self.ejected_at
+        }
+
+
 class ConnectionPool:
-    """Thread-safe Web3 connection pool for concurrent operations"""
+    """
+    Thread-safe, elastic Web3 connection pool for concurrent operations.
+    Connections are tagged with their endpoint; checkouts go to the healthiest
+    endpoint and endpoints that keep failing are ejected until a background
+    probe succeeds again. The pool starts with min_size connections, grows on
+    demand up to pool_size and reaps connections idle longer than idle_timeout.
+    """
+    
+    # HTTP timeout per RPC request (also the score penalty of never-answering endpoints)
+    REQUEST_TIMEOUT = 60.0
     
-    def __init__(self, rpc_urls: List[str], pool_size: int = 5):
+    def __init__(
+        self,
+        rpc_urls: List[str],
+        pool_size: int = 5,
+        min_size: int = 1,
+        idle_timeout: float = 300.0,
+        eject_after_failures: int = 3,
+        probe_interval: float = 15.0,
+        latency_window: int = 200
+    ):
         self.rpc_urls = rpc_urls
         self.pool_size = pool_size
-        self.pool: Queue[Web3] = Queue(maxsize=pool_size)
+        self.min_size = max(0, min(min_size, pool_size))
+        self.idle_timeout = idle_timeout
+        self.eject_after_failures = eject_after_failures
+        self.probe_interval = probe_interval
         self.lock = RLock()
+        self.available = Condition(self.lock)
+        self.idle: Dict[str, Deque[PooledConnection]] = {url: deque() for url in rpc_urls}
+        self.total_connections = 0
+        self.endpoint_health: Dict[str, EndpointHealth] = {
+            url: EndpointHealth(url, window=latency_window, penalty_latency=self.REQUEST_TIMEOUT)
+            for url in rpc_urls
+        }
+        
+        # Checkout wait metrics
+        self.wait_times: Deque[float] = deque(maxlen=latency_window)
+        self.waiting = 0
+        self.total_checkouts = 0
+        self.total_waits = 0
+        self.total_timeouts = 0
+        self.connections_created = 0
+        self.connections_reaped = 0
+        
         self.logger = logging.getLogger(f"{__name__}.ConnectionPool")
+        self._closed = Event()
+        self._probe_thread: Optional[Thread] = None
+        self._reaper_thread: Optional[Thread] = None
         self._initialize_pool()
     
+    def _create_connection(self, rpc_url: str) -> PooledConnection:
+        """Create a Web3 instance whose requests feed the endpoint's health stats"""
+        w3 = Web3(Web3.HTTPProvider(
+            rpc_url,
+            request_kwargs={'timeout': self.REQUEST_TIMEOUT}
+        ))
+        # Add PoA middleware for Polygon
+        w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        w3.middleware_onion.add(self._health_middleware(rpc_url), name='endpoint_health')
+        return PooledConnection(w3=w3, endpoint=rpc_url)
+    
+    def _health_middleware(self, rpc_url: str):
+        """Web3 middleware timing every RPC round trip against rpc_url"""
+        def middleware(make_request, w3):
+            def record_request(method, params):
+                started = time.monotonic()
+                try:
+                    response = make_request(method, params)
+                except Exception:
+                    self.record_result(rpc_url, time.monotonic() - started, False)
+                    raise
+                # JSON-RPC error objects (reverts etc.) still mean the endpoint answered
+                self.record_result(rpc_url, time.monotonic() - started, True)
+                return response
+            return record_request
+        return middleware
+    
     def _initialize_pool(self):
-        """Initialize the connection pool with Web3 instances"""
-        for i in range(self.pool_size):
-            rpc_url = self.rpc_urls[i % len(self.rpc_urls)]
+        """Create the minimum number of connections (no network round trips)"""
+        with self.lock:
+            for i in range(self.min_size):
+                rpc_url = self.rpc_urls[i % len(self.rpc_urls)]
+                try:
+                    self.idle[rpc_url].append(self._new_connection(rpc_url))
+                except Exception as e:
+                    self.logger.error(f"Failed to create connection {i+1}: {e}")
+    
+    def _new_connection(self, rpc_url: str) -> PooledConnection:
+        """Create a connection and count it against the pool capacity"""
+        connection = self._create_connection(rpc_url)
+        self.total_connections += 1
+        self.connections_created += 1
+        self.logger.debug(
+            f"Opened connection to {rpc_url} ({self.total_connections}/{self.pool_size})"
+        )
+        return connection
+    
+    def record_result(self, rpc_url: str, latency: float, success: bool):
+        """Record a request outcome and eject the endpoint if it keeps failing"""
+        with self.lock:
+            health = self.endpoint_health.get(rpc_url)
+            if health is None:
+                return
+            health.record(latency, success)
+            
+            if (not health.ejected
+                    and health.consecutive_failures >= self.eject_after_failures
+                    and self._active_endpoint_count() > 1):
+                health.ejected = True
+                health.ejected_at = time.time()
+                # Free the capacity held by its idle connections for healthy endpoints
+                self.total_connections -= len(self.idle[rpc_url])
+                self.idle[rpc_url].clear()
+                self.logger.warning(
+                    f"Ejected endpoint {rpc_url} after {health.consecutive_failures} failures"
+                )
+                self._ensure_prober()
+    
+    def _active_endpoint_count(self) -> int:
+        return sum(1 for health in self.endpoint_health.values() if not health.ejected)
+    
+    def _select_connection(self) -> Optional[PooledConnection]:
+        """
+        Take a connection for the healthiest endpoint: reuse an idle one,
+        otherwise open a new one while under capacity, otherwise borrow an
+        idle connection from the next best endpoint
+        """
+        active = [url for url, h in self.endpoint_health.items() if not h.ejected]
+        ranked = sorted(active, key=lambda url: self.endpoint_health[url].score)
+        
+        if ranked:
+            best = ranked[0]
+            if self.idle[best]:
+                return self.idle[best].popleft()
+            if self.total_connections < self.pool_size:
+                return self._new_connection(best)
+            for url in ranked[1:]:
+                if self.idle[url]:
+                    return self.idle[url].popleft()
+        
+        # Fall back to ejected endpoints rather than starving callers
+        for url, idle in self.idle.items():
+            if idle:
+                return idle.popleft()
+        if not ranked and self.total_connections < self.pool_size and self.rpc_urls:
+            fallback = min(self.rpc_urls, key=lambda url: self.endpoint_health[url].score)
+            return self._new_connection(fallback)
+        return None
+    
+    def _checkout(self, timeout: float) -> PooledConnection:
+        deadline = time.monotonic() + timeout
+        started = None
+        with self.available:
+            self.total_checkouts += 1
             try:
-                w3 = Web3(Web3.HTTPProvider(
-                    rpc_url,
-                    request_kwargs={'timeout': 60}
-                ))
-                # Add PoA middleware for Polygon
-                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-                
-                if w3.is_connected():
-                    self.pool.put(w3)
-                    self.logger.info(f"Added connection {i+1}/{self.pool_size} to pool")
-            except Exception as e:
-                self.logger.error(f"Failed to create connection {i+1}: {e}")
+                while True:
+                    connection = self._select_connection()
+                    if connection is not None:
+                        return connection
+                    
+                    if started is None:
+                        started = time.monotonic()
+                        self.total_waits += 1
+                        self.waiting += 1
+                    
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.total_timeouts += 1
+                        raise ConnectionError("No available connections in pool")
+                    self.available.wait(remaining)
+            finally:
+                if started is not None:
+                    self.waiting -= 1
+                    self.wait_times.append(time.monotonic() - started)
+    
+    def _checkin(self, connection: PooledConnection):
+        with self.available:
+            connection.last_used = time.time()
+            self.idle[connection.endpoint].append(connection)
+            self.available.notify()
+            if self.total_connections > self.min_size:
+                self._ensure_reaper()
+    
+    def reap_idle_connections(self) -> int:
+        """Close connections idle longer than idle_timeout, keeping min_size"""
+        cutoff = time.time() - self.idle_timeout
+        reaped = 0
+        with self.lock:
+            for idle in self.idle.values():
+                # Deques are in check-in order, so the oldest idle connections lead
+                while (idle and idle[0].last_used < cutoff
+                        and self.total_connections > self.min_size):
+                    idle.popleft()
+                    self.total_connections -= 1
+                    reaped += 1
+            self.connections_reaped += reaped
+        
+        if reaped:
+            self.logger.debug(f"Reaped {reaped} idle connections")
+        return reaped
+    
+    def _ensure_reaper(self):
+        """Start the idle reaper thread if it is not running"""
+        if self._reaper_thread and self._reaper_thread.is_alive():
+            return
+        self._reaper_thread = Thread(target=self._reap_loop, daemon=True)
+        self._reaper_thread.start()
+    
+    def _reap_loop(self):
+        """Reap idle connections until the pool is back at its minimum size"""
+        interval = max(1.0, self.idle_timeout / 2)
+        while not self._closed.wait(interval):
+            self.reap_idle_connections()
+            with self.lock:
+                if self.total_connections <= self.min_size:
+                    return
     
     @contextmanager
     def get_connection(self, timeout: float = 10.0):
         """Context manager for getting a connection from the pool"""
-        connection = None
+        connection = self._checkout(timeout)
         try:
-            connection = self.pool.get(timeout=timeout)
-            yield connection
-        except Empty:
-            raise ConnectionError("No available connections in pool")
+            yield connection.w3
         finally:
-            if connection:
-                self.pool.put(connection)
+            self._checkin(connection)
+    
+    def available_connections(self) -> int:
+        """Number of idle connections ready for checkout"""
+        with self.lock:
+            return sum(len(idle) for idle in self.idle.values())
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Capacity, growth and checkout wait-time metrics"""
+        with self.lock:
+            idle = sum(len(connections) for connections in self.idle.values())
+            waits = sorted(self.wait_times)
+            
+            def wait_percentile(q: float) -> Optional[float]:
+                if not waits:
+                    return None
+                index = min(len(waits) - 1, int(round(q / 100 * (len(waits) - 1))))
+                return round(waits[index] * 1000, 2)
+            
+            return {
+                'min_size': self.min_size,
+                'max_size': self.pool_size,
+                'total_connections': self.total_connections,
+                'idle_connections': idle,
+                'in_use_connections': self.total_connections - idle,
+                'waiting_callers': self.waiting,
+                'total_checkouts': self.total_checkouts,
+                'total_waits': self.total_waits,
+                'total_timeouts': self.total_timeouts,
+                'wait_p50_ms': wait_percentile(50),
+                'wait_p99_ms': wait_percentile(99),
+                'wait_max_ms': round(waits[-1] * 1000, 2) if waits else None,
+                'connections_created': self.connections_created,
+                'connections_reaped': self.connections_reaped
+            }
+    
+    def get_endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint latency percentiles, error rates and ejection state"""
+        with self.lock:
+            stats = []
+            for url, health in self.endpoint_health.items():
+                entry = health.to_dict()
+                entry['idle_connections'] = len(self.idle[url])
+                stats.append(entry)
+            return stats
+    
+    def _ensure_prober(self):
+        """Start the background re-probe thread if it is not running"""
+        if self._probe_thread and self._probe_thread.is_alive():
+            return
+        self._probe_thread = Thread(target=self._probe_loop, daemon=True)
+        self._probe_thread.start()
+    
+    def _probe_loop(self):
+        """Periodically re-probe ejected endpoints and reinstate recovered ones"""
+        while not self._closed.wait(self.probe_interval):
+            with self.lock:
+                ejected = [url for url, h in self.endpoint_health.items() if h.ejected]
+            if not ejected:
+                return
+            
+            for rpc_url in ejected:
+                self.probe_endpoint(rpc_url)
+    
+    def probe_endpoint(self, rpc_url: str) -> bool:
+        """Issue a lightweight request to rpc_url; reinstate it on success"""
+        try:
+            probe = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 10}))
+            started = time.monotonic()
+            probe.eth.block_number
+            latency = time.monotonic() - started
+        except Exception as e:
+            self.logger.debug(f"Probe of ejected endpoint {rpc_url} failed: {e}")
+            return False
+        
+        with self.available:
+            health = self.endpoint_health[rpc_url]
+            health.ejected = False
+            health.ejected_at = None
+            health.record(latency, True)
+            self.available.notify_all()
+        
+        self.logger.info(f"Reinstated endpoint {rpc_url} after successful probe")
+        return True
+    
+    def close(self):
+        """Stop background threads and drop idle connections"""
+        self._closed.set()
+        with self.lock:
+            for idle in self.idle.values():
+                self.total_connections -= len(idle)
+                idle.clear()
+
+
+@dataclass
+class AccountNonceState:
+    """Nonce bookkeeping for a single sending account"""
+    next_nonce: int = 0
+    seeded: bool = False
+    last_sync: float = 0.0
+    in_flight: Set[int] = field(default_factory=set)   # Allocated, not yet broadcast
+    reclaimed: List[int] = field(default_factory=list)  # Min-heap of reusable nonces
+    lock: Lock = field(default_factory=Lock)
+
+
+class NonceManager:
+    """
+    Per-account nonce allocator for concurrent transaction submission.
+    Seeds from the chain's pending transaction count, hands out nonces
+    atomically across threads and reuses nonces released by failed sends.
+    Nonces that were broadcast are never handed out again, even if the node
+    stops reporting them; such gaps are logged on resync.
+    """
+    
+    # Node errors meaning the nonce was used (or the local view is off) and must not be reused
+    CONSUMED_NONCE_ERRORS = (
+        'nonce too low', 'nonce too high',
+        'replacement transaction underpriced', 'transaction underpriced: replacement',
+        'nonce has already been used', 'invalid nonce', 'oldnonce'
+    )
+    
+    # Node errors meaning this exact signed transaction is already in its pool
+    ALREADY_BROADCAST_ERRORS = ('already known', 'known transaction', 'already imported')
+    
+    def __init__(self, connection_pool: ConnectionPool, resync_interval: float = 30.0):
+        self.connection_pool = connection_pool
+        self.resync_interval = resync_interval
+        self.accounts: Dict[str, AccountNonceState] = {}
+        self.lock = Lock()
+        self.logger = logging.getLogger(f"{__name__}.NonceManager")
+    
+    def _state(self, address: str) -> AccountNonceState:
+        with self.lock:
+            state = self.accounts.get(address)
+            if state is None:
+                state = self.accounts[address] = AccountNonceState()
+            return state
+    
+    def _pending_count(self, address: str) -> int:
+        with self.connection_pool.get_connection() as w3:
+            return w3.eth.get_transaction_count(address, 'pending')
+    
+    def _sync(self, address: str, state: AccountNonceState):
+        """Reconcile local state with the chain (caller holds state.lock)"""
+        self._reconcile(address, state, self._pending_count(address))
+    
+    def _reconcile(self, address: str, state: AccountNonceState, chain_nonce: int):
+        """Apply the chain's pending count to local state (caller holds state.lock)"""
+        state.last_sync = time.time()
+        
+        if not state.seeded:
+            state.next_nonce = chain_nonce
+            state.seeded = True
+            return
+        
+        if chain_nonce > state.next_nonce:
+            # Transactions were sent for this key outside the manager
+            state.next_nonce = chain_nonce
+        
+        # Only nonces released by this manager are reused; broadcast ones the node
+        # does not report (dropped, or a lagging node) could still be mined
+        reclaimed = set(state.reclaimed)
+        gaps = [
+            nonce for nonce in range(chain_nonce, state.next_nonce)
+            if nonce not in state.in_flight and nonce not in reclaimed
+        ]
+        if gaps:
+            self.logger.warning(f"Broadcast nonces {gaps} for {address} are not pending on the node")
+        
+        state.reclaimed = [nonce for nonce in reclaimed if nonce >= chain_nonce]
+        heapq.heapify(state.reclaimed)
+    
+    def _sync_due(self, state: AccountNonceState) -> bool:
+        idle_for = time.time() - state.last_sync
+        return not state.seeded or (not state.in_flight and idle_for > self.resync_interval)
+    
+    @staticmethod
+    def _take(state: AccountNonceState) -> int:
+        """Hand out the lowest free nonce (caller holds state.lock)"""
+        if state.reclaimed:
+            nonce = heapq.heappop(state.reclaimed)
+        else:
+            nonce = state.next_nonce
+            state.next_nonce += 1
+        
+        state.in_flight.add(nonce)
+        return nonce
+    
+    def allocate(self, address: str) -> int:
+        """Atomically reserve the next nonce for address"""
+        state = self._state(address)
+        with state.lock:
+            if self._sync_due(state):
+                self._sync(address, state)
+            return self._take(state)
+    
+    def confirm(self, address: str, nonce: int):
+        """Mark nonce as broadcast; the node's pending count now covers it"""
+        state = self._state(address)
+        with state.lock:
+            state.in_flight.discard(nonce)
+    
+    def release(self, address: str, nonce: int, error: Optional[Exception] = None):
+        """
+        Return a nonce whose send failed so it is reused, unless the node
+        reports it as already consumed, in which case resync instead
+        """
+        state = self._state(address)
+        with state.lock:
+            state.in_flight.discard(nonce)
+            
+            if self.is_consumed(error):
+                self._sync(address, state)
+                return
+            
+            if nonce == state.next_nonce - 1:
+                state.next_nonce -= 1
+                # Fold any reclaimed nonces that now sit at the top
+                while state.reclaimed and max(state.reclaimed) == state.next_nonce - 1:
+                    state.reclaimed.remove(state.next_nonce - 1)
+                    state.next_nonce -= 1
+                heapq.heapify(state.reclaimed)
+            elif nonce not in state.reclaimed:
+                heapq.heappush(state.reclaimed, nonce)
+    
+    @classmethod
+    def is_consumed(cls, error: Optional[Exception]) -> bool:
+        """Whether a send error means the nonce must not be handed out again"""
+        message = str(error).lower() if error else ''
+        return any(marker in message for marker in cls.CONSUMED_NONCE_ERRORS)
+    
+    @classmethod
+    def is_already_broadcast(cls, error: Exception) -> bool:
+        """Whether a send error means the node already holds this exact transaction"""
+        message = str(error).lower()
+        return any(marker in message for marker in cls.ALREADY_BROADCAST_ERRORS)
+    
+    def resync(self, address: str):
+        """Force reconciliation with the chain's pending nonce"""
+        state = self._state(address)
+        with state.lock:
+            self._sync(address, state)
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Allocator state per tracked account"""
+        with self.lock:
+            accounts = dict(self.accounts)
+        return {
+            address: {
+                'next_nonce': state.next_nonce,
+                'in_flight': len(state.in_flight),
+                'reclaimed': sorted(state.reclaimed)
+            }
+            for address, state in accounts.items()
+        }
+
+
+class TransactionStore:
+    """
+    Bounded store of monitored transactions indexed by status and sender.
+    Finalized entries are evicted by age and count; pending counts are O(1).
+    With persist_path set, records are written through to SQLite so in-flight
+    transactions survive a restart.
+    """
+    
+    FINAL_STATUSES = frozenset({'success', 'failed', 'dropped'})
+    
+    def __init__(
+        self,
+        max_finalized: int = 10000,
+        finalized_ttl: float = 3600.0,
+        persist_path: Optional[str] = None
+    ):
+        self.max_finalized = max_finalized
+        self.finalized_ttl = finalized_ttl
+        self.persist_path = persist_path
+        self.lock = RLock()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.by_status: Dict[str, Set[str]] = defaultdict(set)
+        self.by_sender: Dict[str, Set[str]] = defaultdict(set)
+        self.finalized: 'OrderedDict[str, float]' = OrderedDict()  # hash -> finalized_at
+        self.evicted = 0
+        self.logger = logging.getLogger(f"{__name__}.TransactionStore")
+        self._db: Optional[sqlite3.Connection] = None
+        
+        if persist_path:
+            self._open_database(persist_path)
+    
+    def _open_database(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS monitored_transactions ('
+            ' hash TEXT PRIMARY KEY, sender TEXT, status TEXT NOT NULL,'
+            ' timestamp REAL NOT NULL, record TEXT NOT NULL)'
+        )
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS idx_monitored_transactions_status'
+            ' ON monitored_transactions (status)'
+        )
+        
+        # Finalized rows are history only; reload what is still in flight
+        rows = self._db.execute(
+            'SELECT record FROM monitored_transactions WHERE status NOT IN (?, ?, ?)',
+            tuple(self.FINAL_STATUSES)
+        ).fetchall()
+        for (record,) in rows:
+            self._index(json.loads(record))
+        self._db.execute(
+            'DELETE FROM monitored_transactions WHERE status IN (?, ?, ?)',
+            tuple(self.FINAL_STATUSES)
+        )
+        
+        if rows:
+            self.logger.info(f"Restored {len(rows)} in-flight transactions from {path}")
+    
+    def _index(self, record: Dict[str, Any]):
+        tx_hash = record['hash']
+        self.records[tx_hash] = record
+        self.by_status[record['status']].add(tx_hash)
+        if record.get('from'):
+            self.by_sender[record['from']].add(tx_hash)
+        if record['status'] in self.FINAL_STATUSES:
+            self.finalized[tx_hash] = record.get('finalized_at', time.time())
+    
+    def _unindex(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        record = self.records.pop(tx_hash, None)
+        if record is None:
+            return None
+        self.by_status[record['status']].discard(tx_hash)
+        sender = record.get('from')
+        if sender:
+            self.by_sender[sender].discard(tx_hash)
+            if not self.by_sender[sender]:
+                del self.by_sender[sender]
+        self.finalized.pop(tx_hash, None)
+        return record
+    
+    def _persist(self, record: Dict[str, Any]):
+        if self._db is None:
+            return
+        self._db.execute(
+            'INSERT OR REPLACE INTO monitored_transactions (hash, sender, status, timestamp, record)'
+            ' VALUES (?, ?, ?, ?, ?)',
+            (record['hash'], record.get('from'), record['status'], record['timestamp'],
+             json.dumps(record, default=str))
+        )
+    
+    def _evict(self):
+        """Drop finalized entries beyond the count limit or older than the TTL"""
+        cutoff = time.time() - self.finalized_ttl
+        evicted = []
+        while self.finalized:
+            tx_hash, finalized_at = next(iter(self.finalized.items()))
+            if len(self.finalized) <= self.max_finalized and finalized_at >= cutoff:
+                break
+            self._unindex(tx_hash)
+            evicted.append(tx_hash)
+        
+        if evicted:
+            self.evicted += len(evicted)
+            if self._db is not None:
+                self._db.executemany(
+                    'DELETE FROM monitored_transactions WHERE hash = ?',
+                    [(tx_hash,) for tx_hash in evicted]
+                )
+    
+    def add(self, record: Dict[str, Any]):
+        """Insert or replace a transaction record (keyed by record['hash'])"""
+        record = dict(record)
+        record.setdefault('timestamp', time.time())
+        record.setdefault('status', 'pending')
+        with self.lock:
+            self._unindex(record['hash'])
+            if record['status'] in self.FINAL_STATUSES:
+                record.setdefault('finalized_at', time.time())
+            self._index(record)
+            self._persist(record)
+            self._evict()
+    
+    def update_status(self, tx_hash: str, status: str, **fields) -> bool:
+        """Move a transaction to a new status; returns False if unknown"""
+        with self.lock:
+            record = self.records.get(tx_hash)
+            if record is None:
+                return False
+            
+            self.by_status[record['status']].discard(tx_hash)
+            record['status'] = status
+            record.update(fields)
+            self.by_status[status].add(tx_hash)
+            
+            if status in self.FINAL_STATUSES:
+                record['finalized_at'] = time.time()
+                self.finalized[tx_hash] = record['finalized_at']
+                self.finalized.move_to_end(tx_hash)
+            
+            self._persist(record)
+            self._evict()
+            return True
+    
+    def drop_stale(self, max_age: float) -> List[str]:
+        """Mark pending transactions submitted more than max_age seconds ago 'dropped'"""
+        cutoff = time.time() - max_age
+        with self.lock:
+            stale = [
+                tx_hash for tx_hash in self.by_status.get('pending', ())
+                if self.records[tx_hash]['timestamp'] < cutoff
+            ]
+            for tx_hash in stale:
+                self.update_status(tx_hash, 'dropped')
+        return stale
+    
+    def get(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            record = self.records.get(tx_hash)
+            return dict(record) if record else None
+    
+    def count(self, status: Optional[str] = None) -> int:
+        """Number of records, optionally with a given status (O(1))"""
+        with self.lock:
+            if status is None:
+                return len(self.records)
+            return len(self.by_status.get(status, ()))
+    
+    def hashes(self, status: str, max_age: Optional[float] = None) -> List[str]:
+        """Hashes with the given status, optionally submitted within max_age seconds"""
+        cutoff = time.time() - max_age if max_age else 0
+        with self.lock:
+            return [
+                tx_hash for tx_hash in self.by_status.get(status, ())
+                if self.records[tx_hash]['timestamp'] >= cutoff
+            ]
+    
+    def by_address(self, sender: str) -> List[Dict[str, Any]]:
+        """Records sent from the given address"""
+        with self.lock:
+            return [dict(self.records[h]) for h in self.by_sender.get(sender, ())]
+    
+    def values(
+        self,
+        status: Optional[str] = None,
+        sender: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Snapshot of records, optionally filtered through the indexes"""
+        with self.lock:
+            if status is None and sender is None:
+                hashes = list(self.records)
+            else:
+                candidates = [
+                    index for index in (
+                        self.by_status.get(status, set()) if status is not None else None,
+                        self.by_sender.get(sender, set()) if sender is not None else None
+                    ) if index is not None
+                ]
+                hashes = set.intersection(*candidates)
+            return [dict(self.records[tx_hash]) for tx_hash in hashes]
+    
+    def __contains__(self, tx_hash: str) -> bool:
+        return tx_hash in self.records
+    
+    def __getitem__(self, tx_hash: str) -> Dict[str, Any]:
+        record = self.get(tx_hash)
+        if record is None:
+            raise KeyError(tx_hash)
+        return record
+    
+    def __setitem__(self, tx_hash: str, record: Dict[str, Any]):
+        self.add({**record, 'hash': tx_hash})
+    
+    def __len__(self) -> int:
+        return self.count()
+    
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def _sign_in_worker(job: Tuple[Dict[str, Any], str]) -> SignedTransaction:
+    """Sign one transaction in a worker process (keys are not kept between jobs)"""
+    transaction, private_key = job
+    return Account.sign_transaction(transaction, private_key)
+
+
+class TransactionSigner:
+    """
+    Offline transaction signing service.
+    Derived accounts are cached per key, and batches of process_threshold or
+    more transactions are signed in a process pool so secp256k1 and RLP work
+    runs outside the GIL. No RPC connection is needed to sign.
+    """
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        process_threshold: int = 16,
+        account_cache_size: int = 256
+    ):
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.process_threshold = process_threshold
+        self.account_cache_size = account_cache_size
+        self.accounts: 'OrderedDict[str, LocalAccount]' = OrderedDict()
+        self.lock = Lock()
+        self.signed_inline = 0
+        self.signed_in_pool = 0
+        self.logger = logging.getLogger(f"{__name__}.TransactionSigner")
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def account(self, private_key: str) -> LocalAccount:
+        """Derived account for a key (address recovery is done once per key)"""
+        with self.lock:
+            account = self.accounts.get(private_key)
+            if account is not None:
+                self.accounts.move_to_end(private_key)
+                return account
+        
+        account = Account.from_key(private_key)
+        with self.lock:
+            self.accounts[private_key] = account
+            while len(self.accounts) > self.account_cache_size:
+                self.accounts.popitem(last=False)
+        return account
+    
+    def sign(self, transaction: Dict[str, Any], private_key: str) -> SignedTransaction:
+        """Sign a single transaction in the calling thread"""
+        signed = self.account(private_key).sign_transaction(transaction)
+        with self.lock:
+            self.signed_inline += 1
+        return signed
+    
+    def sign_batch(
+        self,
+        transactions: List[Dict[str, Any]],
+        private_key: str
+    ) -> List[SignedTransaction]:
+        """Sign transactions in order, in the process pool for large batches"""
+        if len(transactions) < self.process_threshold or self.max_workers <= 1:
+            return [self.sign(tx, private_key) for tx in transactions]
+        
+        jobs = [(dict(tx), private_key) for tx in transactions]
+        chunksize = max(1, len(jobs) // (self.max_workers * 4))
+        try:
+            signed = list(self._ensure_executor().map(_sign_in_worker, jobs, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            self.logger.warning(f"Signing pool failed, signing inline: {e}")
+            self._shutdown_executor()
+            return [self.sign(tx, private_key) for tx in transactions]
+        
+        with self.lock:
+            self.signed_in_pool += len(signed)
+        return signed
+    
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self._executor is None:
+                # Spawned workers avoid forking a process that holds pool threads and locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+    
+    def _shutdown_executor(self):
+        with self.lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'cached_accounts': len(self.accounts),
+                'signed_inline': self.signed_inline,
+                'signed_in_pool': self.signed_in_pool,
+                'pool_running': self._executor is not None
+            }
+    
+    def close(self):
+        self._shutdown_executor()
+
+
+# Process-wide signer used by providers and token interfaces that are not given their own
+shared_transaction_signer = TransactionSigner()
+
+
+class GasOracle:
+    """
+    Block-aware fee and gas limit cache behind estimate_gas_optimized.
+    Fee tiers are served from one eth_feeHistory sample per block, and gas
+    limits are memoized per (sender, contract, selector, calldata shape) at
+    the largest estimate seen so far.
+    """
+    
+    # Reward percentile sampled for each priority level
+    TIER_PERCENTILES = {
+        'slow': 10,
+        'standard': 50,
+        'fast': 75,
+        'instant': 95
+    }
+    
+    PRIORITY_MULTIPLIERS = {
+        'slow': 0.8,
+        'standard': 1.0,
+        'fast': 1.5,
+        'instant': 2.0
+    }
+    
+    def __init__(self, gas_config: GasConfig):
+        self.gas_config = gas_config
+        self.lock = Lock()
+        self.refresh_lock = Lock()
+        self.block_number: Optional[int] = None
+        self.latest_block_seen: Optional[int] = None
+        self.base_fee: Optional[int] = None
+        self.priority_fees: Dict[str, int] = {}
+        self.updated_at = 0.0
+        self.gas_limits: 'OrderedDict[Tuple, int]' = OrderedDict()
+        self.fee_refreshes = 0
+        self.gas_hits = 0
+        self.gas_misses = 0
+    
+    @property
+    def reward_percentiles(self) -> List[int]:
+        return list(self.TIER_PERCENTILES.values())
+    
+    def is_stale(self) -> bool:
+        """True when no sample exists, a newer block was seen or the TTL lapsed"""
+        with self.lock:
+            if self.base_fee is None:
+                return True
+            if (self.latest_block_seen is not None and self.block_number is not None
+                    and self.latest_block_seen > self.block_number):
+                return True
+            return time.time() - self.updated_at >= self.gas_config.fee_cache_ttl
+    
+    def observe_block(self, block_number: int):
+        """Note a block seen elsewhere so the next quote refreshes"""
+        with self.lock:
+            if self.latest_block_seen is None or block_number > self.latest_block_seen:
+                self.latest_block_seen = block_number
+    
+    def _priority_floor(self, tier: str) -> int:
+        multiplier = self.PRIORITY_MULTIPLIERS.get(tier, 1.0)
+        return int(self.gas_config.max_priority_fee_gwei * 10**9 * multiplier)
+    
+    def update(self, fee_history: Dict[str, Any]):
+        """Load an eth_feeHistory result (rewards sampled at reward_percentiles)"""
+        base_fees = fee_history['baseFeePerGas']
+        rewards = fee_history.get('reward') or []
+        
+        priority_fees = {}
+        for i, tier in enumerate(self.TIER_PERCENTILES):
+            # Median across sampled blocks, skipping empty blocks that report 0
+            samples = sorted(row[i] for row in rewards if len(row) > i and row[i] > 0)
+            observed = samples[len(samples) // 2] if samples else 0
+            priority_fees[tier] = max(observed, self._priority_floor(tier))
+        
+        with self.lock:
+            # The last base fee is the projection for the next block
+            self.base_fee = int(base_fees[-1])
+            self.priority_fees = priority_fees
+            self.block_number = int(fee_history['oldestBlock']) + len(base_fees) - 2
+            self.updated_at = time.time()
+            self.fee_refreshes += 1
+    
+    def update_from_gas_price(self, gas_price: int):
+        """Fallback for endpoints without eth_feeHistory"""
+        with self.lock:
+            self.base_fee = int(gas_price)
+            self.priority_fees = {tier: self._priority_floor(tier) for tier in self.TIER_PERCENTILES}
+            self.block_number = self.latest_block_seen
+            self.updated_at = time.time()
+            self.fee_refreshes += 1
+    
+    def quote(self, priority_level: str) -> Tuple[int, int, int]:
+        """(base_fee, max_priority_fee, max_fee_per_gas) for a priority level"""
+        with self.lock:
+            base_fee = self.base_fee
+            max_priority_fee = self.priority_fees.get(
+                priority_level, self.priority_fees['standard']
+            )
+        max_fee_per_gas = int(base_fee * self.gas_config.mev_protection_buffer + max_priority_fee)
+        return base_fee, max_priority_fee, max_fee_per_gas
+    
+    @staticmethod
+    def gas_limit_key(transaction: Dict[str, Any]) -> Optional[Tuple]:
+        """Memo key (sender, contract, selector, calldata length, has value); None for deployments"""
+        to = transaction.get('to')
+        if not to:
+            return None
+        data = transaction.get('data') or transaction.get('input') or '0x'
+        if isinstance(data, (bytes, bytearray)):
+            data = '0x' + bytes(data).hex()
+        # Balances, roles and compliance state of the sender change the path taken
+        sender = (transaction.get('from') or '').lower()
+        return (sender, to.lower(), data[:10].lower(), len(data), bool(transaction.get('value')))
+    
+    def cached_gas(self, transaction: Dict[str, Any]) -> Optional[int]:
+        key = self.gas_limit_key(transaction)
+        with self.lock:
+            estimate = self.gas_limits.get(key) if key else None
+            if estimate is None:
+                self.gas_misses += 1
+                return None
+            self.gas_limits.move_to_end(key)
+            self.gas_hits += 1
+            return estimate
+    
+    def remember_gas(self, transaction: Dict[str, Any], estimate: int):
+        key = self.gas_limit_key(transaction)
+        if key is None:
+            return
+        with self.lock:
+            self.gas_limits[key] = max(estimate, self.gas_limits.get(key, 0))
+            self.gas_limits.move_to_end(key)
+            while len(self.gas_limits) > self.gas_config.gas_limit_cache_size:
+                self.gas_limits.popitem(last=False)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'block_number': self.block_number,
+                'base_fee': self.base_fee,
+                'priority_fees': dict(self.priority_fees),
+                'fee_refreshes': self.fee_refreshes,
+                'gas_limits_cached': len(self.gas_limits),
+                'gas_hits': self.gas_hits,
+                'gas_misses': self.gas_misses
+            }
+
+
+@dataclass
+class TrackedTransaction:
+    """Transaction awaiting its receipt in the ReceiptTracker"""
+    tx_hash: str
+    future: Future
+    callbacks: List[Callable[[str, Dict[str, Any]], None]] = field(default_factory=list)
+    deadline: Optional[float] = None
+
+
+class ReceiptTracker:
+    """
+    Background confirmation tracker for submitted transactions.
+    Once per new block it fetches receipts for every outstanding hash (those
+    tracked explicitly and those still 'pending' in the provider) in a single
+    JSON-RPC batch, then resolves futures, runs callbacks and updates status.
+    """
+    
+    def __init__(
+        self,
+        provider: 'PolygonProvider',
+        poll_interval: float = 1.0,
+        max_pending_age: float = 3600.0
+    ):
+        self.provider = provider
+        self.poll_interval = poll_interval
+        self.max_pending_age = max_pending_age
+        self.outstanding: Dict[str, TrackedTransaction] = {}
+        self.lock = Lock()
+        self.last_block: Optional[int] = None
+        self.logger = logging.getLogger(f"{__name__}.ReceiptTracker")
+        self._wakeup = Event()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+    
+    def track(
+        self,
+        tx_hash: str,
+        callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """Register tx_hash and return a Future resolved with its receipt"""
+        with self.lock:
+            tracked = self.outstanding.get(tx_hash)
+            if tracked is None:
+                tracked = TrackedTransaction(tx_hash=tx_hash, future=Future())
+                self.outstanding[tx_hash] = tracked
+            if callback:
+                tracked.callbacks.append(callback)
+            if timeout is not None:
+                deadline = time.monotonic() + timeout
+                tracked.deadline = max(tracked.deadline or 0, deadline)
+            self._ensure_running()
+        
+        self._wakeup.set()
+        return tracked.future
+    
+    def start(self):
+        """Start polling for transactions already pending in the provider"""
+        with self.lock:
+            self._ensure_running()
+    
+    def _ensure_running(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.error(f"Receipt tracking error: {e}")
+            
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            
+            with self.lock:
+                if not self.outstanding and not self.provider._pending_transaction_hashes(
+                        self.max_pending_age):
+                    self._thread = None
+                    return
+    
+    def poll(self) -> int:
+        """Fetch receipts once per new block; returns number of receipts resolved"""
+        self._expire_deadlines()
+        self._drop_stale()
+        
+        with self.lock:
+            hashes = set(self.outstanding)
+        hashes.update(self.provider._pending_transaction_hashes(self.max_pending_age))
+        if not hashes:
+            return 0
+        
+        with self.provider.connection_pool.get_connection() as w3:
+            block_number = w3.eth.block_number
+        self.provider.gas_oracle.observe_block(block_number)
+        if self.last_block is not None and block_number <= self.last_block:
+            return 0
+        self.last_block = block_number
+        
+        ordered = sorted(hashes)
+        receipts = self.provider.batch_request(
+            [('get_transaction_receipt', [tx_hash]) for tx_hash in ordered]
+        )
+        
+        resolved = 0
+        for tx_hash, receipt in zip(ordered, receipts):
+            # Unmined transactions come back as None; per-item errors are retried next block
+            if not receipt or 'error' in receipt:
+                continue
+            self._resolve(tx_hash, receipt)
+            resolved += 1
+        
+        return resolved
+    
+    def _resolve(self, tx_hash: str, receipt: Dict[str, Any]):
+        self.provider._record_receipt(tx_hash, receipt)
+        
+        with self.lock:
+            tracked = self.outstanding.pop(tx_hash, None)
+        if tracked is None:
+            return
+        
+        for callback in tracked.callbacks:
+            try:
+                callback(tx_hash, receipt)
+            except Exception as e:
+                self.logger.error(f"Receipt callback failed for {tx_hash}: {e}")
+        if not tracked.future.done():
+            tracked.future.set_result(receipt)
+    
+    def _expire_deadlines(self):
+        now = time.monotonic()
+        with self.lock:
+            expired = [
+                tracked for tracked in self.outstanding.values()
+                if tracked.deadline is not None and tracked.deadline < now
+            ]
+            for tracked in expired:
+                del self.outstanding[tracked.tx_hash]
+        
+        for tracked in expired:
+            if not tracked.future.done():
+                tracked.future.set_exception(TimeExhausted(
+                    f"Transaction {tracked.tx_hash} is not in the chain after timeout"
+                ))
+    
+    def _drop_stale(self):
+        """Finalize transactions unmined after max_pending_age as 'dropped' and fail their waiters"""
+        dropped = self.provider._drop_stale_transactions(self.max_pending_age)
+        if not dropped:
+            return
+        self.logger.warning(f"{len(dropped)} transactions not mined within {self.max_pending_age}s marked dropped")
+        
+        with self.lock:
+            expired = [self.outstanding.pop(tx_hash) for tx_hash in dropped if tx_hash in self.outstanding]
+        
+        for tracked in expired:
+            if not tracked.future.done():
+                tracked.future.set_exception(TimeExhausted(
+                    f"Transaction {tracked.tx_hash} dropped after {self.max_pending_age}s without a receipt"
+                ))
+    
+    def outstanding_count(self) -> int:
+        with self.lock:
+            return len(self.outstanding)
+    
+    def stop(self):
+        """Stop the tracker thread; outstanding futures are cancelled"""
+        self._stopped.set()
+        self._wakeup.set()
+        with self.lock:
+            outstanding = list(self.outstanding.values())
+            self.outstanding.clear()
+        for tracked in outstanding:
+            tracked.future.cancel()
 
 
 class PolygonProvider:
@@ -91,8 +1329,13 @@ class PolygonProvider:
         self,
         rpc_urls: Optional[List[str]] = None,
         pool_size: int = 5,
+        min_pool_size: int = 1,
+        idle_timeout: float = 300.0,
         gas_config: Optional[GasConfig] = None,
-        retry_config: Optional[RetryConfig] = None
+        retry_config: Optional[RetryConfig] = None,
+        batch_config: Optional[BatchConfig] = None,
+        transaction_store_path: Optional[str] = None,
+        signer: Optional[TransactionSigner] = None
     ):
         # Configure RPC endpoints with fallbacks
         self.rpc_urls = rpc_urls or self._get_default_rpc_urls()
@@ -100,9 +1343,15 @@ class PolygonProvider:
         # Initialize configurations
         self.gas_config = gas_config or GasConfig()
         self.retry_config = retry_config or RetryConfig()
+        self.batch_config = batch_config or BatchConfig()
         
         # Setup connection pool
-        self.connection_pool = ConnectionPool(self.rpc_urls, pool_size)
+        self.connection_pool = ConnectionPool(
+            self.rpc_urls,
+            pool_size,
+            min_size=min_pool_size,
+            idle_timeout=idle_timeout
+        )
         
         # Mumbai testnet configuration
         self.chain_id = 80001
@@ -111,11 +1360,32 @@ class PolygonProvider:
         # Setup logging
         self.logger = self._setup_logging()
         
-        # Transaction monitoring
-        self.pending_transactions: Dict[str, Dict[str, Any]] = {}
-        self.transaction_lock = Lock()
+        # Transaction monitoring (optionally persisted across restarts)
+        self.pending_transactions = TransactionStore(
+            persist_path=transaction_store_path or os.getenv('VERIA_TX_STORE_PATH')
+        )
+        
+        # Nonce allocation for concurrent sends from the same key
+        self.nonce_manager = NonceManager(self.connection_pool)
+        
+        # Per-block fee and gas limit cache
+        self.gas_oracle = GasOracle(self.gas_config)
         
-        self.logger.info(f"Initialized Polygon Mumbai provider with {pool_size} connections")
+        # Offline signing (accounts cached per key, process pool for batches)
+        self.signer = signer or shared_transaction_signer
+        
+        # Background confirmation tracking for sent transactions
+        self.receipt_tracker = ReceiptTracker(self)
+        if self.pending_transactions.count('pending'):
+            # Resume tracking transactions restored from the store
+            self.receipt_tracker.start()
+        
+        # Endpoints that answered a batch array with an error object
+        self._batch_unsupported_endpoints: Set[str] = set()
+        
+        self.logger.info(
+            f"Initialized Polygon Mumbai provider with {min_pool_size}-{pool_size} connections"
+        )
     
     @staticmethod
     def _get_default_rpc_urls() -> List[str]:
@@ -186,7 +1456,7 @@ class PolygonProvider:
                     'block_timestamp': block['timestamp'],
                     'gas_price_gwei': w3.eth.gas_price / 10**9,
                     'pool_size': self.connection_pool.pool_size,
-                    'available_connections': self.connection_pool.pool.qsize()
+                    'available_connections': self.connection_pool.available_connections()
                 }
         except Exception as e:
             self.logger.error(f"Failed to get connection status: {e}")
@@ -223,49 +1493,61 @@ class PolygonProvider:
         Priority levels: 'slow', 'standard', 'fast', 'instant'
         """
         def _estimate():
-            with self.connection_pool.get_connection() as w3:
-                # Get current gas prices
-                base_fee = w3.eth.gas_price
-                
-                # Calculate priority fee based on level
-                priority_multipliers = {
-                    'slow': 0.8,
-                    'standard': 1.0,
-                    'fast': 1.5,
-                    'instant': 2.0
-                }
-                
-                multiplier = priority_multipliers.get(priority_level, 1.0)
-                
-                # EIP-1559 gas calculation
-                max_priority_fee = int(
-                    self.gas_config.max_priority_fee_gwei * 10**9 * multiplier
-                )
-                max_fee_per_gas = int(
-                    base_fee * self.gas_config.mev_protection_buffer + max_priority_fee
-                )
-                
-                # Estimate gas limit
-                estimated_gas = w3.eth.estimate_gas(transaction)
-                gas_limit = int(estimated_gas * self.gas_config.gas_limit_buffer)
-                
-                # Calculate costs
-                estimated_cost_wei = gas_limit * max_fee_per_gas
-                estimated_cost_ether = w3.from_wei(estimated_cost_wei, 'ether')
-                
-                return {
-                    'gas_limit': gas_limit,
-                    'max_priority_fee_per_gas': max_priority_fee,
-                    'max_fee_per_gas': max_fee_per_gas,
-                    'base_fee': base_fee,
-                    'estimated_cost_wei': estimated_cost_wei,
-                    'estimated_cost_ether': float(estimated_cost_ether),
-                    'estimated_cost_formatted': f"{estimated_cost_ether:.6f} {self.native_token}",
-                    'priority_level': priority_level
-                }
+            self._refresh_gas_oracle()
+            base_fee, max_priority_fee, max_fee_per_gas = self.gas_oracle.quote(priority_level)
+            
+            # Estimate gas limit (memoized per sender and contract call shape)
+            estimated_gas = self.gas_oracle.cached_gas(transaction)
+            if estimated_gas is None:
+                with self.connection_pool.get_connection() as w3:
+                    estimated_gas = w3.eth.estimate_gas(transaction)
+                self.gas_oracle.remember_gas(transaction, estimated_gas)
+            elif self.gas_config.preflight_cached_gas:
+                # eth_estimateGas was the revert check; one eth_call keeps it
+                with self.connection_pool.get_connection() as w3:
+                    w3.eth.call(transaction)
+            gas_limit = int(estimated_gas * self.gas_config.gas_limit_buffer)
+            
+            # Calculate costs
+            estimated_cost_wei = gas_limit * max_fee_per_gas
+            estimated_cost_ether = Web3.from_wei(estimated_cost_wei, 'ether')
+            
+            return {
+                'gas_limit': gas_limit,
+                'max_priority_fee_per_gas': max_priority_fee,
+                'max_fee_per_gas': max_fee_per_gas,
+                'base_fee': base_fee,
+                'estimated_cost_wei': estimated_cost_wei,
+                'estimated_cost_ether': float(estimated_cost_ether),
+                'estimated_cost_formatted': f"{estimated_cost_ether:.6f} {self.native_token}",
+                'priority_level': priority_level
+            }
         
         return self._retry_operation(_estimate)
     
+    def _refresh_gas_oracle(self):
+        """Fetch a fresh fee sample at most once per block"""
+        if not self.gas_oracle.is_stale():
+            return
+        
+        with self.gas_oracle.refresh_lock:
+            # Another thread may have refreshed while we waited
+            if not self.gas_oracle.is_stale():
+                return
+            
+            with self.connection_pool.get_connection() as w3:
+                try:
+                    fee_history = w3.eth.fee_history(
+                        self.gas_config.fee_history_blocks,
+                        'latest',
+                        self.gas_oracle.reward_percentiles
+                    )
+                except Exception as e:
+                    self.logger.debug(f"eth_feeHistory unavailable, using eth_gasPrice: {e}")
+                    self.gas_oracle.update_from_gas_price(w3.eth.gas_price)
+                    return
+            self.gas_oracle.update(fee_history)
+    
     def send_transaction(
         self,
         transaction: Dict[str, Any],
@@ -275,73 +1557,229 @@ class PolygonProvider:
     ) -> Dict[str, Any]:
         """
         Send transaction with retry logic and monitoring
+        Nonces are assigned by the provider's NonceManager when not supplied,
+        so concurrent sends from the same key can be pipelined within a block
         """
         def _send():
-            with self.connection_pool.get_connection() as w3:
-                # Get account from private key
-                account = Account.from_key(private_key)
-                
-                # Add chain ID
-                transaction['chainId'] = self.chain_id
-                
-                # Add nonce if not present
-                if 'nonce' not in transaction:
-                    transaction['nonce'] = w3.eth.get_transaction_count(account.address)
-                
+            # Get account from private key (derived once per key)
+            account = self.signer.account(private_key)
+            
+            # Add chain ID
+            transaction['chainId'] = self.chain_id
+            
+            # Allocate nonce if not present
+            allocated_nonce = None
+            if 'nonce' not in transaction:
+                allocated_nonce = self.nonce_manager.allocate(account.address)
+                transaction['nonce'] = allocated_nonce
+            
+            try:
                 # Estimate and add gas if not present
                 if 'gas' not in transaction:
-                    gas_estimate = self.estimate_gas_optimized(transaction)
-                    transaction['gas'] = gas_estimate['gas_limit']
-                    transaction['maxPriorityFeePerGas'] = gas_estimate['max_priority_fee_per_gas']
-                    transaction['maxFeePerGas'] = gas_estimate['max_fee_per_gas']
-                
-                # Sign transaction
-                signed_txn = w3.eth.account.sign_transaction(transaction, private_key)
-                
-                # Send transaction
-                tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-                tx_hash_hex = tx_hash.hex()
+                    self._apply_gas_estimate(transaction)
                 
-                self.logger.info(f"Transaction sent: {tx_hash_hex}")
-                
-                # Store in pending transactions
-                with self.transaction_lock:
-                    self.pending_transactions[tx_hash_hex] = {
-                        'hash': tx_hash_hex,
-                        'timestamp': time.time(),
-                        'status': 'pending',
-                        'from': account.address,
-                        'to': transaction.get('to'),
-                        'value': transaction.get('value', 0)
-                    }
-                
-                result = {
-                    'transaction_hash': tx_hash_hex,
+                # Sign offline; a connection is only held for the broadcast
+                signed_txn = self.signer.sign(transaction, private_key)
+                tx_hash = self._send_raw(signed_txn)
+            except Exception as e:
+                if allocated_nonce is not None:
+                    # Hand the nonce back and let a retry allocate afresh
+                    self.nonce_manager.release(account.address, allocated_nonce, e)
+                    transaction.pop('nonce', None)
+                raise
+            
+            if allocated_nonce is not None:
+                self.nonce_manager.confirm(account.address, allocated_nonce)
+            tx_hash_hex = tx_hash.hex()
+            
+            self.logger.info(f"Transaction sent: {tx_hash_hex}")
+            self._record_sent(tx_hash_hex, account.address, transaction)
+            
+            return {
+                'transaction_hash': tx_hash_hex,
+                'from': account.address,
+                'status': 'pending'
+            }
+        
+        result = self._retry_operation(_send)
+        
+        # Confirmation is tracked in the background without holding a connection
+        receipt_future = self.receipt_tracker.track(result['transaction_hash'], timeout=timeout)
+        
+        # Wait for receipt if requested
+        if wait_for_receipt:
+            self._await_receipt(result, receipt_future, timeout)
+        
+        return result
+    
+    def send_transactions(
+        self,
+        transactions: List[Dict[str, Any]],
+        private_key: str,
+        wait_for_receipt: bool = False,
+        timeout: int = 120,
+        send_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Send a batch of transactions from one key
+        Transactions are estimated, assigned consecutive nonces and signed
+        offline in one batch; the signed payloads then drain through a send
+        queue that checks out a connection only for send_raw_transaction.
+        Results are returned in input order; failures carry an 'error' entry.
+        """
+        account = self.signer.account(private_key)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(transactions)
+        
+        # Estimate first so failed estimates never consume a nonce
+        estimated: List[Tuple[int, Dict[str, Any]]] = []
+        for index, tx in enumerate(transactions):
+            transaction = dict(tx, chainId=self.chain_id)
+            if 'gas' not in transaction:
+                try:
+                    self._apply_gas_estimate(transaction)
+                except Exception as e:
+                    results[index] = {'from': account.address, 'status': 'error', 'error': str(e)}
+                    continue
+            estimated.append((index, transaction))
+        
+        # Consecutive nonces in input order (None where the caller supplied one)
+        prepared: List[Tuple[int, Dict[str, Any], Optional[int]]] = [
+            (index, transaction, None if 'nonce' in transaction
+             else self._assign_nonce(account.address, transaction))
+            for index, transaction in estimated
+        ]
+        
+        signed = self.signer.sign_batch([transaction for _, transaction, _ in prepared], private_key)
+        
+        def _broadcast(job):
+            (index, transaction, allocated_nonce), signed_txn = job
+            try:
+                tx_hash = self._retry_operation(self._send_raw, signed_txn)
+            except Exception as e:
+                if allocated_nonce is not None:
+                    self.nonce_manager.release(account.address, allocated_nonce, e)
+                return index, {
                     'from': account.address,
-                    'status': 'pending'
+                    'nonce': transaction.get('nonce'),
+                    'status': 'error',
+                    'error': str(e)
                 }
-                
-                # Wait for receipt if requested
-                if wait_for_receipt:
-                    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
-                    
-                    with self.transaction_lock:
-                        if tx_hash_hex in self.pending_transactions:
-                            self.pending_transactions[tx_hash_hex]['status'] = (
-                                'success' if receipt['status'] == 1 else 'failed'
-                            )
-                    
-                    result.update({
-                        'status': 'success' if receipt['status'] == 1 else 'failed',
-                        'block_number': receipt['blockNumber'],
-                        'gas_used': receipt['gasUsed'],
-                        'effective_gas_price': receipt.get('effectiveGasPrice', 0),
-                        'receipt': dict(receipt)
-                    })
-                
-                return result
+            
+            if allocated_nonce is not None:
+                self.nonce_manager.confirm(account.address, allocated_nonce)
+            tx_hash_hex = tx_hash.hex()
+            self._record_sent(tx_hash_hex, account.address, transaction)
+            return index, {
+                'transaction_hash': tx_hash_hex,
+                'from': account.address,
+                'nonce': transaction.get('nonce'),
+                'status': 'pending'
+            }
+        
+        # Send queue: submitted in nonce order, bounded in-flight broadcasts
+        with ThreadPoolExecutor(max_workers=max(1, send_concurrency)) as executor:
+            for index, result in executor.map(_broadcast, zip(prepared, signed)):
+                results[index] = result
         
-        return self._retry_operation(_send)
+        sent = [result for result in results if result.get('transaction_hash')]
+        self.logger.info(f"Batch sent: {len(sent)}/{len(transactions)} transactions")
+        
+        futures = [
+            (result, self.receipt_tracker.track(result['transaction_hash'], timeout=timeout))
+            for result in sent
+        ]
+        if wait_for_receipt:
+            for result, receipt_future in futures:
+                try:
+                    self._await_receipt(result, receipt_future, timeout)
+                except TimeExhausted as e:
+                    result['error'] = str(e)
+        
+        return results
+    
+    def _assign_nonce(self, address: str, transaction: Dict[str, Any]) -> int:
+        nonce = self.nonce_manager.allocate(address)
+        transaction['nonce'] = nonce
+        return nonce
+    
+    def _apply_gas_estimate(self, transaction: Dict[str, Any]):
+        gas_estimate = self.estimate_gas_optimized(transaction)
+        transaction['gas'] = gas_estimate['gas_limit']
+        transaction['maxPriorityFeePerGas'] = gas_estimate['max_priority_fee_per_gas']
+        transaction['maxFeePerGas'] = gas_estimate['max_fee_per_gas']
+    
+    def _send_raw(self, signed_txn):
+        """
+        Broadcast a signed payload; the only step that needs a connection.
+        A node that already holds this exact transaction (e.g. a retry after
+        a timed-out broadcast) counts as a successful send.
+        """
+        try:
+            with self.connection_pool.get_connection() as w3:
+                return w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception as e:
+            if NonceManager.is_already_broadcast(e):
+                self.logger.info(f"Transaction {signed_txn.hash.hex()} already known to the node")
+                return signed_txn.hash
+            raise
+    
+    def _record_sent(self, tx_hash: str, sender: str, transaction: Dict[str, Any]):
+        self.pending_transactions.add({
+            'hash': tx_hash,
+            'timestamp': time.time(),
+            'status': 'pending',
+            'from': sender,
+            'to': transaction.get('to'),
+            'value': transaction.get('value', 0),
+            'nonce': transaction.get('nonce')
+        })
+    
+    def _await_receipt(self, result: Dict[str, Any], receipt_future: Future, timeout: float):
+        """Block on a tracked receipt and merge it into a send result"""
+        try:
+            receipt = receipt_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise TimeExhausted(
+                f"Transaction {result['transaction_hash']} is not in the chain "
+                f"after {timeout} seconds"
+            )
+        
+        result.update({
+            'status': 'success' if receipt['status'] == 1 else 'failed',
+            'block_number': receipt['blockNumber'],
+            'gas_used': receipt['gasUsed'],
+            'effective_gas_price': receipt.get('effectiveGasPrice', 0),
+            'receipt': dict(receipt)
+        })
+    
+    def track_transaction(
+        self,
+        tx_hash: str,
+        callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """
+        Track a transaction's confirmation in the background
+        Returns a Future resolved with the receipt; callback(tx_hash, receipt)
+        is invoked from the tracker thread once it is mined
+        """
+        return self.receipt_tracker.track(tx_hash, callback=callback, timeout=timeout)
+    
+    def _record_receipt(self, tx_hash: str, receipt: Dict[str, Any]):
+        """Update monitored transaction status from a fetched receipt"""
+        self.pending_transactions.update_status(
+            tx_hash,
+            'success' if receipt['status'] == 1 else 'failed',
+            block_number=receipt['blockNumber']
+        )
+    
+    def _drop_stale_transactions(self, max_age: float) -> List[str]:
+        """Mark monitored transactions pending for longer than max_age as dropped"""
+        return self.pending_transactions.drop_stale(max_age)
+    
+    def _pending_transaction_hashes(self, max_age: Optional[float] = None) -> List[str]:
+        """Hashes of monitored transactions still awaiting a receipt"""
+        return self.pending_transactions.hashes('pending', max_age)
     
     def monitor_transaction(self, tx_hash: str) -> Dict[str, Any]:
         """Monitor transaction status and return detailed information"""
@@ -388,32 +1826,200 @@ class PolygonProvider:
         
         return self._retry_operation(_monitor)
     
-    def get_pending_transactions(self) -> List[Dict[str, Any]]:
-        """Get all pending transactions being monitored"""
-        with self.transaction_lock:
-            return list(self.pending_transactions.values())
+    def get_pending_transactions(
+        self,
+        status: Optional[str] = None,
+        sender: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get transactions being monitored, optionally filtered by status or sender"""
+        return self.pending_transactions.values(status=status, sender=sender)
     
-    def batch_request(self, requests: List[Tuple[str, List[Any]]]) -> List[Any]:
+    def batch_request(
+        self,
+        requests: List[Tuple[str, List[Any]]],
+        max_batch_size: Optional[int] = None
+    ) -> List[Any]:
         """
-        Execute multiple RPC requests in a single batch
-        requests: List of (method_name, params) tuples
+        Execute multiple RPC requests as JSON-RPC 2.0 batch arrays
+        requests: List of (method_name, params) tuples, where method_name is
+        either a Web3 ``eth`` attribute (e.g. 'get_balance') or a raw JSON-RPC
+        method (e.g. 'eth_getBalance')
+        
+        Results are returned in request order. Failed items are reported as
+        {'error': message} without failing the rest of the batch.
         """
-        def _batch():
+        results: List[Any] = [None] * len(requests)
+        encoded: List[Tuple[int, str, List[Any]]] = []
+        unbatched: List[int] = []
+        
+        for index, (method, params) in enumerate(requests):
+            try:
+                call = self._encode_batch_call(method, list(params or []))
+            except Exception as e:
+                results[index] = {'error': str(e)}
+                continue
+            
+            if call is None:
+                unbatched.append(index)
+            else:
+                encoded.append((index, call[0], call[1]))
+        
+        chunk_size = max(1, max_batch_size or self.batch_config.max_batch_size)
+        for start in range(0, len(encoded), chunk_size):
+            chunk = encoded[start:start + chunk_size]
+            for index, value in self._execute_batch_chunk(chunk).items():
+                results[index] = value
+        
+        # Methods without a JSON-RPC mapping go through Web3 one at a time
+        if unbatched:
             with self.connection_pool.get_connection() as w3:
-                results = []
-                for method, params in requests:
-                    try:
-                        if hasattr(w3.eth, method):
-                            func = getattr(w3.eth, method)
-                            result = func(*params) if params else func()
-                            results.append(result)
-                        else:
-                            results.append({'error': f'Method {method} not found'})
-                    except Exception as e:
-                        results.append({'error': str(e)})
-                return results
-        
-        return self._retry_operation(_batch)
+                for index in unbatched:
+                    method, params = requests[index]
+                    results[index] = self._call_eth_attribute(w3, method, params)
+        
+        return results
+    
+    @staticmethod
+    def _encode_batch_call(
+        method: str,
+        params: List[Any]
+    ) -> Optional[Tuple[str, List[Any]]]:
+        """Translate a batch entry into a formatted (rpc_method, params) pair"""
+        if method == 'get_block':
+            block_id = params[0] if params else 'latest'
+            full_transactions = bool(params[1]) if len(params) > 1 else False
+            is_hash = (
+                isinstance(block_id, (bytes, bytearray)) and len(block_id) == 32
+            ) or (
+                isinstance(block_id, str) and block_id.startswith('0x') and len(block_id) == 66
+            )
+            rpc_method = 'eth_getBlockByHash' if is_hash else 'eth_getBlockByNumber'
+            params = [block_id, full_transactions]
+        elif method in BATCH_RPC_METHODS:
+            rpc_method, arity = BATCH_RPC_METHODS[method]
+            if arity and len(params) == arity - 1:
+                params = params + ['latest']
+        elif method.startswith(BATCH_RPC_NAMESPACES):
+            rpc_method = method
+        else:
+            return None
+        
+        formatter = get_request_formatters(rpc_method)
+        return rpc_method, list(formatter(params)) if formatter else params
+    
+    def _execute_batch_chunk(
+        self,
+        chunk: List[Tuple[int, str, List[Any]]]
+    ) -> Dict[int, Any]:
+        """Send one chunk as a batch array, falling back to parallel single calls"""
+        def _attempt():
+            # A rejected batch is a capability answer, not a transient failure
+            try:
+                return self._send_batch(chunk)
+            except BatchRejectedError as e:
+                return e
+        
+        try:
+            outcome = self._retry_operation(_attempt)
+        except Exception as e:
+            return {index: {'error': str(e)} for index, _, _ in chunk}
+        
+        if isinstance(outcome, BatchRejectedError):
+            self.logger.warning(f"Batch rejected, using parallel single calls: {outcome}")
+            return self._execute_parallel_calls(chunk)
+        
+        return outcome
+    
+    def _send_batch(self, chunk: List[Tuple[int, str, List[Any]]]) -> Dict[int, Any]:
+        """POST a single JSON-RPC batch array and map responses back by id"""
+        with self.connection_pool.get_connection() as w3:
+            endpoint = str(w3.provider.endpoint_uri)
+            if endpoint in self._batch_unsupported_endpoints:
+                raise BatchRejectedError(f"{endpoint} does not support batches")
+            
+            payload = [
+                {'jsonrpc': '2.0', 'id': index, 'method': rpc_method, 'params': params}
+                for index, rpc_method, params in chunk
+            ]
+            
+            started = time.monotonic()
+            try:
+                raw_response = make_post_request(
+                    endpoint,
+                    json.dumps(payload, cls=Web3JsonEncoder).encode('utf-8'),
+                    **w3.provider.get_request_kwargs()
+                )
+                self.connection_pool.record_result(endpoint, time.monotonic() - started, True)
+            except HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status in (400, 405, 413, 501):
+                    self._batch_unsupported_endpoints.add(endpoint)
+                    raise BatchRejectedError(f"{endpoint} returned HTTP {status}") from e
+                self.connection_pool.record_result(endpoint, time.monotonic() - started, False)
+                raise
+            except Exception:
+                self.connection_pool.record_result(endpoint, time.monotonic() - started, False)
+                raise
+            
+            responses = json.loads(raw_response)
+            if not isinstance(responses, list):
+                # Endpoints without batch support answer with a single error object
+                self._batch_unsupported_endpoints.add(endpoint)
+                error = responses.get('error') if isinstance(responses, dict) else responses
+                raise BatchRejectedError(f"{endpoint} rejected batch: {error}")
+            
+            by_id = {response.get('id'): response for response in responses}
+            return {
+                index: self._format_rpc_response(w3, rpc_method, by_id.get(index))
+                for index, rpc_method, _ in chunk
+            }
+    
+    def _execute_parallel_calls(
+        self,
+        chunk: List[Tuple[int, str, List[Any]]]
+    ) -> Dict[int, Any]:
+        """Issue each call of a rejected batch concurrently across the pool"""
+        def _single(call: Tuple[int, str, List[Any]]) -> Tuple[int, Any]:
+            index, rpc_method, params = call
+            try:
+                with self.connection_pool.get_connection() as w3:
+                    response = w3.provider.make_request(rpc_method, params)
+                    return index, self._format_rpc_response(w3, rpc_method, response)
+            except Exception as e:
+                return index, {'error': str(e)}
+        
+        workers = max(1, min(len(chunk), self.batch_config.fallback_concurrency))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(executor.map(_single, chunk))
+    
+    @staticmethod
+    def _format_rpc_response(w3: Web3, rpc_method: str, response: Optional[Dict]) -> Any:
+        """Apply Web3 result formatting to a raw JSON-RPC response item"""
+        if response is None:
+            return {'error': 'No response returned for request'}
+        if 'error' in response:
+            error = response['error']
+            return {'error': error.get('message', str(error)) if isinstance(error, dict) else str(error)}
+        
+        result = response.get('result')
+        try:
+            formatter = get_result_formatters(rpc_method, w3.eth)
+            return formatter(result) if formatter and result is not None else result
+        except Exception as e:
+            return {'error': f"Failed to format {rpc_method} result: {e}"}
+    
+    @staticmethod
+    def _call_eth_attribute(w3: Web3, method: str, params: List[Any]) -> Any:
+        """Call a Web3 ``eth`` attribute directly (non-batchable methods)"""
+        try:
+            if not hasattr(w3.eth, method):
+                return {'error': f'Method {method} not found'}
+            func = getattr(w3.eth, method)
+            if not callable(func):
+                return func
+            return func(*params) if params else func()
+        except Exception as e:
+            return {'error': str(e)}
     
     def health_check(self) -> Dict[str, Any]:
         """Comprehensive health check for monitoring"""
@@ -437,18 +2043,36 @@ class PolygonProvider:
             }
         
         # Check pool status
+        pool_stats = self.connection_pool.get_pool_stats()
         health['checks']['pool'] = {
             'status': 'healthy',
             'total_connections': self.connection_pool.pool_size,
-            'available_connections': self.connection_pool.pool.qsize()
+            'available_connections': self.connection_pool.available_connections(),
+            'details': pool_stats
+        }
+        
+        # Check per-endpoint latency and error rates
+        endpoints = self.connection_pool.get_endpoint_stats()
+        ejected = [endpoint for endpoint in endpoints if endpoint['status'] == 'ejected']
+        if not ejected:
+            endpoints_status = 'healthy'
+        elif len(ejected) < len(endpoints):
+            endpoints_status = 'degraded'
+        else:
+            endpoints_status = 'unhealthy'
+        health['checks']['endpoints'] = {
+            'status': endpoints_status,
+            'active_endpoints': len(endpoints) - len(ejected),
+            'ejected_endpoints': len(ejected),
+            'details': endpoints
         }
         
         # Check pending transactions
-        pending_txs = self.get_pending_transactions()
         health['checks']['transactions'] = {
             'status': 'healthy',
-            'pending_count': len([tx for tx in pending_txs if tx['status'] == 'pending']),
-            'total_monitored': len(pending_txs)
+            'pending_count': self.pending_transactions.count('pending'),
+            'total_monitored': len(self.pending_transactions),
+            'awaiting_receipts': self.receipt_tracker.outstanding_count()
         }
         
         # Overall health
@@ -463,11 +2087,10 @@ class PolygonProvider:
     def close(self):
         """Cleanup connections and resources"""
         self.logger.info("Closing Polygon provider connections")
-        while not self.connection_pool.pool.empty():
-            try:
-                self.connection_pool.pool.get_nowait()
-            except Empty:
-                break
+        self.receipt_tracker.stop()
+        # The signer is shared (or owned by the caller) and stays open
+        self.pending_transactions.close()
+        self.connection_pool.close()
         self.logger.info("Polygon provider closed")
 
 
@@ -5,6 +5,7 @@ Tests connection pooling, retry logic, gas optimization, and transaction handlin
 
 import os
 import time
+import tempfile
 import unittest
 from unittest.mock import Mock, patch, MagicMock, PropertyMock
 from decimal import Decimal
@@ -19,6 +20,11 @@ from polygon_provider import (
     ConnectionPool,
     GasConfig,
     RetryConfig,
+    NonceManager,
+    ReceiptTracker,
+    TransactionStore,
+    GasOracle,
+    TransactionSigner,
     create_polygon_provider
 )
 
@@ -35,11 +41,12 @@ class TestConnectionPool(unittest.TestCase):
         mock_web3.return_value = mock_instance
         
         # Create pool
-        pool = ConnectionPool(['http://test.rpc'], pool_size=3)
+        pool = ConnectionPool(['http://test.rpc'], pool_size=3, min_size=2)
         
-        # Verify pool size
-        self.assertEqual(pool.pool.qsize(), 3)
+        # Only the minimum is created, without connectivity round trips
+        self.assertEqual(pool.available_connections(), 2)
         self.assertEqual(pool.pool_size, 3)
+        mock_instance.is_connected.assert_not_called()
     
     @patch('polygon_provider.Web3')
     def test_pool_connection_context_manager(self, mock_web3):
@@ -50,16 +57,16 @@ class TestConnectionPool(unittest.TestCase):
         mock_web3.return_value = mock_instance
         
         # Create pool
-        pool = ConnectionPool(['http://test.rpc'], pool_size=2)
+        pool = ConnectionPool(['http://test.rpc'], pool_size=2, min_size=2)
         
         # Test context manager
         with pool.get_connection() as conn:
             self.assertIsNotNone(conn)
             # Pool should have one less connection
-            self.assertEqual(pool.pool.qsize(), 1)
+            self.assertEqual(pool.available_connections(), 1)
         
         # Connection should be returned to pool
-        self.assertEqual(pool.pool.qsize(), 2)
+        self.assertEqual(pool.available_connections(), 2)
     
     @patch('polygon_provider.Web3')
     def test_pool_exhaustion(self, mock_web3):
@@ -73,15 +80,105 @@ class TestConnectionPool(unittest.TestCase):
         pool = ConnectionPool(['http://test.rpc'], pool_size=1)
         
         # Take the only connection
-        conn1 = pool.pool.get()
+        with pool.get_connection():
+            # Try to get another connection (should timeout)
+            with self.assertRaises(Exception):
+                with pool.get_connection(timeout=0.1) as conn2:
+                    pass
         
-        # Try to get another connection (should timeout)
-        with self.assertRaises(Exception):
-            with pool.get_connection(timeout=0.1) as conn2:
-                pass
+        # Connection returned and the blocked wait was recorded
+        self.assertEqual(pool.available_connections(), 1)
+        stats = pool.get_pool_stats()
+        self.assertEqual(stats['total_waits'], 1)
+        self.assertEqual(stats['total_timeouts'], 1)
+        self.assertGreaterEqual(stats['wait_max_ms'], 100)
+    
+    @patch('polygon_provider.Web3')
+    def test_pool_grows_on_demand_and_reaps_idle(self, mock_web3):
+        """Test connections are created lazily up to the maximum and reaped when idle"""
+        pool = ConnectionPool(['http://test.rpc'], pool_size=3, min_size=1, idle_timeout=60)
+        pool._ensure_reaper = Mock()
+        
+        with pool.get_connection(), pool.get_connection(), pool.get_connection():
+            self.assertEqual(pool.total_connections, 3)
+            with self.assertRaises(ConnectionError):
+                with pool.get_connection(timeout=0.05):
+                    pass
+        
+        self.assertEqual(pool.available_connections(), 3)
+        
+        # Nothing is reaped before the idle timeout
+        self.assertEqual(pool.reap_idle_connections(), 0)
+        
+        for connection in pool.idle['http://test.rpc']:
+            connection.last_used -= 120
+        self.assertEqual(pool.reap_idle_connections(), 2)
+        self.assertEqual(pool.total_connections, 1)
+        self.assertEqual(pool.get_pool_stats()['connections_reaped'], 2)
+    
+    @patch('polygon_provider.Web3')
+    def test_checkout_prefers_fastest_endpoint(self, mock_web3):
+        """Test checkouts are routed to the endpoint with the best latency"""
+        mock_web3.return_value.is_connected.return_value = True
+        pool = ConnectionPool(['http://slow.rpc', 'http://fast.rpc'], pool_size=4)
+        
+        for _ in range(5):
+            pool.record_result('http://slow.rpc', 2.0, True)
+            pool.record_result('http://fast.rpc', 0.05, True)
+        
+        connection = pool._checkout(timeout=0.1)
+        self.assertEqual(connection.endpoint, 'http://fast.rpc')
+        pool._checkin(connection)
+    
+    @patch('polygon_provider.Web3')
+    def test_never_successful_endpoint_ranks_last(self, mock_web3):
+        """Test an endpoint that has only failed scores behind slow working ones"""
+        mock_web3.return_value.is_connected.return_value = True
+        pool = ConnectionPool(['http://broken.rpc', 'http://slow.rpc', 'http://new.rpc'], pool_size=4)
+        
+        pool.record_result('http://broken.rpc', 0.01, False)
+        pool.record_result('http://slow.rpc', 2.0, True)
+        health = pool.endpoint_health
+        
+        self.assertEqual(health['http://new.rpc'].score, 0.0)
+        self.assertGreater(health['http://broken.rpc'].score, health['http://slow.rpc'].score)
+        self.assertEqual(health['http://broken.rpc'].score, ConnectionPool.REQUEST_TIMEOUT * 11)
+    
+    @patch('polygon_provider.Web3')
+    def test_failing_endpoint_is_ejected_and_reinstated(self, mock_web3):
+        """Test endpoints are ejected after repeated failures and probed back"""
+        mock_web3.return_value.is_connected.return_value = True
+        pool = ConnectionPool(['http://bad.rpc', 'http://good.rpc'], pool_size=2)
+        pool._ensure_prober = Mock()
+        
+        for _ in range(pool.eject_after_failures):
+            pool.record_result('http://bad.rpc', 0.1, False)
+        
+        stats = {entry['url']: entry for entry in pool.get_endpoint_stats()}
+        self.assertEqual(stats['http://bad.rpc']['status'], 'ejected')
+        self.assertEqual(stats['http://bad.rpc']['error_rate'], 1.0)
+        pool._ensure_prober.assert_called_once()
+        
+        # Checkouts avoid the ejected endpoint
+        connection = pool._checkout(timeout=0.1)
+        self.assertEqual(connection.endpoint, 'http://good.rpc')
+        pool._checkin(connection)
+        
+        # A successful probe brings it back
+        self.assertTrue(pool.probe_endpoint('http://bad.rpc'))
+        stats = {entry['url']: entry for entry in pool.get_endpoint_stats()}
+        self.assertEqual(stats['http://bad.rpc']['status'], 'active')
+    
+    @patch('polygon_provider.Web3')
+    def test_last_active_endpoint_is_never_ejected(self, mock_web3):
+        """Test a single-endpoint pool keeps serving through failures"""
+        mock_web3.return_value.is_connected.return_value = True
+        pool = ConnectionPool(['http://only.rpc'], pool_size=1)
+        
+        for _ in range(pool.eject_after_failures + 2):
+            pool.record_result('http://only.rpc', 0.1, False)
         
-        # Return connection
-        pool.pool.put(conn1)
+        self.assertEqual(pool.get_endpoint_stats()[0]['status'], 'active')
 
 
 class TestPolygonProvider(unittest.TestCase):
@@ -91,9 +188,11 @@ class TestPolygonProvider(unittest.TestCase):
     def setUp(self, mock_pool):
         """Setup test provider"""
         self.mock_pool = mock_pool
+        # Own signer so accounts derived under a patched Account do not leak into other tests
         self.provider = PolygonProvider(
             rpc_urls=['http://test.rpc'],
-            pool_size=2
+            pool_size=2,
+            signer=TransactionSigner()
         )
     
     def test_provider_initialization(self):
@@ -150,19 +249,29 @@ class TestPolygonProvider(unittest.TestCase):
         self.assertEqual(balance['balance_ether'], 1.0)
         self.assertIn('MATIC', balance['balance_formatted'])
     
-    @patch('polygon_provider.ConnectionPool.get_connection')
-    def test_estimate_gas_optimized(self, mock_get_conn):
-        """Test gas estimation with optimization"""
-        # Setup mock
+    def _mock_fee_connection(self):
+        """Wire the provider's pool to a Web3 mock serving fee history"""
         mock_w3 = MagicMock()
-        mock_w3.eth.gas_price = 25000000000  # 25 Gwei
+        mock_w3.eth.fee_history.return_value = {
+            'oldestBlock': 100,
+            'baseFeePerGas': [20000000000, 22000000000, 25000000000],
+            'reward': [
+                [30000000000, 31000000000, 40000000000, 60000000000],
+                [30000000000, 33000000000, 50000000000, 80000000000]
+            ],
+            'gasUsedRatio': [0.5, 0.6]
+        }
         mock_w3.eth.estimate_gas.return_value = 21000
-        mock_w3.from_wei.return_value = Decimal('0.001')
         
         mock_context = MagicMock()
         mock_context.__enter__ = Mock(return_value=mock_w3)
         mock_context.__exit__ = Mock(return_value=None)
-        mock_get_conn.return_value = mock_context
+        self.provider.connection_pool.get_connection.return_value = mock_context
+        return mock_w3
+    
+    def test_estimate_gas_optimized(self):
+        """Test gas estimation with optimization"""
+        mock_w3 = self._mock_fee_connection()
         
         # Estimate gas
         transaction = {
@@ -179,8 +288,71 @@ class TestPolygonProvider(unittest.TestCase):
         self.assertIn('max_fee_per_gas', gas_estimate)
         self.assertIn('estimated_cost_ether', gas_estimate)
         self.assertEqual(gas_estimate['priority_level'], 'fast')
+        # Next-block base fee from fee history, fast tier = 75th percentile
+        self.assertEqual(gas_estimate['base_fee'], 25000000000)
+        self.assertEqual(gas_estimate['max_priority_fee_per_gas'], 50000000000)
         # Check buffer was applied (1.2x)
         self.assertEqual(gas_estimate['gas_limit'], 25200)  # 21000 * 1.2
+        mock_w3.eth.fee_history.assert_called_once()
+    
+    def test_estimate_gas_cached_within_block(self):
+        """Test repeated estimates reuse the fee sample and memoized gas limit"""
+        mock_w3 = self._mock_fee_connection()
+        transaction = {
+            'from': '0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb9',
+            'to': '0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb9',
+            'data': '0xa9059cbb' + '00' * 64
+        }
+        
+        for level in ('slow', 'standard', 'instant'):
+            self.provider.estimate_gas_optimized(dict(transaction), level)
+        
+        mock_w3.eth.fee_history.assert_called_once()
+        mock_w3.eth.estimate_gas.assert_called_once()
+        
+        # A new block invalidates fees but not gas limits
+        self.provider.gas_oracle.observe_block(200)
+        self.provider.estimate_gas_optimized(dict(transaction))
+        
+        self.assertEqual(mock_w3.eth.fee_history.call_count, 2)
+        mock_w3.eth.estimate_gas.assert_called_once()
+        # Memoized limits skip the node entirely unless preflighting is enabled
+        mock_w3.eth.call.assert_not_called()
+    
+    def test_cached_gas_is_per_sender_and_preflighted(self):
+        """Test another sender re-estimates and opt-in preflighting catches a reverting cached send"""
+        from web3.exceptions import ContractLogicError
+        mock_w3 = self._mock_fee_connection()
+        transaction = {
+            'from': '0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb9',
+            'to': '0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb9',
+            'data': '0xa9059cbb' + '00' * 64
+        }
+        other_sender = dict(transaction, **{'from': '0x853d955aCEf822Db058eb8505911ED77F175b99e'})
+        self.provider.retry_config.max_retries = 1
+        
+        self.provider.estimate_gas_optimized(dict(transaction))
+        self.provider.estimate_gas_optimized(other_sender)
+        self.assertEqual(mock_w3.eth.estimate_gas.call_count, 2)
+        
+        self.provider.estimate_gas_optimized(dict(transaction))
+        mock_w3.eth.call.assert_not_called()
+        
+        self.provider.gas_config.preflight_cached_gas = True
+        mock_w3.eth.call.side_effect = ContractLogicError("execution reverted: not verified")
+        with self.assertRaises(ContractLogicError):
+            self.provider.estimate_gas_optimized(dict(transaction))
+    
+    def test_estimate_gas_without_fee_history(self):
+        """Test endpoints without eth_feeHistory fall back to eth_gasPrice"""
+        mock_w3 = self._mock_fee_connection()
+        mock_w3.eth.fee_history.side_effect = ValueError('method not found')
+        mock_w3.eth.gas_price = 25000000000
+        
+        gas_estimate = self.provider.estimate_gas_optimized({'to': '0x01'}, 'standard')
+        
+        self.assertEqual(gas_estimate['base_fee'], 25000000000)
+        self.assertEqual(gas_estimate['max_priority_fee_per_gas'], 30000000000)
     
     def test_retry_operation(self):
         """Test retry logic with exponential backoff"""
@@ -223,17 +395,25 @@ class TestPolygonProvider(unittest.TestCase):
             rawTransaction=b'signed_tx'
         )
         mock_w3.eth.send_raw_transaction.return_value = b'txhash123'
-        mock_w3.eth.wait_for_transaction_receipt.return_value = {
-            'status': 1,
-            'blockNumber': 12345,
-            'gasUsed': 21000,
-            'effectiveGasPrice': 25000000000
-        }
         
         mock_context = MagicMock()
         mock_context.__enter__ = Mock(return_value=mock_w3)
         mock_context.__exit__ = Mock(return_value=None)
         mock_get_conn.return_value = mock_context
+        self.provider.connection_pool.get_connection.return_value = mock_context
+        
+        # Receipt arrives through the background tracker
+        from concurrent.futures import Future
+        receipt_future = Future()
+        receipt_future.set_result({
+            'status': 1,
+            'blockNumber': 12345,
+            'gasUsed': 21000,
+            'effectiveGasPrice': 25000000000
+        })
+        self.provider.receipt_tracker.track = Mock(return_value=receipt_future)
+        
+        self.provider.signer.sign = Mock(return_value=MagicMock(rawTransaction=b'signed_tx'))
         
         # Mock gas estimation
         self.provider.estimate_gas_optimized = Mock(return_value={
@@ -260,6 +440,76 @@ class TestPolygonProvider(unittest.TestCase):
             result['transaction_hash'],
             self.provider.pending_transactions
         )
+        self.provider.receipt_tracker.track.assert_called_once()
+        mock_w3.eth.wait_for_transaction_receipt.assert_not_called()
+        self.assertEqual(mock_w3.eth.get_transaction_count.call_args[0][1], 'pending')
+        # Signed offline with the cached account, not through the connection
+        self.provider.signer.sign.assert_called_once()
+        mock_w3.eth.account.sign_transaction.assert_not_called()
+        mock_w3.eth.send_raw_transaction.assert_called_once_with(b'signed_tx')
+    
+    def test_send_transactions_batch(self):
+        """Test batch sends assign consecutive nonces and keep input order"""
+        mock_w3 = MagicMock()
+        mock_w3.eth.get_transaction_count.return_value = 7
+        mock_w3.eth.send_raw_transaction.side_effect = lambda raw: raw[::-1]
+        
+        mock_context = MagicMock()
+        mock_context.__enter__ = Mock(return_value=mock_w3)
+        mock_context.__exit__ = Mock(return_value=None)
+        self.provider.connection_pool.get_connection.return_value = mock_context
+        self.provider.receipt_tracker.track = Mock(return_value=Mock())
+        
+        key = '0x' + '11' * 32
+        txs = [
+            {'to': '0x742d35CC6634C0532925A3b844Bc9E7595F0bEb9', 'value': i, 'gas': 21000,
+             'maxFeePerGas': 10**10, 'maxPriorityFeePerGas': 10**9}
+            for i in range(3)
+        ]
+        
+        results = self.provider.send_transactions(txs, key)
+        
+        self.assertEqual([r['nonce'] for r in results], [7, 8, 9])
+        self.assertTrue(all(r['status'] == 'pending' for r in results))
+        self.assertEqual(len(set(r['transaction_hash'] for r in results)), 3)
+        self.assertEqual(mock_w3.eth.send_raw_transaction.call_count, 3)
+        self.assertEqual(self.provider.pending_transactions.count('pending'), 3)
+    
+    @patch('polygon_provider.time.sleep')
+    def test_already_known_counts_as_sent(self, mock_sleep):
+        """Test a retry the node reports as 'already known' returns the signed hash"""
+        mock_w3 = MagicMock()
+        mock_w3.eth.get_transaction_count.return_value = 7
+        mock_w3.eth.send_raw_transaction.side_effect = [
+            TimeoutError("broadcast timed out"),
+            ValueError({'code': -32000, 'message': 'already known'})
+        ]
+        
+        mock_context = MagicMock()
+        mock_context.__enter__ = Mock(return_value=mock_w3)
+        mock_context.__exit__ = Mock(return_value=None)
+        self.provider.connection_pool.get_connection.return_value = mock_context
+        self.provider.receipt_tracker.track = Mock(return_value=Mock())
+        
+        key = '0x' + '11' * 32
+        tx = {'to': '0x742d35CC6634C0532925A3b844Bc9E7595F0bEb9', 'value': 1, 'gas': 21000,
+              'maxFeePerGas': 10**10, 'maxPriorityFeePerGas': 10**9}
+        
+        result = self.provider.send_transaction(dict(tx), key, wait_for_receipt=False)
+        
+        expected = self.provider.signer.sign(dict(tx, chainId=self.provider.chain_id, nonce=7), key)
+        self.assertEqual(result['transaction_hash'], expected.hash.hex())
+        self.assertEqual(result['status'], 'pending')
+        # The nonce was reused for the retry and is now confirmed, not reclaimed
+        stats = self.provider.nonce_manager.get_stats()[result['from']]
+        self.assertEqual(stats['reclaimed'], [])
+        self.assertEqual(self.provider.nonce_manager.allocate(result['from']), 8)
+        
+        # Batch sends report the same error as a successful broadcast
+        mock_w3.eth.send_raw_transaction.side_effect = ValueError("known transaction")
+        results = self.provider.send_transactions([dict(tx)], key)
+        self.assertEqual(results[0]['status'], 'pending')
+        self.assertNotIn('error', results[0])
     
     @patch('polygon_provider.ConnectionPool.get_connection')
     def test_monitor_transaction_confirmed(self, mock_get_conn):
@@ -319,35 +569,97 @@ class TestPolygonProvider(unittest.TestCase):
         self.assertEqual(status['status'], 'pending')
         self.assertNotIn('confirmations', status)
     
-    @patch('polygon_provider.ConnectionPool.get_connection')
-    def test_batch_request(self, mock_get_conn):
-        """Test batch request execution"""
-        # Setup mock
+    def _mock_batch_connection(self):
+        """Wire the provider's pool to hand out a mock HTTP-backed Web3"""
         mock_w3 = MagicMock()
-        mock_w3.eth.block_number = 12345
-        mock_w3.eth.gas_price = 25000000000
-        mock_w3.eth.get_balance.return_value = 1000000000000000000
+        mock_w3.provider.endpoint_uri = 'http://test.rpc'
+        mock_w3.provider.get_request_kwargs.return_value = {}
+        mock_w3.eth = Web3().eth
         
         mock_context = MagicMock()
         mock_context.__enter__ = Mock(return_value=mock_w3)
         mock_context.__exit__ = Mock(return_value=None)
-        mock_get_conn.return_value = mock_context
+        self.provider.connection_pool.get_connection.return_value = mock_context
+        return mock_w3
+    
+    @patch('polygon_provider.make_post_request')
+    def test_batch_request(self, mock_post):
+        """Test batch request is sent as a single JSON-RPC array"""
+        import json
+        self._mock_batch_connection()
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 2, 'result': '0xde0b6b3a7640000'},
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0x3039'},
+            {'jsonrpc': '2.0', 'id': 1, 'result': '0x5d21dba00'}
+        ]).encode()
         
         # Execute batch request
         requests = [
             ('block_number', []),
             ('gas_price', []),
-            ('get_balance', ['0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb9'])
+            ('get_balance', ['0x742d35CC6634C0532925A3b844Bc9E7595F0bEb9'])
         ]
         
         results = self.provider.batch_request(requests)
         
-        # Verify
+        # One round trip, results mapped back by id
+        self.assertEqual(mock_post.call_count, 1)
+        payload = json.loads(mock_post.call_args[0][1])
+        self.assertEqual([item['method'] for item in payload],
+                         ['eth_blockNumber', 'eth_gasPrice', 'eth_getBalance'])
+        self.assertEqual(payload[2]['params'][1], 'latest')
         self.assertEqual(len(results), 3)
         self.assertEqual(results[0], 12345)
         self.assertEqual(results[1], 25000000000)
         self.assertEqual(results[2], 1000000000000000000)
     
+    @patch('polygon_provider.make_post_request')
+    def test_batch_request_chunking_and_item_errors(self, mock_post):
+        """Test batches are chunked and per-item errors are isolated"""
+        import json
+        self._mock_batch_connection()
+        
+        def _respond(uri, data, **kwargs):
+            return json.dumps([
+                {'jsonrpc': '2.0', 'id': item['id'], 'error': {'code': -32000, 'message': 'boom'}}
+                if item['id'] == 3 else
+                {'jsonrpc': '2.0', 'id': item['id'], 'result': hex(item['id'])}
+                for item in json.loads(data)
+            ]).encode()
+        mock_post.side_effect = _respond
+        
+        results = self.provider.batch_request(
+            [('block_number', [])] * 5,
+            max_batch_size=2
+        )
+        
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(results[:3], [0, 1, 2])
+        self.assertEqual(results[3], {'error': 'boom'})
+        self.assertEqual(results[4], 4)
+    
+    @patch('polygon_provider.make_post_request')
+    def test_batch_request_fallback_when_rejected(self, mock_post):
+        """Test parallel single calls are used when batches are rejected"""
+        import json
+        mock_w3 = self._mock_batch_connection()
+        mock_post.return_value = json.dumps({
+            'jsonrpc': '2.0', 'id': None,
+            'error': {'code': -32600, 'message': 'batch requests not supported'}
+        }).encode()
+        mock_w3.provider.make_request.side_effect = lambda method, params: {
+            'jsonrpc': '2.0', 'id': 1, 'result': '0x10'
+        }
+        
+        results = self.provider.batch_request([('block_number', []), ('gas_price', [])])
+        
+        self.assertEqual(results, [16, 16])
+        self.assertEqual(mock_w3.provider.make_request.call_count, 2)
+        
+        # Endpoint is remembered and not sent batches again
+        self.provider.batch_request([('block_number', [])])
+        self.assertEqual(mock_post.call_count, 1)
+    
     def test_health_check(self):
         """Test comprehensive health check"""
         # Mock methods
@@ -355,13 +667,13 @@ class TestPolygonProvider(unittest.TestCase):
             'connected': True,
             'block_number': 12345
         })
-        self.provider.get_pending_transactions = Mock(return_value=[
-            {'status': 'pending'},
-            {'status': 'success'}
-        ])
+        self.provider.pending_transactions.add({'hash': '0x01', 'status': 'pending'})
+        self.provider.pending_transactions.add({'hash': '0x02', 'status': 'success'})
         self.provider.connection_pool.pool_size = 5
-        self.provider.connection_pool.pool = Mock()
-        self.provider.connection_pool.pool.qsize.return_value = 4
+        self.provider.connection_pool.available_connections.return_value = 4
+        self.provider.connection_pool.get_endpoint_stats.return_value = [
+            {'url': 'http://test.rpc', 'status': 'active'}
+        ]
         
         # Perform health check
         health = self.provider.health_check()
@@ -372,9 +684,332 @@ class TestPolygonProvider(unittest.TestCase):
         self.assertIn('connection', health['checks'])
         self.assertIn('pool', health['checks'])
         self.assertIn('transactions', health['checks'])
+        self.assertIn('endpoints', health['checks'])
         self.assertEqual(health['checks']['transactions']['pending_count'], 1)
 
 
+class TestTransactionSigner(unittest.TestCase):
+    """Test offline signing service"""
+    
+    KEY = '0x' + '22' * 32
+    TX = {
+        'to': '0x742d35CC6634C0532925A3b844Bc9E7595F0bEb9',
+        'value': 1,
+        'gas': 21000,
+        'maxFeePerGas': 10**10,
+        'maxPriorityFeePerGas': 10**9,
+        'nonce': 0,
+        'chainId': 80001
+    }
+    
+    def test_account_derived_once_per_key(self):
+        """Test derived accounts are cached and signing matches eth_account"""
+        signer = TransactionSigner()
+        with patch('polygon_provider.Account.from_key', wraps=Account.from_key) as from_key:
+            signer.account(self.KEY)
+            signer.account(self.KEY)
+        
+        from_key.assert_called_once_with(self.KEY)
+        signer.sign(self.TX, self.KEY)
+        signer.sign(self.TX, self.KEY)
+        self.assertEqual(
+            signer.sign(self.TX, self.KEY).rawTransaction,
+            Account.sign_transaction(self.TX, self.KEY).rawTransaction
+        )
+        self.assertEqual(signer.get_stats()['signed_inline'], 3)
+    
+    def test_pool_signing_matches_inline(self):
+        """Test process pool signatures equal inline signatures, in order"""
+        signer = TransactionSigner(max_workers=2, process_threshold=2)
+        txs = [dict(self.TX, nonce=n) for n in range(4)]
+        
+        try:
+            pooled = signer.sign_batch(txs, self.KEY)
+        finally:
+            signer.close()
+        
+        expected = [Account.sign_transaction(tx, self.KEY).rawTransaction for tx in txs]
+        self.assertEqual([signed.rawTransaction for signed in pooled], expected)
+        self.assertEqual(signer.get_stats()['signed_in_pool'], 4)
+    
+    def test_providers_share_one_signer(self):
+        """Test providers and token interfaces use the process-wide signer unless given one"""
+        from polygon_provider import shared_transaction_signer
+        with patch('polygon_provider.ConnectionPool'):
+            provider = PolygonProvider(rpc_urls=['http://test.rpc'])
+            own = PolygonProvider(rpc_urls=['http://test.rpc'], signer=TransactionSigner())
+        
+        self.assertIs(provider.signer, shared_transaction_signer)
+        self.assertIsNot(own.signer, shared_transaction_signer)
+
+
+class TestNonceManager(unittest.TestCase):
+    """Test per-account nonce allocation"""
+    
+    ADDRESS = '0x742d35CC6634C0532925A3b844Bc9E7595F0bEb9'
+    
+    def setUp(self):
+        """Setup nonce manager over a mock pool"""
+        self.mock_w3 = MagicMock()
+        self.mock_w3.eth.get_transaction_count.return_value = 10
+        
+        mock_context = MagicMock()
+        mock_context.__enter__ = Mock(return_value=self.mock_w3)
+        mock_context.__exit__ = Mock(return_value=None)
+        
+        self.pool = MagicMock()
+        self.pool.get_connection.return_value = mock_context
+        self.manager = NonceManager(self.pool)
+    
+    def test_seeds_from_pending_count_once(self):
+        """Test nonces are seeded from the pending count and then allocated locally"""
+        nonces = [self.manager.allocate(self.ADDRESS) for _ in range(3)]
+        
+        self.assertEqual(nonces, [10, 11, 12])
+        self.mock_w3.eth.get_transaction_count.assert_called_once_with(self.ADDRESS, 'pending')
+    
+    def test_concurrent_allocation_is_unique(self):
+        """Test concurrent threads never receive the same nonce"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            nonces = list(executor.map(lambda _: self.manager.allocate(self.ADDRESS), range(200)))
+        
+        self.assertEqual(sorted(nonces), list(range(10, 210)))
+    
+    def test_released_nonce_is_reused(self):
+        """Test a nonce released by a failed send is handed out again first"""
+        first = self.manager.allocate(self.ADDRESS)
+        second = self.manager.allocate(self.ADDRESS)
+        third = self.manager.allocate(self.ADDRESS)
+        self.manager.confirm(self.ADDRESS, first)
+        self.manager.confirm(self.ADDRESS, third)
+        
+        self.manager.release(self.ADDRESS, second, Exception("insufficient funds"))
+        
+        self.assertEqual(self.manager.allocate(self.ADDRESS), second)
+        self.assertEqual(self.manager.allocate(self.ADDRESS), 13)
+    
+    def test_resync_reclaims_only_released_nonces(self):
+        """Test broadcast nonces the node does not report are not handed out again"""
+        for _ in range(3):
+            self.manager.confirm(self.ADDRESS, self.manager.allocate(self.ADDRESS))
+        released = self.manager.allocate(self.ADDRESS)
+        self.manager.confirm(self.ADDRESS, self.manager.allocate(self.ADDRESS))
+        self.manager.release(self.ADDRESS, released, Exception("insufficient funds"))
+        
+        # Node only knows about nonce 10; 11 and 12 were broadcast but are not pending
+        self.mock_w3.eth.get_transaction_count.return_value = 11
+        self.manager.resync(self.ADDRESS)
+        
+        self.assertEqual(self.manager.allocate(self.ADDRESS), released)
+        self.assertEqual(self.manager.allocate(self.ADDRESS), 15)
+    
+    def test_consumed_nonce_triggers_resync(self):
+        """Test 'nonce too low' resyncs instead of reusing the nonce"""
+        nonce = self.manager.allocate(self.ADDRESS)
+        self.mock_w3.eth.get_transaction_count.return_value = 15
+        
+        self.manager.release(self.ADDRESS, nonce, Exception("nonce too low"))
+        
+        self.assertEqual(self.manager.allocate(self.ADDRESS), 15)
+    
+    def test_replacement_errors_are_treated_as_consumed(self):
+        """Test replacement and future-nonce errors resync instead of reusing the nonce"""
+        for message in ("replacement transaction underpriced", "Nonce too high: expected 20"):
+            nonce = self.manager.allocate(self.ADDRESS)
+            self.manager.release(self.ADDRESS, nonce, Exception(message))
+            self.assertNotIn(nonce, self.manager.get_stats()[self.ADDRESS]['reclaimed'])
+
+
+class TestReceiptTracker(unittest.TestCase):
+    """Test background receipt tracking"""
+    
+    @patch('polygon_provider.ConnectionPool')
+    def setUp(self, mock_pool):
+        """Setup provider whose RPC calls are mocked"""
+        self.provider = PolygonProvider(rpc_urls=['http://test.rpc'])
+        self.mock_w3 = MagicMock()
+        self.mock_w3.eth.block_number = 100
+        mock_context = MagicMock()
+        mock_context.__enter__ = Mock(return_value=self.mock_w3)
+        mock_context.__exit__ = Mock(return_value=None)
+        self.provider.connection_pool.get_connection.return_value = mock_context
+        
+        self.receipts = {}
+        self.provider.batch_request = Mock(side_effect=lambda requests: [
+            self.receipts.get(params[0]) for _, params in requests
+        ])
+        self.tracker = ReceiptTracker(self.provider)
+        self.tracker._ensure_running = Mock()
+    
+    def test_resolves_all_outstanding_in_one_batch(self):
+        """Test receipts for all tracked hashes are fetched together once per block"""
+        callback = Mock()
+        future_a = self.tracker.track('0xaa', callback=callback)
+        future_b = self.tracker.track('0xbb')
+        self.receipts['0xaa'] = {'status': 1, 'blockNumber': 100}
+        
+        self.assertEqual(self.tracker.poll(), 1)
+        self.provider.batch_request.assert_called_once()
+        self.assertEqual(len(self.provider.batch_request.call_args[0][0]), 2)
+        self.assertEqual(future_a.result(timeout=0)['blockNumber'], 100)
+        callback.assert_called_once_with('0xaa', {'status': 1, 'blockNumber': 100})
+        self.assertFalse(future_b.done())
+        
+        # Same block: no new receipt fetch
+        self.assertEqual(self.tracker.poll(), 0)
+        self.assertEqual(self.provider.batch_request.call_count, 1)
+        
+        # Next block resolves the remaining hash
+        self.mock_w3.eth.block_number = 101
+        self.receipts['0xbb'] = {'status': 0, 'blockNumber': 101}
+        self.assertEqual(self.tracker.poll(), 1)
+        self.assertEqual(future_b.result(timeout=0)['status'], 0)
+    
+    def test_updates_pending_transaction_status(self):
+        """Test monitored pending transactions are updated from receipts"""
+        self.provider.pending_transactions['0xcc'] = {
+            'hash': '0xcc', 'timestamp': time.time(), 'status': 'pending'
+        }
+        self.receipts['0xcc'] = {'status': 1, 'blockNumber': 100}
+        
+        self.tracker.poll()
+        
+        self.assertEqual(self.provider.pending_transactions['0xcc']['status'], 'success')
+    
+    def test_expired_tracking_times_out(self):
+        """Test futures past their deadline fail with TimeExhausted"""
+        from web3.exceptions import TimeExhausted
+        future = self.tracker.track('0xdd', timeout=0)
+        time.sleep(0.01)
+        
+        self.tracker.poll()
+        
+        with self.assertRaises(TimeExhausted):
+            future.result(timeout=0)
+    
+    def test_aged_out_pending_is_dropped(self):
+        """Test transactions unmined past max_pending_age are finalized as dropped"""
+        from web3.exceptions import TimeExhausted
+        self.provider.pending_transactions['0xee'] = {
+            'hash': '0xee', 'timestamp': time.time() - 7200, 'status': 'pending'
+        }
+        future = self.tracker.track('0xee')
+        
+        self.tracker.poll()
+        
+        self.assertEqual(self.provider.pending_transactions['0xee']['status'], 'dropped')
+        self.assertEqual(self.tracker.outstanding_count(), 0)
+        self.provider.batch_request.assert_not_called()
+        with self.assertRaises(TimeExhausted):
+            future.result(timeout=0)
+
+
+class TestTransactionStore(unittest.TestCase):
+    """Test bounded, indexed transaction store"""
+    
+    def _record(self, tx_hash, status='pending', sender='0xSender'):
+        return {'hash': tx_hash, 'status': status, 'from': sender, 'timestamp': time.time()}
+    
+    def test_status_counts_and_indexes(self):
+        """Test counts and filters follow status transitions"""
+        store = TransactionStore()
+        store.add(self._record('0xaa'))
+        store.add(self._record('0xbb', sender='0xOther'))
+        
+        self.assertEqual(store.count('pending'), 2)
+        self.assertEqual(len(store.by_address('0xOther')), 1)
+        
+        store.update_status('0xaa', 'success', block_number=10)
+        
+        self.assertEqual(store.count('pending'), 1)
+        self.assertEqual(store.count('success'), 1)
+        self.assertEqual(store.hashes('pending'), ['0xbb'])
+        self.assertEqual(store['0xaa']['block_number'], 10)
+        self.assertEqual(len(store.values(status='success', sender='0xSender')), 1)
+        self.assertFalse(store.update_status('0xunknown', 'success'))
+    
+    def test_finalized_entries_evicted(self):
+        """Test finalized entries are bounded by count and age"""
+        store = TransactionStore(max_finalized=2, finalized_ttl=3600)
+        for i in range(4):
+            store.add(self._record(f'0x{i}', status='success'))
+        store.add(self._record('0xpending'))
+        
+        self.assertEqual(len(store), 3)
+        self.assertNotIn('0x0', store)
+        self.assertIn('0xpending', store)
+        self.assertEqual(store.evicted, 2)
+        
+        store.finalized_ttl = 0
+        store.update_status('0xpending', 'failed')
+        
+        self.assertEqual(len(store), 0)
+    
+    def test_drop_stale_finalizes_old_pending(self):
+        """Test only pending entries older than max_age are dropped and become evictable"""
+        store = TransactionStore(finalized_ttl=3600)
+        store.add({**self._record('0xold'), 'timestamp': time.time() - 100})
+        store.add(self._record('0xnew'))
+        
+        self.assertEqual(store.drop_stale(50), ['0xold'])
+        self.assertEqual(store['0xold']['status'], 'dropped')
+        self.assertEqual(store.hashes('pending'), ['0xnew'])
+        self.assertIn('0xold', store.finalized)
+    
+    def test_persisted_pending_restored(self):
+        """Test in-flight transactions survive a restart"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'transactions.db')
+            store = TransactionStore(persist_path=path)
+            store.add(self._record('0xaa'))
+            store.add(self._record('0xbb'))
+            store.update_status('0xbb', 'success')
+            store.close()
+            
+            restored = TransactionStore(persist_path=path)
+            
+            self.assertEqual(restored.hashes('pending'), ['0xaa'])
+            self.assertNotIn('0xbb', restored)
+            restored.close()
+
+
+class TestGasOracle(unittest.TestCase):
+    """Test per-block fee tiers and gas limit memoization"""
+    
+    def setUp(self):
+        self.oracle = GasOracle(GasConfig())
+    
+    def test_priority_floor_applies_to_empty_blocks(self):
+        """Test tiers never drop below the configured minimum tip"""
+        self.oracle.update({
+            'oldestBlock': 10,
+            'baseFeePerGas': [1000, 1100],
+            'reward': [[0, 0, 0, 0]]
+        })
+        
+        base_fee, priority, max_fee = self.oracle.quote('instant')
+        
+        self.assertEqual(base_fee, 1100)
+        self.assertEqual(priority, 60000000000)  # 30 Gwei floor * 2.0
+        self.assertEqual(self.oracle.block_number, 10)
+        self.assertFalse(self.oracle.is_stale())
+    
+    def test_gas_limit_memo_keyed_by_call_shape(self):
+        """Test gas limits are shared per selector and calldata length"""
+        transfer = {'to': '0xToken', 'data': '0xa9059cbb' + '11' * 64}
+        other_args = {'to': '0xtoken', 'data': '0xa9059cbb' + '22' * 64}
+        longer = {'to': '0xToken', 'data': '0xa9059cbb' + '11' * 96}
+        
+        self.oracle.remember_gas(transfer, 50000)
+        self.oracle.remember_gas(other_args, 45000)
+        
+        self.assertEqual(self.oracle.cached_gas(other_args), 50000)
+        self.assertIsNone(self.oracle.cached_gas(longer))
+        self.assertIsNone(GasOracle.gas_limit_key({'data': '0x6080'}))
+
+
 class TestGasConfiguration(unittest.TestCase):
     """Test gas configuration and optimization"""
     
@@ -6,10 +6,14 @@ Tests provider connection, contract interaction, and event monitoring
 import pytest
 import asyncio
 import os
-from unittest.mock import Mock, patch, MagicMock
+import time
+import threading
+from unittest.mock import Mock, patch, MagicMock, AsyncMock, PropertyMock
 from decimal import Decimal
 
 from web3 import Web3
+from eth_abi import decode as abi_decode, encode as abi_encode
+from hexbytes import HexBytes
 from eth_account import Account
 
 # Import our blockchain modules
@@ -17,8 +21,21 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from core.providers.polygon_provider import PolygonProvider, create_polygon_provider
+from core.providers.async_polygon_provider import AsyncPolygonProvider
 from core.contracts.erc3643_token import ERC3643Token, ComplianceStatus
+from core.contracts.erc3643_handler import ERC3643Handler
+from core.contracts.multicall import MULTICALL3_ADDRESS, Multicall3
+from core.contracts.compliance_cache import ComplianceCache
+from core.contracts.single_flight import SingleFlight
 from core.event_monitor import EventMonitor, EventType, create_event_monitor
+from core.monitoring import event_monitor as threaded_monitor
+from core.monitoring.block_ranges import BlockRangeSplitter
+from core.monitoring.checkpoints import CheckpointMarker, SQLiteCheckpointStore, create_checkpoint_store
+from core.monitoring.reorgs import BlockRef, ReorgBuffer, ReorgRetraction
+from core.monitoring.subscriptions import SubscriptionFeed
+from core.monitoring.decoding import EventDecoderRegistry, STANDARD_EVENTS_ABI
+from core.monitoring.velocity import VelocityTracker
+from core.monitoring.sharding import ShardedWorkerPool, AsyncShardedWorkerPool, shard_index
 
 
 class TestPolygonProvider:
@@ -146,6 +163,95 @@ class TestPolygonProvider:
             assert 'transactions' in health['checks']
 
 
+class TestAsyncPolygonProvider:
+    """Test suite for the asyncio Polygon provider"""
+    
+    @pytest.fixture
+    def provider(self):
+        """Create an async provider without opening sessions"""
+        return AsyncPolygonProvider(rpc_urls=['https://rpc-mumbai.maticvigil.com'])
+    
+    def test_retry_uses_asyncio_sleep(self, provider):
+        """Test retry backoff awaits instead of blocking the loop"""
+        attempts = []
+        
+        async def flaky_operation():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise Exception("Network error")
+            return "success"
+        
+        with patch('core.providers.async_polygon_provider.asyncio.sleep',
+                   new_callable=AsyncMock) as mock_sleep, \
+                patch('time.sleep') as mock_time_sleep:
+            result = asyncio.run(provider._retry_operation(flaky_operation))
+        
+        assert result == "success"
+        assert mock_sleep.call_count == 2
+        mock_time_sleep.assert_not_called()
+    
+    def test_batch_request_single_round_trip(self, provider):
+        """Test async batch requests are sent as one JSON-RPC array"""
+        import json
+        from contextlib import asynccontextmanager
+        from web3 import AsyncWeb3
+        
+        mock_w3 = MagicMock()
+        mock_w3.provider.endpoint_uri = 'https://rpc-mumbai.maticvigil.com'
+        mock_w3.provider.get_request_kwargs.return_value = {}
+        mock_w3.eth = AsyncWeb3().eth
+        
+        @asynccontextmanager
+        async def get_connection(timeout=10.0):
+            yield mock_w3
+        
+        async def post(uri, data, **kwargs):
+            return json.dumps([
+                {'jsonrpc': '2.0', 'id': item['id'], 'result': '0x10'}
+                for item in json.loads(data)
+            ]).encode()
+        
+        provider.connection_pool.get_connection = get_connection
+        with patch('core.providers.async_polygon_provider.async_make_post_request',
+                   side_effect=post) as mock_post:
+            results = asyncio.run(provider.batch_request(
+                [('block_number', []), ('gas_price', [])]
+            ))
+        
+        assert results == [16, 16]
+        assert mock_post.call_count == 1
+    
+    def test_concurrent_sends_allocate_pending_nonces(self, provider):
+        """Test async sends share the signer and take distinct nonces seeded from the pending count"""
+        from contextlib import asynccontextmanager
+        from core.providers.polygon_provider import shared_transaction_signer
+        
+        mock_w3 = MagicMock()
+        mock_w3.eth.get_transaction_count = AsyncMock(return_value=7)
+        mock_w3.eth.send_raw_transaction = AsyncMock(side_effect=lambda raw: Web3.keccak(raw))
+        
+        @asynccontextmanager
+        async def get_connection(timeout=10.0):
+            yield mock_w3
+        
+        provider.connection_pool.get_connection = get_connection
+        key = "0x" + "11" * 32
+        tx = {'to': Web3.to_checksum_address("0x742d35cc6634c0532925a3b844bc9e7595f0beb0"), 'value': 1, 'gas': 21000,
+              'maxFeePerGas': 10**10, 'maxPriorityFeePerGas': 10**9}
+        
+        async def send_all():
+            return await asyncio.gather(*(
+                provider.send_transaction(dict(tx), key, wait_for_receipt=False) for _ in range(3)
+            ))
+        
+        results = asyncio.run(send_all())
+        
+        assert provider.signer is shared_transaction_signer
+        assert len({r['transaction_hash'] for r in results}) == 3
+        mock_w3.eth.get_transaction_count.assert_awaited_once_with(results[0]['from'], 'pending')
+        assert provider.nonce_manager.get_stats()[results[0]['from']]['next_nonce'] == 10
+
+
 class TestERC3643Token:
     """Test suite for ERC-3643 token interactions"""
     
@@ -259,6 +365,422 @@ class TestERC3643Token:
         assert result['identity_contract'] is not None
 
 
+class TestERC3643Handler:
+    """Test suite for ERC-3643 handler bulk operations"""
+    
+    VERIFIED = "0x853d955aCEf822Db058eb8505911ED77F175b992"
+    UNVERIFIED = "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0"
+    
+    @pytest.fixture
+    def provider(self):
+        """Create mock provider answering batched view calls"""
+        provider = MagicMock()
+        mock_context = MagicMock()
+        mock_context.__enter__ = Mock(return_value=Web3())
+        mock_context.__exit__ = Mock(return_value=None)
+        provider.connection_pool.get_connection.return_value = mock_context
+        provider.signer.account.return_value.address = "0x0000000000000000000000000000000000000001"
+        
+        def handler_selector(fn_name):
+            return Web3.keccak(text=f"{fn_name}(address)").hex()[:10]
+        
+        def view_call(data):
+            # Only VERIFIED is verified, nobody is frozen
+            data = '0x' + bytes(HexBytes(data)).hex()
+            verified = data.startswith(handler_selector('isVerified')) and self.VERIFIED[2:].lower() in data
+            return (1 if verified else 0).to_bytes(32, 'big')
+        
+        def batch_request(requests):
+            # Answers aggregate3 calls the way Multicall3 does
+            results = []
+            for _, (call, *_) in requests:
+                data = bytes(HexBytes(call['data']))
+                assert call['to'] == MULTICALL3_ADDRESS
+                (calls,) = abi_decode(['(address,bool,bytes)[]'], data[4:])
+                results.append(abi_encode(
+                    ['(bool,bytes)[]'], [[(True, view_call(calldata)) for _, _, calldata in calls]]
+                ))
+            return results
+        
+        provider.batch_request.side_effect = batch_request
+        provider.send_transactions.side_effect = lambda txs, key, **kwargs: [
+            {'transaction_hash': f'0x{i:064x}', 'nonce': i, 'status': 'pending'}
+            for i in range(len(txs))
+        ]
+        return provider
+    
+    @pytest.fixture
+    def handler(self, provider):
+        """Create handler without loading on-chain metadata"""
+        with patch.object(ERC3643Handler, '_load_metadata'):
+            return ERC3643Handler(
+                provider, "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174", compliance_cache=ComplianceCache()
+            )
+    
+    def test_bulk_mint_streams_results_in_order(self, handler, provider):
+        """Test compliance is batched and only eligible recipients are sent"""
+        recipients = [(self.VERIFIED, 10), (self.UNVERIFIED, 20), ("not-an-address", 30),
+                      (self.VERIFIED, 40)]
+        
+        results = list(handler.bulk_mint(recipients, "0x" + "11" * 32, chunk_size=10))
+        
+        assert [r['status'] for r in results] == ['pending', 'rejected', 'rejected', 'pending']
+        assert [r['amount'] for r in results] == [10, 20, 30, 40]
+        assert results[1]['reason'] == "Recipient is not KYC verified"
+        # One batched compliance round trip and one batched send for the chunk
+        assert provider.batch_request.call_count == 1
+        sent = provider.send_transactions.call_args[0][0]
+        assert len(sent) == 2
+        assert all(tx['to'] == handler.contract_address for tx in sent)
+    
+    def test_failed_compliance_read_is_an_error(self, handler, provider):
+        """Test a recipient whose isVerified read failed is reported as retryable, not unverified"""
+        respond = provider.batch_request.side_effect
+        
+        def batch_request(requests):
+            # Fail the isVerified sub-call for UNVERIFIED
+            (result,) = respond(requests)
+            (calls,) = abi_decode(['(bool,bytes)[]'], result)
+            calls = [(False, b'') if i == 2 else call for i, call in enumerate(calls)]
+            return [abi_encode(['(bool,bytes)[]'], [calls])]
+        
+        provider.batch_request.side_effect = batch_request
+        results = list(handler.bulk_mint([(self.VERIFIED, 10), (self.UNVERIFIED, 20)], "0x" + "11" * 32))
+        
+        assert [r['status'] for r in results] == ['pending', 'error']
+        assert 'KYC' not in results[1]['error']
+        assert handler.compliance_cache.get(handler.contract_address, self.UNVERIFIED) is None
+    
+    def test_can_transfer_is_one_round_trip(self, handler, provider):
+        """Test every read of a transfer check goes out in a single aggregated eth_call"""
+        result = handler.can_transfer(self.VERIFIED, self.UNVERIFIED, 5)
+        
+        # batch_request retries on its own; no retry loop is wrapped around it
+        provider._retry_operation.assert_not_called()
+        assert provider.batch_request.call_count == 1
+        assert len(provider.batch_request.call_args[0][0]) == 1
+        assert result['from_verified'] and not result['to_verified']
+        assert result['reasons'] == ["Recipient is not KYC verified", "Insufficient balance"]
+    
+    def test_writes_release_connection_before_sending(self, handler, provider):
+        """Test mint only holds a pooled connection to build, with the gas already set"""
+        handler.compliance_cache.set(handler.contract_address, self.VERIFIED, True, False)
+        checked_out, held = [], []
+        context = provider.connection_pool.get_connection.return_value
+        context.__enter__.side_effect = lambda *args: checked_out.append(1) or Web3()
+        context.__exit__.side_effect = lambda *args: checked_out.pop()
+        
+        def estimate(transaction, priority_level):
+            held.append(len(checked_out))
+            return {'gas_limit': 90000, 'max_priority_fee_per_gas': 30, 'max_fee_per_gas': 60}
+        
+        def send(transaction, private_key, wait_for_receipt):
+            held.append(len(checked_out))
+            return {'status': 'success'}
+        
+        provider.estimate_gas_optimized.side_effect = estimate
+        provider.send_transaction.side_effect = send
+        
+        handler.mint_tokens(self.VERIFIED, 10, "0x" + "11" * 32)
+        
+        assert held == [0, 0]
+        estimate_tx = provider.estimate_gas_optimized.call_args[0][0]
+        assert estimate_tx['from'] == "0x0000000000000000000000000000000000000001"
+        sent = provider.send_transaction.call_args[0][0]
+        assert (sent['gas'], sent['maxFeePerGas']) == (90000, 60)
+    
+    def test_calls_run_on_the_checked_out_connection(self, handler, provider):
+        """Test each pooled connection gets its own contract object, built once"""
+        provider._retry_operation.side_effect = lambda operation: operation()
+        connections = [MagicMock(), MagicMock()]
+        for i, w3 in enumerate(connections):
+            w3.to_checksum_address = Web3.to_checksum_address
+            w3.eth.contract.return_value.functions.balanceOf.return_value.call.return_value = i
+        
+        checkouts = iter(connections * 2)
+        
+        def get_connection():
+            context = MagicMock()
+            context.__enter__ = Mock(return_value=next(checkouts))
+            context.__exit__ = Mock(return_value=None)
+            return context
+        
+        provider.connection_pool.get_connection.side_effect = get_connection
+        balances = [handler.get_balance(self.VERIFIED)['balance_raw'] for _ in range(4)]
+        
+        assert balances == [0, 1, 0, 1]
+        assert [w3.eth.contract.call_count for w3 in connections] == [1, 1]
+    
+    def test_transfer_filter_created_on_checked_out_connection(self, handler, provider):
+        """Test the Transfer filter is created and first polled on a pooled connection"""
+        w3 = MagicMock()
+        provider.connection_pool.get_connection.return_value.__enter__.return_value = w3
+        event_filter = w3.eth.contract.return_value.events.Transfer.create_filter.return_value
+        event_filter.get_new_entries.return_value = ['event']
+        seen = []
+        
+        assert handler.watch_transfer_events(from_block=7, callback=seen.append) is event_filter
+        
+        w3.eth.contract.return_value.events.Transfer.create_filter.assert_called_once_with(fromBlock=7)
+        assert seen == ['event']
+    
+    def test_at_block_pins_and_memoizes_reads(self, handler, provider):
+        """Test reads in a snapshot use its block, repeat for free and skip the latest cache"""
+        
+        with handler.at_block(500) as snapshot:
+            first = handler.can_transfer(self.VERIFIED, self.UNVERIFIED, 5)
+            second = handler.can_transfer(self.VERIFIED, self.UNVERIFIED, 5)
+            handler.bulk_balances([self.VERIFIED])
+            assert handler.pinned_block == 500
+        
+        assert handler.pinned_block is None
+        assert first == second and first['block_number'] == 500
+        # The six reads went out once; the repeat check and the balance came from the snapshot
+        assert provider.batch_request.call_count == 1
+        assert provider.batch_request.call_args[0][0][0][1][1] == 500
+        assert snapshot.get_stats()['memoized_reads'] == 6
+        assert len(handler.compliance_cache) == 0
+        
+        with handler.at_block(500):
+            handler.can_transfer(self.VERIFIED, self.UNVERIFIED, 5)
+        assert provider.batch_request.call_count == 1
+        assert handler.can_transfer(self.VERIFIED, self.UNVERIFIED, 5)['block_number'] is None
+        assert provider.batch_request.call_count == 2
+    
+    def test_pinned_compliance_check_reads_at_block(self, handler, provider):
+        """Test check_compliance inside at_block() reads once at that block"""
+        with handler.at_block(42):
+            first = handler.check_compliance(self.VERIFIED)
+            second = handler.check_compliance(self.VERIFIED)
+        
+        assert provider.batch_request.call_count == 1
+        assert provider.batch_request.call_args[0][0][0][1][1] == 42
+        assert first['verified'] and not first['cached'] and second['cached']
+        assert handler.compliance_cache.get(handler.contract_address, self.VERIFIED) is None
+    
+    def test_cached_compliance_keeps_frozen_flag(self, handler, provider):
+        """Test cache hits return the full status and freeze events evict them"""
+        handler.can_transfer(self.VERIFIED, self.UNVERIFIED, 5)
+        provider.batch_request.reset_mock()
+        
+        status = handler.bulk_check_compliance([self.VERIFIED, self.UNVERIFIED])
+        assert provider.batch_request.call_count == 0
+        assert status[Web3.to_checksum_address(self.VERIFIED)] == {
+            'address': Web3.to_checksum_address(self.VERIFIED),
+            'verified': True, 'frozen': False, 'cached': True, 'can_transact': True
+        }
+        
+        handler.compliance_cache.invalidate_event(handler.contract_address, 'Freeze', {'account': self.VERIFIED})
+        status = handler.bulk_check_compliance([self.VERIFIED, self.UNVERIFIED])
+        assert provider.batch_request.call_count == 1
+        assert not status[Web3.to_checksum_address(self.VERIFIED)]['cached']
+        assert status[Web3.to_checksum_address(self.UNVERIFIED)]['cached']
+    
+    def test_concurrent_compliance_checks_coalesce(self, handler, provider):
+        """Test simultaneous checks of one investor share a single aggregated read"""
+        release = threading.Event()
+        respond = provider.batch_request.side_effect
+        provider.batch_request.side_effect = lambda requests: release.wait(5) and respond(requests)
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(handler.check_compliance(self.VERIFIED)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while handler.compliance_cache.flights.get_stats()['coalesced'] < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        assert provider.batch_request.call_count == 1
+        assert len(results) == 5 and all(r['can_transact'] and not r['cached'] for r in results)
+        assert handler.check_compliance(self.VERIFIED)['cached']
+    
+    def test_bulk_compliance_and_balances_chunk_into_one_batch(self, handler, provider):
+        """Test thousands of holders are answered by a few aggregate calls"""
+        holders = [Web3.to_checksum_address(f"0x{i:040x}") for i in range(1, 1200)] + [self.VERIFIED]
+        handler.multicall.max_calls = 500
+        
+        statuses = handler.bulk_check_compliance(holders, use_cache=False)
+        balances = handler.bulk_balances(holders)
+        
+        assert provider.batch_request.call_count == 2
+        assert [len(call[0][0]) for call in provider.batch_request.call_args_list] == [5, 3]
+        assert [a for a, status in statuses.items() if status['verified']] == [Web3.to_checksum_address(self.VERIFIED)]
+        assert len(balances) == 1200 and set(balances.values()) == {0}
+    
+    def test_transaction_history_reads_index(self, handler, provider):
+        """Test indexed history is served from the event index and only the tail from logs"""
+        sender, recipient = Web3.to_checksum_address(self.VERIFIED), Web3.to_checksum_address(self.UNVERIFIED)
+        row = Mock(from_address=sender, to_address=recipient, amount=Decimal(25),
+                   block_number=120, transaction_hash='0x' + 'ab' * 32)
+        handler.indexer = Mock()
+        handler.indexer.indexed_prefix.return_value = 150
+        handler.indexer.get_history.return_value = [row]
+        tail = {'args': {'from': sender, 'to': recipient, 'value': 5},
+                'blockNumber': 160, 'transactionHash': HexBytes('0x' + 'cd' * 32)}
+        contract = Mock()
+        contract.events.Transfer.create_filter.return_value.get_all_entries.side_effect = [[tail], []]
+        handler._bind = Mock(return_value=contract)
+        
+        history = handler.get_transaction_history(self.VERIFIED.lower(), from_block=100)
+        
+        assert [(entry['block_number'], entry['amount']) for entry in history] == [(160, 5), (120, 25)]
+        assert history[1] == {'type': 'sent', 'from': sender, 'to': recipient,
+                              'amount': 25, 'block_number': 120, 'transaction_hash': '0x' + 'ab' * 32}
+        assert handler.indexer.get_history.call_args.kwargs == {
+            'address': sender, 'from_block': 100, 'to_block': 150, 'event_types': ['Transfer']
+        }
+        assert contract.events.Transfer.create_filter.call_args.kwargs['fromBlock'] == 151
+    
+    def test_transaction_history_within_index_skips_logs(self, handler, provider):
+        """Test a range ending inside the index never creates log filters"""
+        handler.indexer = Mock()
+        handler.indexer.indexed_prefix.return_value = 140
+        handler.indexer.get_history.return_value = []
+        handler._bind = Mock()
+        
+        assert handler.get_transaction_history(self.VERIFIED, from_block=100, to_block=140) == []
+        handler._bind.assert_not_called()
+
+
+class TestMulticall3:
+    """Test suite for Multicall3 aggregation"""
+    
+    def test_falls_back_to_plain_calls_when_aggregate_fails(self):
+        """Test a failed aggregate3 is retried as individual eth_calls in order"""
+        provider = MagicMock()
+        provider.batch_request.side_effect = [
+            [{'error': 'execution reverted'}],
+            [b'\x01' * 32, {'error': 'execution reverted'}]
+        ]
+        multicall = Multicall3(provider)
+        target = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+        
+        results = multicall.call([(target, '0x12345678'), (target, b'\x9a\xbc\xde\xf0')])
+        
+        assert results == [b'\x01' * 32, None]
+        direct = provider.batch_request.call_args[0][0]
+        assert [params[0]['data'] for _, params in direct] == ['0x12345678', '0x9abcdef0']
+        assert multicall.get_stats()['fallback_chunks'] == 1
+
+
+class TestComplianceCache:
+    """Test suite for the shared compliance status cache"""
+    
+    TOKEN_A = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+    TOKEN_B = "0x853d955aCEf822Db058eb8505911ED77F175b992"
+    INVESTOR = "0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb0"
+    
+    def test_lru_bound_and_ttl(self):
+        """Test least recently used entries are evicted and expired ones missed"""
+        cache = ComplianceCache(max_entries=2, ttl=60)
+        cache.set(self.TOKEN_A, "0x" + "01" * 20, True, False, now=0)
+        cache.set(self.TOKEN_A, "0x" + "02" * 20, True, False, now=0)
+        assert cache.get(self.TOKEN_A, "0x" + "01" * 20, now=1) is not None
+        cache.set(self.TOKEN_A, "0x" + "03" * 20, False, True, now=1)
+        
+        assert cache.get(self.TOKEN_A, "0x" + "02" * 20, now=1) is None
+        status = cache.get(self.TOKEN_A, "0x" + "03" * 20, now=2)
+        assert status.frozen and not status.can_transact
+        assert cache.get(self.TOKEN_A, "0x" + "01" * 20, now=61) is None
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_long_ttl_only_while_watched(self):
+        """Test entries outlive the short TTL only while a monitor invalidates the cache"""
+        cache = ComplianceCache(ttl=300, watched_ttl=3600)
+        cache.set(self.TOKEN_A, self.INVESTOR, True, False, now=0)
+        
+        cache.watch()
+        assert cache.get(self.TOKEN_A, self.INVESTOR, now=1000) is not None
+        cache.unwatch()
+        assert cache.get(self.TOKEN_A, self.INVESTOR, now=1000) is None
+    
+    def test_event_scopes(self):
+        """Test freezes clear one token and identity events clear every token"""
+        cache = ComplianceCache()
+        for token in (self.TOKEN_A, self.TOKEN_B):
+            cache.set(token, self.INVESTOR, True, False)
+        
+        assert cache.invalidate_event(self.TOKEN_A, 'Transfer', {'from': self.INVESTOR}) == 0
+        assert cache.invalidate_event(self.TOKEN_A, 'Freeze', {'account': self.INVESTOR.lower()}) == 1
+        assert cache.get(self.TOKEN_B, self.INVESTOR) is not None
+        assert cache.invalidate_event("0x" + "99" * 20, 'IdentityVerified', {'investor': self.INVESTOR}) == 1
+        assert len(cache) == 0
+    
+    def test_concurrent_lookups_share_one_read(self):
+        """Test a burst of lookups for one investor issues a single chain read"""
+        cache = ComplianceCache()
+        release = threading.Event()
+        reads = []
+        
+        def loader():
+            reads.append(1)
+            release.wait(5)
+            return True, False
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.lookup(self.TOKEN_A, self.INVESTOR, loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        while cache.flights.get_stats()['coalesced'] < 7:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        assert len(reads) == 1
+        assert len(results) == 8 and all(status.verified for status, _ in results)
+        assert cache.lookup(self.TOKEN_A, self.INVESTOR, loader) == (results[0][0], True)
+    
+    def test_stale_entry_served_while_refreshing(self):
+        """Test an entry past its TTL is returned at once and reloaded in the background"""
+        cache = ComplianceCache(ttl=60, stale_ttl=600)
+        cache.set(self.TOKEN_A, self.INVESTOR, True, False, now=time.time() - 120)
+        refreshed = threading.Event()
+        
+        def loader():
+            refreshed.set()
+            return True, True
+        
+        status, cached = cache.lookup(self.TOKEN_A, self.INVESTOR, loader)
+        assert cached and not status.frozen
+        assert refreshed.wait(5)
+        while cache.flights.get_stats()['in_flight']:
+            time.sleep(0.01)
+        assert cache.get(self.TOKEN_A, self.INVESTOR).frozen
+        assert cache.get_stats()['stale_hits'] == 1
+    
+    def test_single_flight_shares_exceptions(self):
+        """Test waiters see the leader's failure and the next call runs again"""
+        flights = SingleFlight()
+        future, leader = flights.join('key')
+        waiter, is_leader = flights.join('key')
+        assert leader and not is_leader and waiter is future
+        
+        with pytest.raises(ValueError):
+            flights.run('key', future, Mock(side_effect=ValueError("rpc down")))
+        with pytest.raises(ValueError):
+            waiter.result()
+        assert flights.do('key', lambda: 42) == 42
+    
+    def test_write_from_before_invalidation_is_discarded(self):
+        """Test a lookup racing a freeze event cannot cache its stale read"""
+        cache = ComplianceCache()
+        version = cache.version
+        cache.invalidate(self.INVESTOR, self.TOKEN_A)
+        cache.set(self.TOKEN_A, self.INVESTOR, True, False, version=version)
+        
+        assert cache.get(self.TOKEN_A, self.INVESTOR) is None
+        assert cache.get_stats()['discarded_writes'] == 1
+
+
 class TestEventMonitor:
     """Test suite for event monitoring"""
     
@@ -275,7 +797,11 @@ class TestEventMonitor:
     @pytest.fixture
     def monitor(self, mock_web3):
         """Create test event monitor"""
-        return EventMonitor(mock_web3, poll_interval=0.1)
+        return EventMonitor(
+            mock_web3,
+            poll_interval=0.1,
+            checkpoint_store=SQLiteCheckpointStore(':memory:')
+        )
     
     def test_monitor_initialization(self, monitor):
         """Test monitor initialization"""
@@ -357,6 +883,787 @@ class TestEventMonitor:
         # Events would be parsed from the mock logs
 
 
+class TestThreadedEventMonitor:
+    """Test suite for the threaded contract event monitor"""
+    
+    TOKEN_A = Web3.to_checksum_address("0x742d35cc6634c0532925a3b844bc9e7595f0beb0")
+    TOKEN_B = Web3.to_checksum_address("0x853d955acef822db058eb8505911ed77f175b992")
+    TRANSFER_ABI = [{
+        "name": "Transfer",
+        "type": "event",
+        "inputs": [
+            {"indexed": True, "name": "from", "type": "address"},
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": False, "name": "value", "type": "uint256"}
+        ]
+    }]
+    TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+    
+    @pytest.fixture
+    def w3(self):
+        """Create mock Web3 connection"""
+        mock = MagicMock()
+        mock.eth.block_number = 100
+        return mock
+    
+    @pytest.fixture
+    def chain(self):
+        """Block hashes by height; overwrite entries to simulate a reorg"""
+        return {}
+    
+    @staticmethod
+    def _hash(chain, number):
+        return chain.get(number, '0x' + f'{number:064x}')
+    
+    @pytest.fixture
+    def monitor(self, w3, chain):
+        """Create monitor on a mock provider"""
+        provider = MagicMock()
+        mock_context = MagicMock()
+        mock_context.__enter__ = Mock(return_value=w3)
+        mock_context.__exit__ = Mock(return_value=None)
+        provider.connection_pool.get_connection.return_value = mock_context
+        provider.batch_request.side_effect = lambda requests: [
+            {'number': n, 'hash': self._hash(chain, n), 'parentHash': self._hash(chain, n - 1)}
+            for _, (n, _) in requests
+        ]
+        return threaded_monitor.EventMonitor(
+            provider,
+            block_confirmations=0,
+            checkpoint_store=SQLiteCheckpointStore(':memory:')
+        )
+    
+    def _log(self, address, block, topic, log_index=0, block_hash=None):
+        log = {'address': address, 'blockNumber': block, 'topics': [bytes.fromhex(topic[2:])],
+               'data': '0x', 'transactionHash': b'\x01' * 32, 'logIndex': log_index}
+        if block_hash:
+            log['blockHash'] = block_hash
+        return log
+    
+    def _drain(self, monitor):
+        items = []
+        while not monitor.event_queue.empty():
+            items.append(monitor.event_queue.get_nowait())
+        return items
+    
+    def test_single_sweep_routes_logs(self, monitor, w3):
+        """Test one eth_getLogs covers all contracts and logs are routed per contract"""
+        monitor.add_contract(self.TOKEN_A, self.TRANSFER_ABI, "A", ["Transfer"])
+        monitor.add_contract(self.TOKEN_B, self.TRANSFER_ABI, "B", ["Transfer"])
+        
+        w3.eth.block_number = 105
+        w3.eth.get_logs.return_value = [
+            self._log(self.TOKEN_A, 101, self.TRANSFER_TOPIC),
+            self._log(self.TOKEN_B, 102, '0x' + '00' * 32),  # not a watched event
+            self._log(self.TOKEN_B, 103, self.TRANSFER_TOPIC)
+        ]
+        
+        monitor._check_new_blocks()
+        
+        w3.eth.get_logs.assert_called_once()
+        log_filter = w3.eth.get_logs.call_args[0][0]
+        assert set(log_filter['address']) == {self.TOKEN_A, self.TOKEN_B}
+        assert log_filter['topics'] == [[self.TRANSFER_TOPIC]]
+        assert (log_filter['fromBlock'], log_filter['toBlock']) == (101, 105)
+        items = self._drain(monitor)
+        assert len(items) == 3
+        assert isinstance(items[-1], CheckpointMarker)
+        assert items[-1].cursors == {self.TOKEN_A: 105, self.TOKEN_B: 105}
+        assert all(c.last_block_processed == 105 for c in monitor.monitored_contracts.values())
+    
+    def test_sweep_decodes_each_log_once(self, monitor, w3):
+        """Test logs are decoded once per sweep and the decoding travels with the queued event"""
+        monitor.add_contract(self.TOKEN_A, self.TRANSFER_ABI, "A", ["Transfer"])
+        monitor.shard_by = 'holder'
+        holder = Web3.to_checksum_address("0x" + "cd" * 20)
+        
+        log = self._log(self.TOKEN_A, 101, self.TRANSFER_TOPIC)
+        log['topics'] += [bytes(32), bytes(12) + bytes.fromhex(holder[2:])]
+        log['data'] = '0x' + (5).to_bytes(32, 'big').hex()
+        w3.eth.block_number = 101
+        w3.eth.get_logs.return_value = [log]
+        
+        with patch.object(monitor.decoders, 'decode_batch', wraps=monitor.decoders.decode_batch) as decode_batch, \
+                patch.object(monitor.decoders, 'decode', side_effect=AssertionError("decoded per event")):
+            monitor._check_new_blocks()
+            item = self._drain(monitor)[0]
+            assert monitor._shard_key(item) == holder
+            monitor._process_event_once(item)
+        
+        decode_batch.assert_called_once()
+        assert isinstance(item, threaded_monitor.QueuedEvent)
+        assert item.decoded.args['value'] == 5
+        assert monitor.metrics.events_by_type['transfer'] == 1
+    
+    def test_freeze_event_invalidates_compliance_cache(self, monitor):
+        """Test a processed Freeze log evicts the frozen investor on that token only"""
+        investor = Web3.to_checksum_address("0x" + "ab" * 20)
+        cache = monitor.compliance_cache = ComplianceCache()
+        cache.set(self.TOKEN_A, investor, True, False)
+        cache.set(self.TOKEN_B, investor, True, False)
+        
+        freeze_topic = '0x' + Web3.keccak(text='Freeze(address)').hex().removeprefix('0x')
+        log = self._log(self.TOKEN_A, 101, freeze_topic)
+        log['topics'].append(bytes(12) + bytes.fromhex(investor[2:]))
+        monitor._process_event(log, monitor.decoders.decode(log))
+        
+        assert cache.get(self.TOKEN_A, investor) is None
+        assert cache.get(self.TOKEN_B, investor) is not None
+        assert monitor.metrics.events_by_type['freeze'] == 1
+    
+    def test_resumes_from_checkpoint_and_skips_processed(self, monitor, w3):
+        """Test a restarted monitor resumes at the saved cursor and replays nothing twice"""
+        store = monitor.checkpoint_store
+        store.save_cursors({self.TOKEN_A: 90})
+        store.mark_processed('0x' + '01' * 32, 0, 95)
+        
+        monitor.add_contract(self.TOKEN_A, self.TRANSFER_ABI, "A", ["Transfer"])
+        assert monitor.monitored_contracts[self.TOKEN_A].last_block_processed == 90
+        
+        w3.eth.get_logs.return_value = [
+            self._log(self.TOKEN_A, 95, self.TRANSFER_TOPIC, log_index=0),
+            self._log(self.TOKEN_A, 95, self.TRANSFER_TOPIC, log_index=1)
+        ]
+        monitor._check_new_blocks()
+        assert w3.eth.get_logs.call_args[0][0]['fromBlock'] == 91
+        
+        with patch.object(monitor, '_process_event') as process_event:
+            for item in self._drain(monitor):
+                if isinstance(item, CheckpointMarker):
+                    store.save_cursors(item.cursors)
+                else:
+                    monitor._process_event_once(item)
+        
+        assert process_event.call_count == 1
+        assert process_event.call_args[0][0]['logIndex'] == 1
+        assert store.load_cursor(self.TOKEN_A) == 100
+    
+    def test_reorg_retracts_orphaned_events(self, monitor, w3, chain):
+        """Test events from orphaned blocks are retracted and the new fork replayed"""
+        monitor.add_contract(self.TOKEN_A, self.TRANSFER_ABI, "A", ["Transfer"])
+        
+        w3.eth.block_number = 105
+        w3.eth.get_logs.return_value = [
+            self._log(self.TOKEN_A, 104, self.TRANSFER_TOPIC, block_hash=self._hash(chain, 104))
+        ]
+        monitor._check_new_blocks()
+        self._drain(monitor)
+        
+        # Blocks 104 and 105 are replaced and the chain grows to 106
+        chain[104], chain[105] = '0x' + 'aa' * 32, '0x' + 'bb' * 32
+        w3.eth.block_number = 106
+        w3.eth.get_logs.return_value = [
+            self._log(self.TOKEN_A, 105, self.TRANSFER_TOPIC, block_hash=chain[105])
+        ]
+        monitor._check_new_blocks()
+        
+        items = self._drain(monitor)
+        retraction = items[0]
+        assert isinstance(retraction, ReorgRetraction)
+        assert retraction.fork_block == 104
+        assert [log['blockNumber'] for log in retraction.events] == [104]
+        assert items[1].cursors == {self.TOKEN_A: 103}
+        assert w3.eth.get_logs.call_args[0][0]['fromBlock'] == 104
+        assert items[2].log['blockNumber'] == 105
+        assert monitor.get_metrics()['reorgs']['reorgs'] == 1
+        
+        monitor._retract_events(retraction)
+        alert = monitor.alert_queue.get_nowait()
+        assert alert.event_type == threaded_monitor.EventType.REORG
+        assert alert.block_number == 104
+    
+    def test_logs_from_stale_fork_are_refetched(self, monitor, w3):
+        """Test a sweep is discarded when log block hashes disagree with the headers"""
+        monitor.add_contract(self.TOKEN_A, self.TRANSFER_ABI, "A", ["Transfer"])
+        
+        w3.eth.block_number = 105
+        w3.eth.get_logs.return_value = [
+            self._log(self.TOKEN_A, 104, self.TRANSFER_TOPIC, block_hash='0x' + 'ff' * 32)
+        ]
+        monitor._check_new_blocks()
+        
+        assert monitor.event_queue.empty()
+        assert monitor.monitored_contracts[self.TOKEN_A].last_block_processed == 100
+
+
+class TestBlockRangeSplitter:
+    """Test suite for adaptive eth_getLogs range sizing"""
+    
+    @staticmethod
+    def _provider(limit):
+        """Fake getLogs returning one log per block, rejecting ranges over limit blocks"""
+        calls = []
+        
+        def get_logs(start, end):
+            calls.append((start, end))
+            if end - start + 1 > limit:
+                raise ValueError("query returned more than 10000 results")
+            return list(range(start, end + 1))
+        
+        return get_logs, calls
+    
+    def test_splits_rejected_ranges_and_keeps_order(self):
+        """Test oversized ranges are halved and logs come back in block order"""
+        splitter = BlockRangeSplitter(initial_span=1000, max_concurrency=4)
+        get_logs, calls = self._provider(limit=300)
+        
+        logs = splitter.fetch(1, 2000, get_logs)
+        
+        assert logs == list(range(1, 2001))
+        assert splitter.span < 1000
+        assert splitter.get_stats()['splits'] > 0
+    
+    def test_span_grows_after_successes(self):
+        """Test the span recovers after consecutive successful requests"""
+        splitter = BlockRangeSplitter(initial_span=100, max_span=400, grow_after=2)
+        get_logs, _ = self._provider(limit=10000)
+        
+        splitter.fetch(1, 1000, get_logs)
+        
+        assert splitter.span == 400
+    
+    def test_non_range_errors_propagate(self):
+        """Test unrelated provider errors are not retried as splits"""
+        splitter = BlockRangeSplitter()
+        
+        def get_logs(start, end):
+            raise ValueError("invalid params")
+        
+        with pytest.raises(ValueError):
+            splitter.fetch(1, 10, get_logs)
+        assert splitter.get_stats()['splits'] == 0
+    
+    @patch('core.monitoring.block_ranges.time.sleep')
+    def test_rate_limits_back_off_without_splitting(self, mock_sleep):
+        """Test a throttled request is retried over the same range after a backoff"""
+        splitter = BlockRangeSplitter(initial_span=100, max_concurrency=1, rate_limit_backoff=0.5)
+        get_logs, calls = self._provider(limit=10000)
+        throttled = []
+        
+        def throttled_get_logs(start, end):
+            if len(throttled) < 2:
+                throttled.append((start, end))
+                raise ValueError("daily request limit exceeded")
+            return get_logs(start, end)
+        
+        logs = splitter.fetch(1, 100, throttled_get_logs)
+        
+        assert logs == list(range(1, 101))
+        assert throttled == [(1, 100), (1, 100)] and calls == [(1, 100)]
+        assert splitter.span == 100 and splitter.get_stats()['splits'] == 0
+        assert [call[0][0] for call in mock_sleep.call_args_list] == [0.5, 1.0]
+    
+    def test_async_fetch(self):
+        """Test asyncio sub-ranges are fetched with the same splitting"""
+        splitter = BlockRangeSplitter(initial_span=64, max_concurrency=3)
+        get_logs, _ = self._provider(limit=20)
+        
+        async def fetch_logs(start, end):
+            return get_logs(start, end)
+        
+        logs = asyncio.run(splitter.fetch_async(1, 500, fetch_logs))
+        
+        assert logs == list(range(1, 501))
+
+
+class TestReorgBuffer:
+    """Test suite for the recent block hash window"""
+    
+    @staticmethod
+    def _ref(number, fork=''):
+        parent = f'0x{fork}{number - 1:x}' if fork and number > 11 else f'0x{number - 1:x}'
+        return BlockRef(number, f'0x{fork}{number:x}', parent)
+    
+    def test_find_fork_and_rollback(self):
+        """Test the first orphaned block is found and its events returned"""
+        buffer = ReorgBuffer(depth=8)
+        assert buffer.record_blocks([self._ref(n) for n in range(10, 14)])
+        buffer.track(12, 'event-12')
+        buffer.track(13, 'event-13')
+        
+        canonical = {n: self._ref(n, 'f' if n >= 12 else '').hash for n in range(10, 14)}
+        fork_block = buffer.find_fork(canonical.get)
+        
+        assert fork_block == 12
+        assert buffer.rollback(fork_block) == ['event-12', 'event-13']
+        assert buffer.tip.number == 11
+    
+    def test_rejects_blocks_not_building_on_tip(self):
+        """Test a parent hash mismatch is refused and old blocks are released"""
+        buffer = ReorgBuffer(depth=3)
+        assert buffer.record_blocks([self._ref(n) for n in range(10, 15)])
+        assert list(buffer.blocks) == [12, 13, 14]
+        
+        assert not buffer.record_blocks([BlockRef(15, '0x15', '0xdead')])
+        assert buffer.tip.number == 14
+
+
+class TestVelocityTracker:
+    """Test suite for sliding-window velocity counts"""
+    
+    def test_counts_expire_with_window(self):
+        """Test per-key and overall counts drop once events leave the window"""
+        tracker = VelocityTracker(window=60, resolution=60)
+        assert tracker.record('token', 'alice', now=1000) == 1
+        assert tracker.record('token', 'bob', now=1030) == 2
+        
+        assert tracker.count('token', now=1030) == 2
+        assert tracker.count('alice', now=1030) == 1
+        assert tracker.count(now=1075) == 1
+        assert tracker.count('bob', now=1100) == 0
+    
+    def test_idle_keys_are_evicted(self):
+        """Test keys with nothing in the window are dropped and the key cap holds"""
+        tracker = VelocityTracker(window=10, resolution=10, max_keys=2)
+        tracker.record('alice', now=0)
+        tracker.record('bob', now=1)
+        tracker.record('carol', now=2)
+        assert list(tracker.keys) == ['bob', 'carol']
+        
+        tracker.record('dave', now=100)
+        assert list(tracker.keys) == ['dave']
+        assert tracker.get_stats()['evicted_keys'] == 3
+
+
+class TestShardedWorkerPool:
+    """Test suite for ordered sharded event processing"""
+    
+    def test_keeps_order_per_key_and_checkpoints_after_prior_items(self):
+        """Test items of a key stay ordered and broadcasts wait for every shard"""
+        handled, saved = [], []
+        pool = ShardedWorkerPool(handled.append, shards=3, max_pending=2)
+        pool.start()
+        try:
+            for n in range(20):
+                assert pool.submit(f'0xtoken{n % 4}', (n % 4, n), block_number=n)
+            pool.broadcast(lambda: saved.append(len(handled)))
+            pool.drain()
+        finally:
+            pool.stop()
+        
+        assert saved == [20]
+        for key in range(4):
+            assert [n for k, n in handled if k == key] == list(range(key, 20, 4))
+        assert sum(shard['processed'] for shard in pool.get_stats()) == 20
+    
+    def test_async_shards_run_concurrently(self):
+        """Test a slow shard does not hold back the others"""
+        slow_key = 'slow'
+        fast_key = next(f'fast{n}' for n in range(10) if shard_index(f'fast{n}', 2) != shard_index(slow_key, 2))
+        order = []
+        
+        async def handler(item):
+            if item == slow_key:
+                await asyncio.sleep(0.05)
+            order.append(item)
+        
+        async def run():
+            pool = AsyncShardedWorkerPool(handler, shards=2)
+            pool.start()
+            await pool.submit(slow_key, slow_key)
+            await pool.submit(fast_key, fast_key)
+            await pool.drain()
+            await pool.stop()
+        
+        asyncio.run(run())
+        assert order == [fast_key, slow_key]
+    
+    def test_async_broadcast_awaits_threaded_callback(self):
+        """Test a broadcast callback returning an awaitable runs off the loop before drain returns"""
+        saved = []
+        
+        async def handler(item):
+            pass
+        
+        async def run():
+            pool = AsyncShardedWorkerPool(handler, shards=2)
+            pool.start()
+            await pool.submit('a', 1)
+            await pool.broadcast(lambda: asyncio.to_thread(lambda: saved.append(threading.get_ident())))
+            await pool.drain()
+            await pool.stop()
+            return threading.get_ident()
+        
+        loop_thread = asyncio.run(run())
+        assert len(saved) == 1 and saved[0] != loop_thread
+
+
+class TestAsyncEventMonitorTasks:
+    """Test suite for the asyncio monitor's task handling"""
+    
+    def test_slow_rpc_does_not_block_loop_and_stop_cancels_tasks(self):
+        """Test RPC calls run off the loop and stop() drains and cancels every task"""
+        w3 = MagicMock()
+        
+        def slow_head():
+            time.sleep(0.3)
+            return 1000
+        type(w3.eth).block_number = PropertyMock(side_effect=slow_head)
+        monitor = EventMonitor(w3, poll_interval=0.05, checkpoint_store=SQLiteCheckpointStore(':memory:'))
+        
+        async def run():
+            await monitor.start()
+            tasks = [monitor.poll_task, monitor.router_task, *monitor.workers.tasks]
+            
+            largest_gap = 0.0
+            started = last = time.monotonic()
+            while last - started < 0.7:
+                await asyncio.sleep(0.01)
+                now = time.monotonic()
+                largest_gap, last = max(largest_gap, now - last), now
+            
+            await monitor.stop()
+            return largest_gap, tasks
+        
+        largest_gap, tasks = asyncio.run(run())
+        assert largest_gap < 0.15
+        assert all(task.done() for task in tasks)
+        assert monitor.poll_task is None and monitor.router_task is None
+    
+    def test_head_and_checkpoints_are_read_off_the_loop(self):
+        """Test construction and add_contract make no calls, and checkpoint I/O runs in threads"""
+        contract = Web3.to_checksum_address("0x" + "70" * 20)
+        w3 = MagicMock()
+        w3.to_checksum_address = Web3.to_checksum_address
+        head = PropertyMock(return_value=1000)
+        type(w3.eth).block_number = head
+        store = SQLiteCheckpointStore(':memory:')
+        store.save_cursors({contract: 500})
+        threads = []
+        for name in ('load_cursor', 'is_processed', 'mark_processed'):
+            original = getattr(store, name)
+            setattr(store, name, lambda *args, original=original: threads.append(threading.get_ident()) or original(*args))
+        
+        monitor = EventMonitor(w3, checkpoint_store=store)
+        monitor.add_contract(contract, [EventType.TRANSFER])
+        assert head.call_count == 0 and threads == []
+        
+        event = Mock(transaction_hash='0x' + 'ab' * 32, log_index=0, block_number=501,
+                     event_type='Transfer', contract_address=contract, args={})
+        
+        async def run():
+            await monitor._resume_from_checkpoints()
+            await monitor._handle_event(event)
+            return threading.get_ident()
+        
+        loop_thread = asyncio.run(run())
+        assert monitor.last_block == 500
+        assert len(threads) == 3 and loop_thread not in threads
+        assert store.is_processed(event.transaction_hash, 0)
+
+
+class TestSubscriptionFeed:
+    """Test suite for the WebSocket push feed"""
+    
+    @staticmethod
+    def _connection(messages):
+        """Mock persistent AsyncWeb3 context yielding the given subscription messages"""
+        async def stream():
+            for message in messages:
+                yield message
+        
+        w3 = MagicMock()
+        w3.eth.subscribe = AsyncMock(side_effect=['0xlogs', '0xheads'])
+        w3.ws.process_subscriptions = Mock(return_value=stream())
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=w3)
+        context.__aexit__ = AsyncMock(return_value=None)
+        return context
+    
+    def test_dispatches_heads_and_logs(self):
+        """Test pushed heads wake waiters and pushed logs reach the callback"""
+        pushed = []
+        messages = [
+            {'subscription': '0xlogs', 'result': {'blockNumber': 7}},
+            {'subscription': '0xheads', 'result': {'number': '0x7'}}
+        ]
+        feed = SubscriptionFeed(
+            'ws://node',
+            lambda: {'address': ['0x1']},
+            pushed.append,
+            reconnect_delay=0,
+            max_failures=1,
+            connect=lambda url: self._connection(messages)
+        )
+        
+        async def scenario():
+            await feed.run()
+            return await feed.wait_for_head(timeout=0.1)
+        
+        assert asyncio.run(scenario()) is True
+        assert pushed == [{'blockNumber': 7}]
+        assert feed.head == 7
+        assert feed.get_stats()['connects'] == 1
+    
+    def test_gives_up_after_failed_connects(self):
+        """Test the feed marks itself unavailable so monitors keep polling"""
+        attempts = []
+        
+        def connect(url):
+            attempts.append(url)
+            raise ConnectionError("refused")
+        
+        feed = SubscriptionFeed('ws://node', dict, reconnect_delay=0, max_failures=3, connect=connect)
+        asyncio.run(feed.run())
+        
+        assert len(attempts) == 3
+        assert feed.available is False
+        assert feed.connected is False
+
+
+class TestEventDecoderRegistry:
+    """Test suite for precompiled event log decoding"""
+    
+    SENDER = Web3.to_checksum_address("0x742d35cc6634c0532925a3b844bc9e7595f0beb0")
+    RECEIVER = Web3.to_checksum_address("0x853d955acef822db058eb8505911ed77f175b992")
+    TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+    
+    @staticmethod
+    def _word(value):
+        return bytes.fromhex(value[2:].rjust(64, '0')) if isinstance(value, str) else value.to_bytes(32, 'big')
+    
+    def _transfer_log(self, value, extra_topics=()):
+        return {
+            'address': self.SENDER,
+            'blockNumber': 10,
+            'blockHash': b'\x02' * 32,
+            'transactionHash': b'\x01' * 32,
+            'logIndex': 4,
+            'topics': [self._word(self.TRANSFER_TOPIC), self._word(self.SENDER),
+                       self._word(self.RECEIVER), *extra_topics],
+            'data': '0x' + self._word(value).hex()
+        }
+    
+    def test_decode_batch_into_slotted_records(self):
+        """Test logs are decoded in order and unknown layouts are skipped"""
+        registry = EventDecoderRegistry(STANDARD_EVENTS_ABI)
+        logs = [
+            self._transfer_log(5 * 10**18),
+            self._transfer_log(0, extra_topics=[self._word(7)]),  # ERC-721 layout
+            {'address': self.SENDER, 'blockNumber': 10, 'topics': [], 'data': '0x'}
+        ]
+        
+        decoded, erc721, anonymous = registry.decode_batch(logs)
+        
+        assert decoded.name == 'Transfer'
+        assert decoded.args == {'from': self.SENDER, 'to': self.RECEIVER, 'value': 5 * 10**18}
+        assert decoded.transaction_hash == '0x' + '01' * 32
+        assert decoded.log_index == 4
+        assert not hasattr(decoded, '__dict__')
+        assert erc721 is None and anonymous is None
+    
+    def test_registered_abi_handles_dynamic_data(self):
+        """Test events with non-word data fall back to full ABI decoding"""
+        abi = [{
+            "name": "DocumentUpdated",
+            "type": "event",
+            "inputs": [
+                {"indexed": True, "name": "name", "type": "bytes32"},
+                {"indexed": False, "name": "uri", "type": "string"},
+                {"indexed": False, "name": "version", "type": "uint256"}
+            ]
+        }]
+        registry = EventDecoderRegistry()
+        decoder = registry.register(abi)[0]
+        data = abi_encode(['string', 'uint256'], ['ipfs://doc', 3])
+        
+        event = registry.decode({
+            'address': self.SENDER,
+            'blockNumber': 1,
+            'transactionHash': '0x' + 'ab' * 32,
+            'topics': [decoder.topic_hex, b'prospectus'.ljust(32, b'\x00')],
+            'data': data
+        })
+        
+        assert event.args == {'name': b'prospectus'.ljust(32, b'\x00'), 'uri': 'ipfs://doc', 'version': 3}
+    
+    def test_threaded_monitor_identifies_freeze_events(self):
+        """Test event types come from real ERC-3643 topic hashes"""
+        topic = '0x' + Web3.keccak(text="TokensFrozen(address,uint256)").hex().removeprefix('0x')
+        
+        assert threaded_monitor.EVENT_TYPE_TOPICS[topic] == threaded_monitor.EventType.FREEZE
+
+
+class TestSQLiteCheckpointStore:
+    """Test suite for durable monitor checkpoints"""
+    
+    def test_cursors_survive_reopen(self, tmp_path):
+        """Test cursors are persisted and reloaded from the SQLite file"""
+        path = str(tmp_path / "checkpoints.db")
+        store = SQLiteCheckpointStore(path)
+        store.save_cursors({'0xA': 10, '0xB': 12})
+        store.save_cursors({'0xA': 15})
+        store.close()
+        
+        reopened = SQLiteCheckpointStore(path)
+        assert reopened.load_cursors() == {'0xA': 15, '0xB': 12}
+        assert reopened.load_cursor('0xC') is None
+        reopened.close()
+    
+    def test_processed_keys_are_pruned_below_lowest_cursor(self):
+        """Test event keys are recorded once and dropped once no replay can reach them"""
+        store = SQLiteCheckpointStore(':memory:')
+        
+        assert store.mark_processed('0xaa', 0, 10) is True
+        assert store.mark_processed('0xaa', 0, 10) is False
+        store.mark_processed('0xbb', 3, 20)
+        
+        store.save_cursors({'0xA': 15, '0xB': 25})
+        
+        assert store.is_processed('0xaa', 0) is False
+        assert store.is_processed('0xbb', 3) is True
+        
+        store.forget_processed(20)
+        assert store.is_processed('0xbb', 3) is False
+    
+    def test_namespaces_keep_cursors_and_pruning_apart(self, tmp_path):
+        """Test monitors sharing a file neither see nor prune each other's checkpoints"""
+        path = str(tmp_path / "checkpoints.db")
+        threaded = SQLiteCheckpointStore(path, namespace='monitor')
+        asynchronous = SQLiteCheckpointStore(path, namespace='async-monitor')
+        
+        threaded.mark_processed('0xaa', 0, 10)
+        asynchronous.mark_processed('0xaa', 0, 10)
+        asynchronous.save_cursors({'0xA': 5})
+        threaded.save_cursors({'0xA': 50})
+        asynchronous.db.execute(
+            "INSERT INTO monitor_checkpoints (stream, block_number) VALUES ('index:0xA', 1)"
+        )
+        threaded.save_cursors({'0xA': 60})
+        
+        assert threaded.load_cursors() == {'0xA': 60}
+        assert asynchronous.load_cursor('0xA') == 5
+        assert threaded.is_processed('0xaa', 0) is False
+        assert asynchronous.is_processed('0xaa', 0) is True
+        threaded.close()
+        asynchronous.close()
+    
+    def test_default_path_is_under_state_directory(self, tmp_path, monkeypatch):
+        """Test the default store is created under the state directory, not the working directory"""
+        monkeypatch.delenv('VERIA_CHECKPOINT_DB', raising=False)
+        monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        
+        store = create_checkpoint_store(namespace='monitor')
+        
+        assert store.path == str(tmp_path / 'veria' / 'event_checkpoints.db')
+        assert not (tmp_path / 'event_checkpoints.db').exists()
+        store.close()
+
+
+class TestEventIndexer:
+    """Test suite for the token event index on a SQLAlchemy session (in-memory SQLite)"""
+    
+    TOKEN = Web3.to_checksum_address("0x" + "70" * 20)
+    ALICE = Web3.to_checksum_address("0x" + "a1" * 20)
+    BOB = Web3.to_checksum_address("0x" + "b2" * 20)
+    CAROL = Web3.to_checksum_address("0x" + "c3" * 20)
+    ZERO = "0x" + "00" * 20
+    TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+    
+    @staticmethod
+    def _word(value):
+        return bytes.fromhex(value[2:].rjust(64, '0')) if isinstance(value, str) else value.to_bytes(32, 'big')
+    
+    def _transfer(self, block, sender, recipient, value):
+        return {
+            'address': self.TOKEN,
+            'blockNumber': block,
+            'blockHash': block.to_bytes(32, 'big'),
+            'transactionHash': (block + 1000).to_bytes(32, 'big'),
+            'logIndex': 0,
+            'topics': [self._word(self.TRANSFER_TOPIC), self._word(sender), self._word(recipient)],
+            'data': '0x' + self._word(value).hex()
+        }
+    
+    @pytest.fixture
+    def chain(self):
+        return {'head': 40, 'logs': [
+            self._transfer(5, self.ZERO, self.ALICE, 100),
+            self._transfer(12, self.ALICE, self.BOB, 30),
+            self._transfer(25, self.BOB, self.CAROL, 10),
+            self._transfer(35, self.ALICE, self.BOB, 1)
+        ]}
+    
+    @pytest.fixture
+    def indexer(self, chain):
+        sqlalchemy = pytest.importorskip("sqlalchemy")
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+        from packages.database.models import Base, MonitorCheckpoint, TokenEvent
+        from core.monitoring.indexer import EventIndexer
+        
+        engine = sqlalchemy.create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine, tables=[MonitorCheckpoint.__table__, TokenEvent.__table__])
+        
+        w3 = MagicMock()
+        type(w3.eth).block_number = PropertyMock(side_effect=lambda: chain['head'])
+        w3.eth.get_logs.side_effect = lambda params: [
+            log for log in chain['logs'] if params['fromBlock'] <= log['blockNumber'] <= params['toBlock']
+        ]
+        provider = MagicMock()
+        provider.connection_pool.get_connection.return_value.__enter__.return_value = w3
+        provider.batch_request.side_effect = lambda requests: [
+            {'timestamp': 1700000000 + params[0]} for _, params in requests
+        ]
+        
+        return EventIndexer(
+            provider,
+            session_factory=sessionmaker(bind=engine),
+            range_splitter=BlockRangeSplitter(initial_span=5, max_span=5, max_concurrency=2),
+            confirmations=10,
+            chain_id=80002
+        )
+    
+    def test_sync_indexes_confirmed_blocks_and_resumes(self, indexer, chain):
+        """Test sync stores events up to head - confirmations and continues from its cursor"""
+        assert indexer.sync(self.TOKEN) == 3
+        assert indexer.indexed_through(self.TOKEN) == 30
+        assert indexer.covers(self.TOKEN, 30) and not indexer.covers(self.TOKEN, 31)
+        assert not indexer.covers(self.TOKEN, 'latest') and not indexer.covers(self.TOKEN, None)
+        assert indexer.indexed_prefix(self.TOKEN, 0, 'latest') == 30
+        assert indexer.indexed_prefix(self.TOKEN, 0, 20) == 20
+        assert indexer.indexed_prefix(self.TOKEN, 31) is None
+        
+        chain['head'] = 45
+        assert indexer.sync(self.TOKEN) == 1
+        assert indexer.indexed_through(self.TOKEN) == 35
+        rows = indexer.get_history(self.TOKEN, address=self.ALICE)
+        assert [row.block_number for row in rows] == [35, 12, 5]
+        assert rows[-1].block_timestamp.year == 2023
+    
+    def test_store_is_idempotent_and_cursor_never_moves_back(self, indexer):
+        """Test re-stored events are ignored and an older cursor does not rewind the index"""
+        indexer.sync(self.TOKEN)
+        events = indexer.decoders.decode_batch([self._transfer(12, self.ALICE, self.BOB, 30)])
+        
+        assert indexer.index_events(self.TOKEN, events, through_block=20) == 1
+        
+        assert len(indexer.get_history(self.TOKEN)) == 3
+        assert indexer.indexed_through(self.TOKEN) == 30
+    
+    def test_holders_are_net_transfer_balances(self, indexer):
+        """Test holder balances net mints, transfers and burns and honour at_block"""
+        indexer.sync(self.TOKEN)
+        
+        assert indexer.get_holders(self.TOKEN) == {self.ALICE: 70, self.BOB: 20, self.CAROL: 10}
+        assert indexer.get_holders(self.TOKEN, at_block=12) == {self.ALICE: 70, self.BOB: 30}
+        assert list(indexer.get_holders(self.TOKEN, limit=1)) == [self.ALICE]
+    
+    def test_volume_excludes_mints(self, indexer):
+        """Test volume counts transfers between holders only"""
+        indexer.sync(self.TOKEN)
+        
+        volume = indexer.get_volume(self.TOKEN)
+        
+        assert (volume['transfers'], volume['volume'], volume['unique_senders']) == (2, 40, 2)
+        assert volume['to_block'] == 30
+        assert indexer.get_volume(self.TOKEN, from_block=20)['volume'] == 10
+
+
 @pytest.mark.integration
 class TestFullIntegration:
     """Full integration tests (requires test network connection)"""
@@ -0,0 +1,50 @@
+"""Add event monitor checkpoints
+
+Revision ID: 5c2e8d1f7a90
+Revises: 1a46d22e4acd
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5c2e8d1f7a90"
+down_revision = "1a46d22e4acd"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monitor_checkpoints",
+        sa.Column("stream", sa.String(length=100), nullable=False),
+        sa.Column("block_number", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("stream"),
+    )
+    op.create_table(
+        "processed_events",
+        sa.Column("namespace", sa.String(length=50), nullable=False),
+        sa.Column("transaction_hash", sa.String(length=66), nullable=False),
+        sa.Column("log_index", sa.Integer(), nullable=False),
+        sa.Column("block_number", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "processed_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("namespace", "transaction_hash", "log_index"),
+    )
+    op.create_index(
+        "idx_processed_events_block",
+        "processed_events",
+        ["namespace", "block_number"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_processed_events_block", table_name="processed_events")
+    op.drop_table("processed_events")
+    op.drop_table("monitor_checkpoints")
@@ -0,0 +1,61 @@
+"""Add token event index
+
+Revision ID: 8b3f6a2c9d41
+Revises: 5c2e8d1f7a90
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "8b3f6a2c9d41"
+down_revision = "5c2e8d1f7a90"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "token_events",
+        sa.Column("transaction_hash", sa.String(length=66), nullable=False),
+        sa.Column("log_index", sa.Integer(), nullable=False),
+        sa.Column("chain_id", sa.Integer(), nullable=True),
+        sa.Column("token_address", sa.String(length=42), nullable=False),
+        sa.Column("event_type", sa.String(length=50), nullable=False),
+        sa.Column("from_address", sa.String(length=42), nullable=True),
+        sa.Column("to_address", sa.String(length=42), nullable=True),
+        sa.Column("amount", sa.DECIMAL(precision=78, scale=0), nullable=True),
+        sa.Column("block_number", sa.BigInteger(), nullable=False),
+        sa.Column("block_hash", sa.String(length=66), nullable=True),
+        sa.Column("block_timestamp", sa.DateTime(), nullable=True),
+        sa.Column(
+            "indexed_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True
+        ),
+        sa.PrimaryKeyConstraint("transaction_hash", "log_index"),
+    )
+    op.create_index(
+        "idx_token_events_token_from_block",
+        "token_events",
+        ["token_address", "from_address", "block_number"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_token_events_token_to_block",
+        "token_events",
+        ["token_address", "to_address", "block_number"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_token_events_token_block",
+        "token_events",
+        ["token_address", "block_number"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_token_events_token_block", table_name="token_events")
+    op.drop_index("idx_token_events_token_to_block", table_name="token_events")
+    op.drop_index("idx_token_events_token_from_block", table_name="token_events")
+    op.drop_table("token_events")
@@ -421,6 +421,53 @@ class Notification(Base):
         return f"<Notification(type='{self.type}', status='{self.status}')>"
 
 
+class MonitorCheckpoint(Base):
+    """Last fully processed block per event monitor stream"""
+    __tablename__ = 'monitor_checkpoints'
+    
+    stream = Column(String(100), primary_key=True)
+    block_number = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<MonitorCheckpoint(stream='{self.stream}', block={self.block_number})>"
+
+
+class ProcessedEvent(Base):
+    """Chain events already handled by an event monitor"""
+    __tablename__ = 'processed_events'
+    
+    namespace = Column(String(50), primary_key=True)
+    transaction_hash = Column(String(66), primary_key=True)
+    log_index = Column(Integer, primary_key=True)
+    block_number = Column(BigInteger, nullable=False)
+    processed_at = Column(DateTime, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ProcessedEvent(namespace='{self.namespace}', tx='{self.transaction_hash}', log_index={self.log_index})>"
+
+
+class TokenEvent(Base):
+    """Decoded token event log (Transfer, Mint, Burn, Freeze...) from the chain indexer"""
+    __tablename__ = 'token_events'
+    
+    transaction_hash = Column(String(66), primary_key=True)
+    log_index = Column(Integer, primary_key=True)
+    chain_id = Column(Integer)
+    token_address = Column(String(42), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    from_address = Column(String(42))  # Sender; burned-from account
+    to_address = Column(String(42))  # Recipient; minted-to or frozen account
+    amount = Column(DECIMAL(78, 0))  # Raw uint256 token units
+    block_number = Column(BigInteger, nullable=False)
+    block_hash = Column(String(66))
+    block_timestamp = Column(DateTime)
+    indexed_at = Column(DateTime, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<TokenEvent(type='{self.event_type}', token='{self.token_address}', block={self.block_number})>"
+
+
 # =========================================
 # INDEXES (defined at model level)
 # =========================================
@@ -433,3 +480,7 @@ Index('idx_products_token_address', Product.token_address)
 Index('idx_transactions_hash', Transaction.transaction_hash)
 Index('idx_holdings_user_product', Holding.user_id, Holding.product_id)
 Index('idx_audit_logs_entity', AuditLog.entity_type, AuditLog.entity_id)
+Index('idx_processed_events_block', ProcessedEvent.namespace, ProcessedEvent.block_number)
+Index('idx_token_events_token_from_block', TokenEvent.token_address, TokenEvent.from_address, TokenEvent.block_number)
+Index('idx_token_events_token_to_block', TokenEvent.token_address, TokenEvent.to_address, TokenEvent.block_number)
+Index('idx_token_events_token_block', TokenEvent.token_address, TokenEvent.block_number)